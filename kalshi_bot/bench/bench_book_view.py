@@ -0,0 +1,80 @@
+# kalshi_bot/bench/bench_book_view.py
+"""
+Per-message cost of deriving book state: separate accessor calls (old hot path)
+vs one cached BookView shared by the recorder and a strategy.
+
+    python -m kalshi_bot.bench.bench_book_view --n 1000000
+"""
+import argparse
+import random
+import time
+
+from kalshi_bot.core.data.order_book import OrderBook
+from kalshi_bot.core.data.array_order_book import ArrayOrderBook
+
+DEPTH = 5
+
+
+def synthetic_deltas(n: int, seed: int = 7) -> list[dict]:
+    """Random walk around a mid, sized like a busy NBA ticker."""
+    rng = random.Random(seed)
+    deltas = []
+    mid = 50
+    for _ in range(n):
+        mid = min(95, max(5, mid + rng.choice((-1, 0, 0, 0, 1))))
+        side = rng.choice(("yes", "no"))
+        # YES bids rest below mid, NO bids rest below 100 - mid
+        anchor = mid if side == "yes" else 100 - mid
+        price = max(1, min(99, anchor - rng.randint(1, 8)))
+        deltas.append({"price": price, "delta": rng.randint(-300, 300), "side": side})
+    return deltas
+
+
+def snapshot() -> dict:
+    return {
+        "yes": [[p, 500] for p in range(20, 50)],
+        "no": [[p, 500] for p in range(20, 50)],
+    }
+
+
+def run_before(book, deltas) -> float:
+    start = time.perf_counter()
+    for seq, d in enumerate(deltas):
+        book.apply_delta(d, seq)
+        # What _handle_message used to do for the recorder ...
+        book.best_bid(); book.best_ask()
+        book.bid_volume(); book.ask_volume()
+        book.mid(); book.top_n(DEPTH)
+        # ... plus what each strategy recomputes on its own (Sweep + ArbitrageScalper)
+        book.best_bid(); book.best_ask()
+        book.best_bid(); book.best_ask(); book.top_n(1); book.mid()
+    return time.perf_counter() - start
+
+
+def run_after(book, deltas) -> float:
+    start = time.perf_counter()
+    for seq, d in enumerate(deltas):
+        book.apply_delta(d, seq)
+        view = book.view(DEPTH)      # recorder
+        view = book.view(DEPTH)      # Sweep — cache hit
+        view = book.view(DEPTH)      # ArbitrageScalper — cache hit
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BookView microbenchmark")
+    parser.add_argument("--n", type=int, default=1_000_000, help="number of synthetic deltas")
+    args = parser.parse_args()
+
+    deltas = synthetic_deltas(args.n)
+    print(f"{args.n:,} synthetic deltas, top_n depth {DEPTH}")
+    for name, cls in (("heap", OrderBook), ("array", ArrayOrderBook)):
+        for label, fn in (("before", run_before), ("after", run_after)):
+            book = cls("BENCH")
+            book.apply_snapshot(snapshot(), 0)
+            elapsed = fn(book, deltas)
+            print(f"{name:>6} | {label:<6} | {elapsed:7.2f}s | {elapsed / args.n * 1e9:8.0f} ns/msg")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# kalshi_bot/bench/bench_capture.py
+"""
+Raw frame capture: hot-path cost per frame, compression ratio, and how fast the reader
+streams a capture back.
+
+    python -m kalshi_bot.bench.bench_capture --n 500000
+    python -m kalshi_bot.bench.bench_capture --frames recorded.ndjson
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from kalshi_bot.bench.bench_decoders import load_frames, synthetic_frames
+from kalshi_bot.core.capture import FrameCapture, iter_frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Frame capture benchmark")
+    parser.add_argument("--frames", type=str, default=None, help="NDJSON file of recorded frames")
+    parser.add_argument("--n", type=int, default=500_000, help="synthetic frame count if --frames is not given")
+    parser.add_argument("--level", type=int, default=3, help="zstd level")
+    args = parser.parse_args()
+
+    frames = load_frames(args.frames) if args.frames else synthetic_frames(args.n)
+    # websockets hands text frames over as str — that is what the hot path sees
+    frames = [f.decode() for f in frames]
+    raw_bytes = sum(len(f) for f in frames)
+    print(f"{len(frames):,} frames, {raw_bytes / 1e6:.1f} MB")
+
+    tmp = tempfile.mkdtemp(prefix="bench_capture_")
+    try:
+        capture = FrameCapture(tmp, name="bench", compression_level=args.level)
+        capture.start()
+        ts = time.time_ns()
+        start = time.perf_counter()
+        for i, frame in enumerate(frames):
+            capture.write(ts + i, frame)
+        hot = time.perf_counter() - start
+        capture.close()
+        on_disk = sum(os.path.getsize(os.path.join(tmp, f)) for f in os.listdir(tmp))
+        print(f"write  | {hot / len(frames) * 1e9:6.0f} ns/frame on the hot path | "
+              f"{on_disk / 1e6:.1f} MB on disk ({raw_bytes / on_disk:.1f}x)")
+
+        start = time.perf_counter()
+        n = sum(1 for _ in iter_frames(tmp))
+        elapsed = time.perf_counter() - start
+        assert n == len(frames), (n, len(frames))
+        print(f"read   | {n / elapsed / 1e6:6.2f} M frames/s | {raw_bytes / elapsed / 1e6:.0f} MB/s")
+    finally:
+        shutil.rmtree(tmp)
+
+
+if __name__ == "__main__":
+    main()
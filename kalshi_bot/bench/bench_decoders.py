@@ -0,0 +1,78 @@
+# kalshi_bot/bench/bench_decoders.py
+"""
+Decode cost per frame for each available decoder, including the field reads the
+hot path does afterwards.
+
+    python -m kalshi_bot.bench.bench_decoders --frames frames.ndjson
+    python -m kalshi_bot.bench.bench_decoders --n 200000          # synthetic frames
+
+`--frames` is one raw WebSocket frame per line, as received.
+"""
+import argparse
+import json
+import random
+import time
+
+from kalshi_bot.core.decoder import DECODERS
+
+
+def synthetic_frames(n: int, seed: int = 11) -> list[bytes]:
+    rng = random.Random(seed)
+    tickers = [f"KXNBAGAME-25DEC04BENCH-T{i}" for i in range(20)]
+    frames = []
+    for seq in range(1, n + 1):
+        ticker = rng.choice(tickers)
+        if seq % 1000 == 1:
+            msg = {"type": "orderbook_snapshot", "sid": 1, "seq": seq, "msg": {
+                "market_ticker": ticker, "market_id": "bench",
+                "yes": [[p, rng.randint(1, 900)] for p in range(20, 50)],
+                "no": [[p, rng.randint(1, 900)] for p in range(20, 50)],
+            }}
+        else:
+            msg = {"type": "orderbook_delta", "sid": 1, "seq": seq, "msg": {
+                "market_ticker": ticker, "market_id": "bench",
+                "price": rng.randint(1, 99), "delta": rng.randint(-300, 300),
+                "side": rng.choice(("yes", "no")), "ts": "2025-12-04T01:02:03.456Z",
+            }}
+        frames.append(json.dumps(msg).encode())
+    return frames
+
+
+def load_frames(path: str) -> list[bytes]:
+    with open(path, "rb") as f:
+        return [line.rstrip(b"\n") for line in f if line.strip()]
+
+
+def run(decoder, frames) -> float:
+    start = time.perf_counter()
+    for raw in frames:
+        frame = decoder.decode(raw)
+        payload = frame.msg
+        # Field reads _handle_message + OrderBook.apply_delta perform
+        if frame.type == "orderbook_delta":
+            payload["market_ticker"], payload["price"], payload["delta"], payload["side"]
+            payload.get("ts", 0)
+        elif frame.type == "orderbook_snapshot":
+            payload["market_ticker"], payload.get("yes", []), payload.get("no", [])
+        frame.sid, frame.seq
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="WebSocket decoder benchmark")
+    parser.add_argument("--frames", type=str, default=None, help="NDJSON file of recorded frames")
+    parser.add_argument("--n", type=int, default=200_000, help="synthetic frame count if --frames is not given")
+    args = parser.parse_args()
+
+    frames = load_frames(args.frames) if args.frames else synthetic_frames(args.n)
+    print(f"{len(frames):,} frames ({'recorded' if args.frames else 'synthetic'})")
+    for name, cls in DECODERS.items():
+        if cls is None:
+            print(f"{name:>8} | not installed")
+            continue
+        elapsed = run(cls(), frames)
+        print(f"{name:>8} | {elapsed:7.2f}s | {elapsed / len(frames) * 1e9:7.0f} ns/frame")
+
+
+if __name__ == "__main__":
+    main()
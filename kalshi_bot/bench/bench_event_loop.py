@@ -0,0 +1,94 @@
+# kalshi_bot/bench/bench_event_loop.py
+"""
+asyncio vs uvloop on replayed traffic: a local WebSocket server (own thread, own loop)
+streams the frames, the measured loop runs the ingest hot path (socket read → decode →
+book apply → view) and a LoopLagMonitor measures scheduling delay while it does.
+
+    python -m kalshi_bot.bench.bench_event_loop --frames frames.ndjson
+    python -m kalshi_bot.bench.bench_event_loop --n 200000          # synthetic frames
+"""
+import argparse
+import asyncio
+import threading
+import time
+
+import websockets
+
+from kalshi_bot.bench.bench_decoders import load_frames, synthetic_frames
+from kalshi_bot.core.data.array_order_book import ArrayOrderBook
+from kalshi_bot.core.decoder import get_decoder
+from kalshi_bot.monitor.loop_lag import LoopLagMonitor
+from kalshi_bot.util.runtime import LOOPS, run, uvloop
+
+TOP_N_DEPTH = 5
+
+
+def start_server(frames: list, port: int) -> threading.Event:
+    """Serve `frames` to every connection from a background thread; set the event to stop."""
+    ready, stop = threading.Event(), threading.Event()
+
+    async def serve(ws, path=None):
+        for raw in frames:
+            await ws.send(raw)
+        await ws.close()
+
+    async def main():
+        async with websockets.serve(serve, "127.0.0.1", port, max_size=None, compression=None):
+            ready.set()
+            while not stop.is_set():
+                await asyncio.sleep(0.05)
+
+    threading.Thread(target=asyncio.run, args=(main(),), daemon=True).start()
+    ready.wait()
+    return stop
+
+
+async def replay(frames: list, port: int) -> dict:
+    decoder = get_decoder("auto")
+    books = {}
+    monitor = LoopLagMonitor(interval=0.001, stall_threshold=0.05)
+    monitor.start()
+
+    start = time.perf_counter()
+    async with websockets.connect(f"ws://127.0.0.1:{port}", max_size=None, compression=None) as ws:
+        async for raw in ws:
+            frame = decoder.decode(raw)
+            msg = frame.msg
+            ticker = msg["market_ticker"]
+            book = books.get(ticker)
+            if book is None:
+                book = books[ticker] = ArrayOrderBook(ticker)
+            if frame.type == "orderbook_snapshot":
+                book.apply_snapshot(msg, frame.seq)
+            else:
+                book.apply_delta(msg, frame.seq)
+            book.view(TOP_N_DEPTH)
+    elapsed = time.perf_counter() - start
+
+    monitor.stop()
+    return {"elapsed": elapsed, "lag": monitor.lag.summary()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Event loop benchmark")
+    parser.add_argument("--frames", type=str, default=None, help="NDJSON file of recorded frames")
+    parser.add_argument("--n", type=int, default=200_000, help="synthetic frame count if --frames is not given")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    frames = load_frames(args.frames) if args.frames else synthetic_frames(args.n)
+    print(f"{len(frames):,} frames ({'recorded' if args.frames else 'synthetic'})")
+    stop = start_server(frames, args.port)
+    for loop in LOOPS:
+        if loop == "uvloop" and uvloop is None:
+            print(f"{loop:>8} | not installed")
+            continue
+        result = run(replay(frames, args.port), loop=loop)
+        lag = result["lag"]
+        print(f"{loop:>8} | {result['elapsed']:7.2f}s | {len(frames) / result['elapsed']:9,.0f} msg/s | "
+              f"lag p50 {lag['p50_us']:7.0f}us p99 {lag['p99_us']:7.0f}us max {lag['max_us']:7.0f}us")
+    stop.set()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# kalshi_bot/bench/bench_market_parse.py
+"""
+Catalog build cost: slotted lazy Market vs eager timestamp parsing vs the Arrow bulk path.
+
+    python -m kalshi_bot.bench.bench_market_parse --n 20000
+"""
+import argparse
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+from kalshi_bot.core.data.market import FIELDS, Market, _TIME_FIELDS, _parse_time, markets_to_arrow
+
+
+def synthetic_raws(n: int) -> list[dict]:
+    base = datetime(2025, 12, 4, tzinfo=timezone.utc)
+    raws = []
+    for i in range(n):
+        ts = (base + timedelta(minutes=i)).isoformat().replace("+00:00", "Z")
+        raw = {f: None for f in FIELDS}
+        raw.update({
+            "can_close_early": True, "category": "Sports", "event_ticker": f"KXNBAGAME-25DEC04G{i // 2}",
+            "expiration_value": "", "last_price": 40, "market_type": "binary", "no_ask": 61, "no_bid": 59,
+            "open_interest": 1000, "volume": 5000, "volume_24h": 700, "previous_price": 39,
+            "previous_yes_ask": 41, "previous_yes_bid": 38, "rules_primary": "…", "status": "open",
+            "strike_type": "structured", "tick_size": 1, "ticker": f"KXNBAGAME-25DEC04G{i // 2}-T{i % 2}",
+            "title": "Game", "yes_ask": 41, "yes_bid": 39, "liquidity": 10_000, "result": "",
+            "response_price_units": "usd_cent", "price_ranges": [],
+        })
+        for f in _TIME_FIELDS:
+            raw[f] = ts
+        raws.append(raw)
+    return raws
+
+
+def measure(label: str, fn, n: int):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    # Separate pass for memory — tracemalloc distorts timings
+    tracemalloc.start()
+    result = fn()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:>28} | {elapsed * 1e3:8.1f} ms | {elapsed / n * 1e6:6.2f} us/market | {current / n:7.0f} B/market")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Market catalog parse benchmark")
+    parser.add_argument("--n", type=int, default=20_000)
+    args = parser.parse_args()
+
+    raws = synthetic_raws(args.n)
+    print(f"{args.n:,} markets")
+
+    def eager():
+        # What the old parse_market did: a dict of fields with every timestamp parsed up front
+        return [{k: (_parse_time(raw[k]) if k in _TIME_FIELDS else raw[k]) for k in FIELDS} for raw in raws]
+
+    measure("eager dict (old)", eager, args.n)
+    markets = measure("Market.from_api (lazy)", lambda: [Market.from_api(r) for r in raws], args.n)
+    measure("  + read close_time", lambda: [m.close_time for m in markets], args.n)
+    table = measure("markets_to_arrow", lambda: markets_to_arrow(raws), args.n)
+    print(f"{'arrow table':>28} | {table.nbytes / args.n:7.0f} B/market")
+
+
+if __name__ == "__main__":
+    main()
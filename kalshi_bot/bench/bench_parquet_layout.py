@@ -0,0 +1,122 @@
+# kalshi_bot/bench/bench_parquet_layout.py
+"""
+Parquet layout and codec: file size, write time and DuckDB scan time for the recorder's
+file schema — the old layout (no statistics, no dictionaries) against ts-sorted,
+statistics-bearing, dictionary-encoded row groups under each codec.
+
+    python -m kalshi_bot.bench.bench_parquet_layout --rows 1000000 --row-group-rows 50000
+"""
+import argparse
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import duckdb
+import pyarrow as pa
+
+from kalshi_bot.bench.bench_parquet_writer import DAY, synthetic_batch
+from kalshi_bot.core.delta_recorder import DICTIONARY_COLUMNS, FILE_SCHEMA, PARTITION_KEYS
+from kalshi_bot.core.parquet_writer import RollingParquetWriter
+
+# (label, codec, level) — level None = the codec's default
+CODECS = [
+    ("none", "none", None),
+    ("snappy", "snappy", None),
+    ("lz4", "lz4", None),
+    ("zstd-1", "zstd", 1),
+    ("zstd-3", "zstd", 3),
+    ("zstd-9", "zstd", 9),
+    ("gzip-6", "gzip", 6),
+]
+
+LEGACY = {"use_dictionary": False, "write_statistics": False}
+QUERY = {"use_dictionary": list(DICTIONARY_COLUMNS), "write_statistics": True, "sort_by": "ts"}
+
+QUERIES = {
+    "full": "SELECT avg(mid), sum(delta), max(total_bid_vol) FROM read_parquet('{glob}')",
+    # signal_test.sql's shape: only the most recent slice of the day
+    "recent": "SELECT count(*), avg(imbalance_l1) FROM read_parquet('{glob}') WHERE ts > TIMESTAMP '{since}'",
+    "yes": "SELECT count(*), avg(price) FROM read_parquet('{glob}') WHERE side = 'yes' AND msg_type = 'delta'",
+}
+
+
+def synthetic_day(rows: int, batch_rows: int = 5_000, jitter: int = 2) -> pa.Table:
+    """Recorder file rows in arrival order: ts rising, with the odd row a few ms late."""
+    rng = random.Random(7)
+    ts0 = int(datetime(DAY.year, DAY.month, DAY.day, tzinfo=timezone.utc).timestamp() * 1000)
+    template = [synthetic_batch(batch_rows, i * batch_rows, rng) for i in range(8)]
+    batches = []
+    for i in range(0, rows, batch_rows):
+        t = template[(i // batch_rows) % len(template)]
+        ts = pa.array([ts0 + i + k + rng.randint(-jitter, 0) for k in range(t.num_rows)], pa.int64())
+        t = t.set_column(0, "ts", ts.cast(pa.timestamp("ms")).cast(FILE_SCHEMA.field("ts").type))
+        batches.append(t.drop(list(PARTITION_KEYS)))
+    return pa.concat_tables(batches).slice(0, rows).cast(FILE_SCHEMA)
+
+
+def write(table: pa.Table, path: str, row_group_rows: int, write_batch: int, **options) -> float:
+    writer = RollingParquetWriter(path, FILE_SCHEMA, row_group_rows=row_group_rows,
+                                  max_file_bytes=1 << 40, **options)
+    start = time.perf_counter()
+    for offset in range(0, table.num_rows, write_batch):
+        writer.write(table.slice(offset, write_batch), DAY)
+    writer.close()
+    return time.perf_counter() - start
+
+
+def scan(con, sql: str, repeats: int) -> float:
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        con.execute(sql).fetchall()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parquet layout / codec benchmark")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--row-group-rows", type=int, default=50_000)
+    parser.add_argument("--write-batch", type=int, default=2_500, help="rows per writer.write() call")
+    parser.add_argument("--recent", type=float, default=0.05, help="share of the day the 'recent' query reads")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    table = synthetic_day(args.rows)
+    ts = table.column("ts")
+    since = ts[int(table.num_rows * (1 - args.recent))].as_py()
+    print(f"{table.num_rows:,} rows, {table.nbytes / 1e6:.0f} MB in memory, row groups of {args.row_group_rows:,}")
+
+    runs = [("legacy", "zstd-3", dict(LEGACY, compression="zstd", compression_level=3))]
+    for label, codec, level in CODECS:
+        options = dict(QUERY, compression=codec)
+        if level is not None:
+            options["compression_level"] = level
+        runs.append(("query", label, options))
+
+    con = duckdb.connect()
+    tmp = tempfile.mkdtemp(prefix="bench_layout_")
+    try:
+        header = f"{'layout':>7} {'codec':>7} | {'MB':>7} | {'write s':>7} | " \
+                 + " | ".join(f"{name + ' ms':>9}" for name in QUERIES)
+        print(header)
+        print("-" * len(header))
+        for i, (layout, label, options) in enumerate(runs):
+            path = os.path.join(tmp, f"{i}-{layout}-{label}")
+            seconds = write(table, path, args.row_group_rows, args.write_batch, **options)
+            size = sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+            glob = os.path.join(path, "*.parquet")
+            scans = [scan(con, sql.format(glob=glob, since=since), args.repeats) for sql in QUERIES.values()]
+            print(f"{layout:>7} {label:>7} | {size / 1e6:7.1f} | {seconds:7.2f} | "
+                  + " | ".join(f"{s * 1e3:9.1f}" for s in scans))
+    finally:
+        con.close()
+        shutil.rmtree(tmp)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# kalshi_bot/bench/bench_parquet_writer.py
+"""
+Per-batch write cost across a simulated day: the old read-concat-rewrite of the day's
+file vs RollingParquetWriter appending row groups to an open part file.
+
+    python -m kalshi_bot.bench.bench_parquet_writer --batches 2000 --batch-rows 250
+"""
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+from datetime import date, datetime
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from kalshi_bot.core.delta_recorder import LADDER_DEPTH, SCHEMA
+from kalshi_bot.core.parquet_writer import RollingParquetWriter
+
+DAY = date(2025, 12, 4)
+
+
+def synthetic_batch(rows: int, seq0: int, rng: random.Random) -> pa.Table:
+    ts0 = int(datetime(2025, 12, 4).timestamp() * 1000)
+    records = []
+    for i in range(rows):
+        bid = rng.randint(1, 98)
+        records.append({
+            "ts": ts0 + seq0 + i, "date": DAY, "ticker": "KXNBAGAME-25DEC04BENCH-T0", "seq": seq0 + i,
+            "msg_type": "delta", "price_cents": bid, "price": bid / 100, "delta": rng.randint(-300, 300),
+            "side": rng.choice(("yes", "no")), "best_bid": bid / 100, "best_ask": (bid + 1) / 100,
+            "mid": (bid + 0.5) / 100, "spread": 0.01, "total_bid_vol": rng.randint(0, 50_000),
+            "total_ask_vol": rng.randint(0, 50_000), "microprice": bid / 100,
+            "top_bids": [{"price": (bid - k) / 100, "size": rng.randint(1, 500)} if bid > k else None
+                         for k in range(LADDER_DEPTH)],
+            "top_asks": [{"price": (bid + 1 + k) / 100, "size": rng.randint(1, 500)} if bid + 1 + k < 100 else None
+                         for k in range(LADDER_DEPTH)],
+            "imbalance_l1": 0.1, "imbalance_l5": -0.2, "bid_levels": 20, "ask_levels": 18,
+            "exch_to_recv_us": 900, "recv_to_apply_us": 12,
+        })
+    return pa.Table.from_pylist(records, schema=SCHEMA)
+
+
+def legacy_append(path: str, table: pa.Table):
+    """What DeltaRecorder used to do on every flush."""
+    if os.path.exists(path):
+        table = pa.concat_tables([pq.read_table(path, schema=SCHEMA), table])
+    pq.write_table(table, path, compression="zstd", compression_level=3,
+                   use_dictionary=False, write_statistics=False)
+
+
+def timed(batches, write) -> list[float]:
+    costs = []
+    for table in batches:
+        start = time.perf_counter()
+        write(table)
+        costs.append(time.perf_counter() - start)
+    return costs
+
+
+def report(label: str, costs: list[float], rows: int):
+    n = len(costs)
+    windows = [costs[n * q // 10:max(n * (q + 1) // 10, n * q // 10 + 1)] for q in range(10)]
+    deciles = [sum(w) / len(w) for w in windows]
+    per_decile = " ".join(f"{c * 1e3:6.2f}" for c in deciles)
+    print(f"{label:>8} | total {sum(costs):7.2f}s | {sum(costs) / (len(costs) * rows) * 1e6:6.2f} us/row | "
+          f"ms/batch by decile of day: {per_decile}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parquet writer benchmark")
+    parser.add_argument("--batches", type=int, default=2000, help="flushes in the simulated day")
+    parser.add_argument("--batch-rows", type=int, default=250)
+    parser.add_argument("--legacy-batches", type=int, default=300, help="legacy is quadratic — cap it")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    template = [synthetic_batch(args.batch_rows, i * args.batch_rows, rng) for i in range(20)]
+    batches = [template[i % len(template)] for i in range(args.batches)]
+    print(f"{args.batches:,} batches × {args.batch_rows} rows")
+
+    tmp = tempfile.mkdtemp(prefix="bench_pq_")
+    try:
+        legacy_path = os.path.join(tmp, "legacy.parquet")
+        report("legacy", timed(batches[:args.legacy_batches], lambda t: legacy_append(legacy_path, t)),
+               args.batch_rows)
+
+        writer = RollingParquetWriter(os.path.join(tmp, "rolling"), SCHEMA,
+                                      use_dictionary=False, write_statistics=False)
+        costs = timed(batches, lambda t: writer.write(t, DAY))
+        start = time.perf_counter()
+        writer.close()
+        costs[-1] += time.perf_counter() - start
+        report("rolling", costs, args.batch_rows)
+        print(f"rolling writer: {writer.stats()}")
+        print(f"rows read back: {pq.read_table(os.path.join(tmp, 'rolling')).num_rows:,}")
+    finally:
+        shutil.rmtree(tmp)
+
+
+if __name__ == "__main__":
+    main()
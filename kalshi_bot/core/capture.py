@@ -0,0 +1,287 @@
+# kalshi_bot/core/capture.py
+import asyncio
+import heapq
+import itertools
+import os
+import re
+import struct
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+import pyarrow as pa
+
+from kalshi_bot.util.logger import get_logger
+
+logger = get_logger('capture')
+
+# File: magic, then zstd blocks of (compressed size, raw size, data). A block holds whole records of
+# (recv wall-clock ns, payload length, payload), so a crash only ever costs the block being written.
+_MAGIC = b"KFRM0001"
+_BLOCK = struct.Struct("<II")
+_RECORD = struct.Struct("<qI")
+_PACK = _RECORD.pack
+_HOUR_NS = 3_600_000_000_000
+SUFFIX = ".frames"
+_FILE_RE = re.compile(r"^(?P<name>.+)-(?P<hour>\d{8}T\d{2})(?:-(?P<part>\d+))?\.frames(?:\.tmp)?$")
+
+# A zero-length payload marks a new WebSocket connection: sids from before it are dead
+CONNECT = b""
+
+
+def _hour_label(hour: int) -> str:
+    return datetime.fromtimestamp(hour * 3600, tz=timezone.utc).strftime("%Y%m%dT%H")
+
+
+class FrameCapture:
+    """
+    Raw WebSocket frames exactly as received, with their nanosecond receive time, for
+    bit-exact replay. One length-prefixed log per UTC hour per connection
+    (`{name}-YYYYmmddTHH[-N].frames`), zstd-compressed block by block in a background thread.
+
+    The hot path is two `bytearray` appends; only the loop thread touches the buffer,
+    handing full chunks to the writer thread through a deque (and sealing a partial one
+    when the writer asks, every `flush_interval`). Compression and file I/O never
+    touch the event loop. The current hour is written as `.tmp` and
+    renamed when the hour (or the process) ends; a crash leaves every block flushed
+    before it readable.
+    """
+
+    def __init__(self, directory: str, name: str = "kalshi_ws", chunk_bytes: int = 1 << 20,
+                 flush_interval: float = 1.0, compression_level: int = 3):
+        self.directory = directory
+        self.name = name
+        self.chunk_bytes = chunk_bytes
+        self.flush_interval = flush_interval
+        self._codec = pa.Codec("zstd", compression_level)
+        os.makedirs(directory, exist_ok=True)
+
+        # Loop side
+        self._buf = bytearray()
+        self._hour = -1
+        self._hour_end = 0
+        self._sealed: deque = deque()       # (hour, chunk) handed to the writer
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Writer thread
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+        self._stream = None
+        self._stream_hour = -1
+        self._path: Optional[str] = None
+
+        # Stats
+        self.frames = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.files_closed = 0
+        self.write_errors = 0
+
+    # ————————————————————————
+    # Lifecycle
+    # ————————————————————————
+    def start(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        """`loop`: the loop calling `write()` — lets the writer flush a quiet stream's partial chunk."""
+        if self._thread is None:
+            self._loop = loop
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name=f"capture-{self.name}", daemon=True)
+            self._thread.start()
+
+    def close(self):
+        """
+        After the last `write()`: write what is buffered and finalize the current file.
+        Blocking — call via to_thread from a loop.
+        """
+        if self._thread is None:
+            return
+        self._seal()
+        self._stopping = True
+        self._wake.set()
+        self._thread.join()
+        self._thread = None
+
+    # ————————————————————————
+    # Hot path
+    # ————————————————————————
+    def write(self, recv_wall_ns: int, frame: Union[str, bytes]):
+        if type(frame) is str:
+            frame = frame.encode()
+        if recv_wall_ns >= self._hour_end:
+            self._roll(recv_wall_ns)
+        buf = self._buf
+        buf += _PACK(recv_wall_ns, len(frame))
+        buf += frame
+        self.frames += 1
+        if len(buf) >= self.chunk_bytes:
+            self._seal()
+
+    def mark_connect(self, recv_wall_ns: Optional[int] = None):
+        """Record a connection boundary (replay resets session state here)."""
+        self.write(time.time_ns() if recv_wall_ns is None else recv_wall_ns, CONNECT)
+
+    def _roll(self, recv_wall_ns: int):
+        """New UTC hour: seal the previous hour's chunk."""
+        hour = recv_wall_ns // _HOUR_NS
+        if hour == self._hour:
+            return      # clock stepped back within the hour
+        self._seal()
+        self._hour = hour
+        self._hour_end = (hour + 1) * _HOUR_NS
+
+    def _seal(self):
+        """Loop side: hand the current chunk to the writer."""
+        if self._buf:
+            self._sealed.append((self._hour, self._buf))
+            self._buf = bytearray()
+            self._wake.set()
+
+    # ————————————————————————
+    # Writer thread
+    # ————————————————————————
+    def _run(self):
+        while True:
+            if not self._wake.wait(timeout=self.flush_interval) and self._loop is not None \
+                    and not self._loop.is_closed():
+                # Quiet stream: have the loop seal whatever is buffered
+                self._loop.call_soon_threadsafe(self._seal)
+            self._wake.clear()
+            stopping = self._stopping
+            try:
+                while self._sealed:
+                    hour, chunk = self._sealed.popleft()
+                    self._write(hour, chunk)
+                if stopping:
+                    self._close_file()
+                    return
+            except Exception as e:
+                self.write_errors += 1
+                logger.error(f"Frame capture write failed: {e!r}")
+                if stopping:
+                    return
+
+    def _write(self, hour: int, chunk: bytearray):
+        if hour != self._stream_hour:
+            self._close_file()
+            self._open(hour)
+        data = self._codec.compress(chunk, asbytes=True)
+        self._stream.write(_BLOCK.pack(len(data), len(chunk)))
+        self._stream.write(data)
+        self._stream.flush()
+        self.bytes_in += len(chunk)
+        self.bytes_out += len(data)
+
+    def _open(self, hour: int):
+        base = os.path.join(self.directory, f"{self.name}-{_hour_label(hour)}")
+        # A restart within the hour continues in a new part rather than overwriting
+        path, n = f"{base}{SUFFIX}", 0
+        while os.path.exists(path) or os.path.exists(f"{path}.tmp"):
+            n += 1
+            path = f"{base}-{n}{SUFFIX}"
+        self._path = path
+        self._stream = open(f"{path}.tmp", "wb")
+        self._stream.write(_MAGIC)
+        self._stream_hour = hour
+
+    def _close_file(self):
+        if self._stream is None:
+            return
+        self._stream.close()
+        os.replace(f"{self._path}.tmp", self._path)
+        self.files_closed += 1
+        self._stream = None
+        self._stream_hour = -1
+
+    def stats(self) -> dict:
+        return {
+            "frames": self.frames,
+            "bytes": self.bytes_in,             # as written: payloads plus record headers
+            "bytes_compressed": self.bytes_out,
+            "files_closed": self.files_closed,
+            "write_errors": self.write_errors,
+        }
+
+
+# ————————————————————————
+# Reading
+# ————————————————————————
+def _parse_name(fname: str):
+    m = _FILE_RE.match(fname)
+    return (m.group("name"), m.group("hour"), int(m.group("part") or 0)) if m else None
+
+
+def capture_files(directory: str, name: Optional[str] = None) -> List[str]:
+    """
+    Capture files ordered by connection name, then hour, then part — including an
+    unfinished `.tmp` from a crash.
+    """
+    keyed = [(k, f) for f in os.listdir(directory) for k in [_parse_name(f)]
+             if k is not None and (name is None or k[0] == name)]
+    return [os.path.join(directory, f) for _, f in sorted(keyed)]
+
+
+def read_frames(path: str) -> Iterator[Tuple[int, bytes]]:
+    """(recv wall-clock ns, raw frame) for every record in one capture file."""
+    codec = pa.Codec("zstd")
+    unpack, header = _RECORD.unpack_from, _RECORD.size
+    with open(path, "rb") as f:
+        if f.read(len(_MAGIC)) != _MAGIC:
+            raise ValueError(f"{path} is not a frame capture")
+        while True:
+            head = f.read(_BLOCK.size)
+            if not head:
+                return
+            data = b""
+            if len(head) == _BLOCK.size:
+                compressed, raw = _BLOCK.unpack(head)
+                data = f.read(compressed)
+            if len(head) != _BLOCK.size or len(data) != compressed:
+                # Cut off by a crash: every earlier block is good
+                logger.warning(f"{path} ends in a partial block — stopping there")
+                return
+            block = codec.decompress(data, decompressed_size=raw, asbytes=True)
+            pos, end = 0, len(block)
+            while pos < end:
+                ts, length = unpack(block, pos)
+                start = pos + header
+                pos = start + length
+                yield ts, block[start:pos]
+
+
+def _tagged(conn: str, paths: List[str]) -> Iterator[Tuple[int, bytes, str]]:
+    for path in paths:
+        for ts, frame in read_frames(path):
+            yield ts, frame, conn
+
+
+def iter_frames(source: Union[str, Iterable[str]], name: Optional[str] = None, start_ns: Optional[int] = None,
+                end_ns: Optional[int] = None) -> Iterator[tuple]:
+    """
+    Frames from a capture directory (or an explicit list of one connection's files),
+    optionally time-bounded. Several connections in one directory (shards) are merged
+    by receive time, each frame tagged with its connection — (ts, frame, name) —
+    since sids and CONNECT markers only mean something within their own connection.
+    """
+    if isinstance(source, str):
+        paths = capture_files(source, name)
+        groups = [(conn, list(g)) for conn, g in
+                  itertools.groupby(paths, key=lambda p: _parse_name(os.path.basename(p))[0])]
+        if not groups:
+            return
+        if len(groups) == 1:
+            frames = itertools.chain.from_iterable(map(read_frames, groups[0][1]))
+        else:
+            streams = [_tagged(conn, group) for conn, group in groups]
+            frames = heapq.merge(*streams, key=lambda f: f[0])
+    else:
+        frames = itertools.chain.from_iterable(map(read_frames, source))
+    for item in frames:
+        ts = item[0]
+        if start_ns is not None and ts < start_ns:
+            continue
+        if end_ns is not None and ts >= end_ns:
+            return
+        yield item
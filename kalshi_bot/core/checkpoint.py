@@ -0,0 +1,230 @@
+# kalshi_bot/core/checkpoint.py
+import os
+import re
+import threading
+from collections import deque
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from kalshi_bot.core.data.features import N_LEVELS
+from kalshi_bot.util.logger import get_logger
+
+logger = get_logger('checkpoint')
+
+# One resting level of a checkpointed ladder, on the YES axis
+CHECKPOINT_LEVEL = pa.struct([("price_cents", pa.int8()), ("size", pa.int64())])
+
+CHECKPOINT_SCHEMA = pa.schema([
+    ("ticker", pa.string()),
+    ("ts", pa.timestamp('ms')),             # receive time of the message the book is as-of
+    ("seq", pa.int64()),                    # that message's seq — replay resumes after it
+    ("bids", pa.list_(CHECKPOINT_LEVEL)),   # best first
+    ("asks", pa.list_(CHECKPOINT_LEVEL)),
+])
+
+# {name}-{first ts ms}-{last ts ms}.parquet — the file names are the time index
+_FILE_RE = re.compile(r"^(?P<name>.+)-(?P<first>\d+)-(?P<last>\d+)\.parquet$")
+
+
+class Checkpoint(NamedTuple):
+    ticker: str
+    ts_ms: int
+    seq: int
+    bids: List[Tuple[int, int]]     # (YES cents, size), best first
+    asks: List[Tuple[int, int]]
+
+    def snapshot(self) -> dict:
+        """Kalshi snapshot message body — `book.apply_snapshot(cp.snapshot(), cp.seq)` restores the book."""
+        return {"market_ticker": self.ticker,
+                "yes": [[c, s] for c, s in self.bids],
+                "no": [[N_LEVELS - c, s] for c, s in self.asks]}
+
+
+def ladder_cents(book) -> Tuple[list, list]:
+    """Every resting level of either book backend, in integer YES cents."""
+    if hasattr(book, "top_n_cents"):
+        top = book.top_n_cents(N_LEVELS)
+        return top["bids"], top["asks"]
+    # Heap book: its size maps, not top_n — a heap slice can miss levels behind stale entries
+    return ([(round(p * 100), s) for p, s in sorted(book.bid_sizes.items(), reverse=True)],
+            [(round(p * 100), s) for p, s in sorted(book.ask_sizes.items())])
+
+
+def _day_of(ts_ms: int) -> date:
+    return datetime.fromtimestamp(ts_ms / 1000, tz=timezone.utc).date()
+
+
+class CheckpointWriter:
+    """
+    Periodic full-ladder checkpoints: at most one per ticker every `interval` seconds,
+    taken right after a message is applied and tagged with its seq and receive time.
+    Replay seeks to any time by loading the nearest checkpoint before it and applying
+    only the recorded deltas after it; a restarted client warms its books from them.
+
+    The hot path (`offer`) is a dict lookup until a ticker is due; a due ticker's
+    ladder is copied into a deque and a background thread writes whatever has
+    gathered every `flush_interval` seconds to one small parquet file per flush,
+    `base_path/date=YYYY-MM-DD/{name}-{first ts}-{last ts}.parquet` (written as .tmp,
+    then renamed), rows sorted by (ticker, ts). The ts range in each name is the
+    index: a seek opens only the files that can hold its checkpoint.
+    """
+
+    def __init__(self, base_path: str = "kalshi_checkpoints", name: str = "kalshi_ws", interval: float = 60.0,
+                 flush_interval: float = 60.0):
+        self.base_path = base_path
+        self.name = name
+        self.interval_ns = int(interval * 1e9)
+        self.flush_interval = flush_interval
+        os.makedirs(base_path, exist_ok=True)
+
+        self._due: Dict[str, int] = {}
+        self._pending: deque = deque()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+
+        # Stats
+        self.checkpoints = 0
+        self.files = 0
+        self.write_errors = 0
+
+    # ————————————————————————
+    # Lifecycle
+    # ————————————————————————
+    def start(self):
+        if self._thread is None:
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name=f"checkpoint-{self.name}", daemon=True)
+            self._thread.start()
+
+    def close(self):
+        """Write what is pending and stop. Blocking — call via to_thread from a loop."""
+        if self._thread is None:
+            return
+        self._stopping = True
+        self._wake.set()
+        self._thread.join()
+        self._thread = None
+
+    # ————————————————————————
+    # Hot path
+    # ————————————————————————
+    def offer(self, ticker: str, book, seq: int, recv_wall_ns: int):
+        """Called after every applied message; checkpoints `ticker` if its interval has passed."""
+        if recv_wall_ns < self._due.get(ticker, 0):
+            return
+        self._due[ticker] = recv_wall_ns + self.interval_ns
+        bids, asks = ladder_cents(book)
+        self._pending.append((ticker, recv_wall_ns // 1_000_000, seq, bids, asks))
+        self.checkpoints += 1
+
+    def forget(self, ticker: str):
+        """Market removed — stop tracking its interval."""
+        self._due.pop(ticker, None)
+
+    # ————————————————————————
+    # Writer thread
+    # ————————————————————————
+    def _run(self):
+        while True:
+            self._wake.wait(timeout=self.flush_interval)
+            self._wake.clear()
+            stopping = self._stopping
+            try:
+                self._flush()
+            except Exception as e:
+                self.write_errors += 1
+                logger.error(f"Checkpoint write failed: {e!r}")
+            if stopping:
+                return
+
+    def _flush(self):
+        rows = []
+        while self._pending:
+            rows.append(self._pending.popleft())
+        # A flush straddling midnight goes to both days
+        by_day: Dict[date, list] = {}
+        for row in rows:
+            by_day.setdefault(_day_of(row[1]), []).append(row)
+        for day, day_rows in by_day.items():
+            self._write(day, day_rows)
+
+    def _write(self, day: date, rows: list):
+        table = pa.table({
+            "ticker": [r[0] for r in rows],
+            "ts": pa.array([r[1] for r in rows], pa.int64()).cast(pa.timestamp('ms')),
+            "seq": [r[2] for r in rows],
+            "bids": [[{"price_cents": c, "size": s} for c, s in r[3]] for r in rows],
+            "asks": [[{"price_cents": c, "size": s} for c, s in r[4]] for r in rows],
+        }, schema=CHECKPOINT_SCHEMA).sort_by([("ticker", "ascending"), ("ts", "ascending")])
+        first, last = min(r[1] for r in rows), max(r[1] for r in rows)
+        directory = os.path.join(self.base_path, f"date={day.isoformat()}")
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{self.name}-{first}-{last}.parquet")
+        pq.write_table(table, f"{path}.tmp", compression="zstd")
+        os.replace(f"{path}.tmp", path)
+        self.files += 1
+
+    def stats(self) -> dict:
+        return {
+            "checkpoints": self.checkpoints,
+            "pending": len(self._pending),
+            "files": self.files,
+            "write_errors": self.write_errors,
+        }
+
+
+# ————————————————————————
+# Reading
+# ————————————————————————
+def checkpoint_files(base_path: str, day: date) -> List[Tuple[int, int, str]]:
+    """(first ts ms, last ts ms, path) for every checkpoint file of `day`, oldest first."""
+    directory = os.path.join(base_path, f"date={day.isoformat()}")
+    if not os.path.isdir(directory):
+        return []
+    found = []
+    for fname in os.listdir(directory):
+        m = _FILE_RE.match(fname)
+        if m:
+            found.append((int(m.group("first")), int(m.group("last")), os.path.join(directory, fname)))
+    return sorted(found)
+
+
+def load_checkpoints(base_path: str, at_ms: int, tickers: Optional[Iterable[str]] = None,
+                     max_age: Optional[float] = None, max_days: int = 1) -> Dict[str, Checkpoint]:
+    """
+    The latest checkpoint at or before `at_ms` for each ticker (every ticker found if
+    None), looking back through `at_ms`'s day and up to `max_days` days before it.
+    Files are opened newest first and the search stops once every ticker is found.
+    """
+    wanted = set(tickers) if tickers is not None else None
+    oldest_ms = at_ms - int(max_age * 1000) if max_age is not None else None
+    found: Dict[str, Checkpoint] = {}
+    day = _day_of(at_ms)
+    for back in range(max_days + 1):
+        for first, last, path in reversed(checkpoint_files(base_path, day - timedelta(days=back))):
+            if first > at_ms:
+                continue
+            if oldest_ms is not None and last < oldest_ms:
+                return found
+            table = pq.read_table(path)
+            mask = pc.less_equal(table.column("ts"), pa.scalar(at_ms, pa.timestamp('ms')))
+            if wanted is not None:
+                mask = pc.and_(mask, pc.is_in(table.column("ticker"), pa.array(sorted(wanted - set(found)))))
+            table = table.filter(mask)
+            rows = zip(table.column("ticker").to_pylist(), table.column("ts").cast(pa.int64()).to_pylist(),
+                       table.column("seq").to_pylist(), table.column("bids").to_pylist(),
+                       table.column("asks").to_pylist())
+            for ticker, ts_ms, seq, bids, asks in rows:
+                prev = found.get(ticker)
+                if (prev is None or ts_ms > prev.ts_ms) and (oldest_ms is None or ts_ms >= oldest_ms):
+                    found[ticker] = Checkpoint(ticker, ts_ms, seq,
+                                               [(l["price_cents"], l["size"]) for l in bids],
+                                               [(l["price_cents"], l["size"]) for l in asks])
+            if wanted is not None and wanted <= set(found):
+                return found
+    return found
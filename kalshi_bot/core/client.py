@@ -1,23 +1,38 @@
 # kalshi_bot/core/client.py
 import asyncio
 import json
+import os
 import websockets
 import requests
 from dataclasses import dataclass
-from typing import Dict, Callable, Any
+from typing import Dict, Callable, Any, Iterable, Optional
 from cryptography.hazmat.primitives import hashes, serialization
 from cryptography.hazmat.primitives.asymmetric import padding
 import time
 import base64
 import pandas as pd
 
+from kalshi_bot.core.capture import FrameCapture
+from kalshi_bot.core.checkpoint import CheckpointWriter, load_checkpoints
 from kalshi_bot.core.data.order_book import OrderBook
-from kalshi_bot.core.delta_recorder import DeltaRecorder
+from kalshi_bot.core.data.array_order_book import ArrayOrderBook
+from kalshi_bot.core.data.book_matrix import BookMatrix
+from kalshi_bot.core.data.market import Market, MarketRef
+from kalshi_bot.core.decoder import Frame, get_decoder
+from kalshi_bot.core.discovery import MarketDiscovery
+from kalshi_bot.core.delta_recorder import BLOCK, POLICIES, NullRecorder, RecorderService
+from kalshi_bot.core.event_bus import EventBus
+from kalshi_bot.core.market_cache import MarketCache
+from kalshi_bot.core.ring_buffer import RingWriter
+from kalshi_bot.core.seq_tracker import SeqTracker, SEQ_GAP, SEQ_DUPLICATE
+from kalshi_bot.core.supervisor import ConnectionSupervisor
 from kalshi_bot.strategy.sweep import Sweep
-from kalshi_bot.util.util import get_signed_headers, get_nba_sport_markets
+from kalshi_bot.util.clock import SYSTEM_CLOCK, Clock
+from kalshi_bot.util.util import get_signed_headers, get_nba_sport_markets, NBA_TICKER
 from kalshi_bot.util.load_credential import load_credentials
 from kalshi_bot.util.logger import get_logger
 from kalshi_bot.monitor.heartbeat import heartbeat
+from kalshi_bot.monitor.latency import LatencyTracer, Trace, parse_exchange_ts
 
 TARGET_TICKER = "KXNFLGAME-25DEC04DALDET-DET"
 
@@ -26,23 +41,123 @@ WS_URL = "wss://live-api-v2.kalshi.com/trade/api/v2/ws"
 
 logger = get_logger('kalshi_client')
 
+# Depth of the top-N ladder we record and hand to strategies
+TOP_N_DEPTH = 5
+
+# Subscribe this many markets at a time, waiting for their acks in between
+SUBSCRIBE_BATCH = 20
+SUBSCRIBE_ACK_TIMEOUT = 5.0
+# Resends of a batch's unacked subscriptions before giving up on them until the next connection
+SUBSCRIBE_RETRIES = 2
+
+# Seconds close() may spend draining the recorder — under Docker's 10 s SIGTERM → SIGKILL grace
+DRAIN_TIMEOUT = 8.0
+
+# Warm start: preload books from checkpoints no older than this (seconds)
+WARM_START_MAX_AGE = 900.0
+
+# How often the ring's resync requests (reader attached or lapped) are checked, seconds
+RING_RESYNC_POLL = 0.05
+
+# Order book backends selectable per client
+ORDER_BOOK_BACKENDS = {
+    "heap": OrderBook,
+    "array": ArrayOrderBook,
+}
+
 class KalshiClient:
-    def __init__(self, api_key: str, pk: str):
+    def __init__(self, api_key: str, pk: str, book_backend: str = "heap", use_book_matrix: bool = False,
+                 decoder: str = "auto", markets: Optional[list[Market]] = None, name: str = "kalshi_ws",
+                 ring_name: Optional[str] = None, discovery_interval: Optional[float] = None,
+                 market_filter: Optional[Callable[[Market], bool]] = None,
+                 market_cache: Optional[MarketCache] = None, record_policy: str = BLOCK,
+                 wal_dir: Optional[str] = None, drain_timeout: float = DRAIN_TIMEOUT,
+                 capture_dir: Optional[str] = None, record_path: Optional[str] = "kalshi_deltas",
+                 clock: Clock = SYSTEM_CLOCK, checkpoint_dir: Optional[str] = None,
+                 checkpoint_interval: float = 60.0):
         self.api_key = api_key
         self.pk = pk
+        self._private_key = None
         self.ws_url = "wss://api.elections.kalshi.com/trade-api/ws/v2"
         self.on_update = lambda x: None
+        # Every timestamp the client takes goes through here — replay swaps in a SimClock
+        self.clock = clock
+        # Replay: no socket, sids are adopted from recorded snapshots (see core/replay.py)
+        self.replaying = False
+        self.decoder = get_decoder(decoder)
         self.sweep = Sweep()
-        self.markets_ticket_map = {i.ticker: i for i in get_nba_sport_markets()}
-        self.target_tickers = [i for i in self.markets_ticket_map.keys()]
-        self.sid = None
-        self.order_recorders = {i: DeltaRecorder(ticker=i) for i in self.target_tickers}
-        self.order_book_cache = {i: OrderBook(i) for i in self.target_tickers}
-        
+        # Strategies get book updates through conflating per-subscriber mailboxes
+        self.bus = EventBus()
+        self.bus.subscribe(self.sweep.on_orderbook_update, name="sweep")
+        self.bus.subscribe(lambda book: self.on_update(book), name="on_update")
+        # Shards pass their slice of the market list; standalone clients use the cache or fetch the NBA slate
+        self.market_cache = market_cache
+        if markets is None:
+            markets = market_cache.open_markets() if market_cache is not None else get_nba_sport_markets()
+        self.name = name
+        self.markets_ticket_map: Dict[str, Market] = {}
+        self.target_tickers: list[str] = []
+        self._event_of: Dict[str, str] = {}
+        # Subscriptions: one sid per market
+        self.ws = None
+        self._cmd_id = 0
+        self._pending_subs: Dict[int, str] = {}     # command id → ticker awaiting ack
+        self.sid_to_ticker: Dict[int, str] = {}
+        self.ticker_to_sid: Dict[str, int] = {}
+        self.seq_tracker = SeqTracker()
+        self._subs_acked = asyncio.Event()
+        self._awaiting_snapshot: set[str] = set()
+        self.supervisor = ConnectionSupervisor(self._run_session, name=name)
+        self.tracer = LatencyTracer()
+        # One recorder (queue + writer thread) for every market of this client; None → keep nothing
+        self.recorder = RecorderService(base_path=record_path, policy=record_policy, tracer=self.tracer,
+                                        depth=TOP_N_DEPTH, spill_dir=os.path.join(record_path, "_spill", name),
+                                        wal_path=os.path.join(wal_dir, f"{name}.wal") if wal_dir else None,
+                                        clock=clock) \
+            if record_path else NullRecorder()
+        self.drain_timeout = drain_timeout
+        # Optional raw frame log for bit-exact replay (see core/capture.py)
+        self.capture = FrameCapture(capture_dir, name=name) if capture_dir else None
+        # Optional periodic full-ladder checkpoints: replay seeks and warm restarts (see core/checkpoint.py)
+        self.checkpoints = CheckpointWriter(checkpoint_dir, name=name, interval=checkpoint_interval) \
+            if checkpoint_dir else None
+        self._warm: set[str] = set()    # books preloaded from a checkpoint, not yet confirmed by a snapshot
+        # Scheduling delay of the loop this client runs on, reported in health() (started by the entry point)
+        self.loop_lag = None
+        self.book_cls = ORDER_BOOK_BACKENDS[book_backend]
+        self.order_book_cache: Dict[str, Any] = {}
+        # Optional cross-market ladder store for vectorized analytics (see BookMatrix.stats)
+        self.book_matrix = BookMatrix() if use_book_matrix else None
+        # Optional shared-memory feed for out-of-process strategies (see strategy/runner.py)
+        self.ring = RingWriter(ring_name) if ring_name else None
+        for m in markets:
+            self._register_market(m)
+        # Optional live market set: new games get subscribed, closed ones torn down
+        # The cache knows which series to follow — without it a poll would diff against the wrong slate
+        if discovery_interval and market_cache is None:
+            raise ValueError("market discovery needs a market_cache")
+        self.discovery = MarketDiscovery(self, fetch=market_cache.fetch_open, interval=discovery_interval,
+                                         market_filter=market_filter) if discovery_interval else None
+
+    def _register_market(self, market: Market) -> bool:
+        """Per-market state: book, matrix row. False if already held."""
+        ticker = market.ticker
+        if ticker in self.markets_ticket_map:
+            return False
+        self.markets_ticket_map[ticker] = market
+        self.target_tickers.append(ticker)
+        self._event_of[ticker] = market.event_ticker
+        self.order_book_cache[ticker] = self.book_cls(ticker)
+        if self.book_matrix is not None:
+            self.book_matrix.add_ticker(ticker)
+        return True
 
     def _auth_headers(self) -> Dict[str, str]:
         """Generate correct WebSocket auth headers (PKCS1v15, ms timestamp)."""
-        private_key = serialization.load_pem_private_key(self.pk.encode("utf-8"), password=None)
+        # PEM parsing is slow and blocks the loop — do it once, not on every reconnect
+        if self._private_key is None:
+            self._private_key = serialization.load_pem_private_key(self.pk.encode("utf-8"), password=None)
+        private_key = self._private_key
         
         timestamp = str(int(time.time() * 1000))  # Milliseconds!
         payload = timestamp + "GET" + "/trade-api/ws/v2"  # Exact payload for connect
@@ -63,115 +178,436 @@ class KalshiClient:
         }
 
     async def start(self):
+        await self.recorder.start()          # ← this is the magic line
+        if self.capture is not None:
+            self.capture.start(asyncio.get_running_loop())
+        if self.checkpoints is not None:
+            self._warm_start()
+            self.checkpoints.start()
+        self.bus.start()
+        if self.discovery is not None:
+            asyncio.create_task(self.discovery.run())
+        if self.ring is not None:
+            asyncio.create_task(self._serve_ring_resyncs())
+
+        # Reconnects forever; recorders above survive every reconnect
+        await self.supervisor.run()
+
+    async def close(self):
+        """Clean shutdown: write everything queued and finalize every part file (within `drain_timeout`)."""
+        self.supervisor.stop()
+        await self.recorder.close(timeout=self.drain_timeout)
+        if self.capture is not None:
+            await asyncio.to_thread(self.capture.close)
+        if self.checkpoints is not None:
+            await asyncio.to_thread(self.checkpoints.close)
+        if self.ring is not None:
+            self.ring.unlink()
+            self.ring = None
+
+    async def _run_session(self):
+        """One connection: re-sign, connect, resubscribe everything, read until the socket drops."""
         headers = self._auth_headers()
         print(f"Connecting with timestamp: {headers['KALSHI-ACCESS-TIMESTAMP']}")
 
-        for recorder in self.order_recorders.values():
-            await recorder.start()          # ← this is the magic line
-        
-        try:
-            async with websockets.connect(self.ws_url, extra_headers=headers) as ws:
-                print("✅ WebSocket connected!")
-                
-                # Initial subscribe (first ticker)
-                await self._subscribe_tickers(ws)  # Now with "id":1
-                
-                # Wait for confirmation (poll first few messages)
-                confirmation_received = False
-                for _ in range(5):  # Short timeout
-                    try:
-                        msg = await asyncio.wait_for(ws.recv(), timeout=2.0)
-                        data = json.loads(msg)
-                        if data.get("type") == "subscribed" and data.get("id") == 1:
-                            print(f"✅ Initial sub confirmed: {data.get('subscriptions')}")
-                            # Extract sid from response, e.g., data["subscriptions"][0]["sid"]
-                            self.sid = data["msg"]["sid"]  # Assume first channel
-                            confirmation_received = True
-                            break
-                    except asyncio.TimeoutError:
-                        pass
-                
-                if not confirmation_received:
-                    raise ValueError("No sub confirmation—check auth/id")
-                
-                # Now add remaining tickers
-                if len(self.target_tickers) > 1:
-                    markets_to_add = self.target_tickers[1:]
-                    update_msg = {
-                        "id": 2,
-                        "cmd": "update_subscription",
-                        "params": {
-                            "sids": [self.sid],  # Dynamic from response!
-                            "market_tickers": markets_to_add,
-                            "action": "add_markets"
-                        }
-                    }
-                    await ws.send(json.dumps(update_msg))
-                    print("📤 Update sub sent")
-                
+        async with websockets.connect(self.ws_url, extra_headers=headers) as ws:
+            print("✅ WebSocket connected!")
+            self.ws = ws
+            self._reset_session_state()
+            capture = self.capture
+            if capture is not None:
+                capture.mark_connect()
+
+            subscriber = asyncio.create_task(self._resubscribe_all(ws))
+            try:
                 # SINGLE FOREVER LOOP: Handle all ongoing messages
+                clock = self.clock
                 async for message in ws:
-                    await self._handle_message(message)
-        except websockets.exceptions.InvalidStatusCode as e:
-            print(f"❌ Connection failed: {e.status_code} - {e.response_headers}")
-            print("Fix: Regenerate API key/private key at kalshi.com/account/api and ensure PEM is clean.")
-        except Exception as e:
-            print(f"❌ WS error: {e}")
-
-    async def _subscribe_tickers(self, ws):
-        """Subscribe to all ticker updates (prices, volume)."""
-        subscribe_msg = {
-            "id": 1,
-            "cmd": "subscribe",
-            "params": {"channels": ["orderbook_delta"],
-            "market_ticker": self.target_tickers[0]}
+                    recv_ns, recv_wall_ns = clock.monotonic_ns(), clock.time_ns()
+                    if capture is not None:
+                        capture.write(recv_wall_ns, message)
+                    await self._handle_message(message, recv_ns, recv_wall_ns)
+            finally:
+                subscriber.cancel()
+                # Retrieve its outcome — a send that failed (ConnectionClosed, …) must not vanish
+                result, = await asyncio.gather(subscriber, return_exceptions=True)
+                if isinstance(result, Exception):
+                    logger.warning(f"Subscribing failed: {result!r}")
+
+    def _reset_session_state(self, tickers: Optional[Iterable[str]] = None):
+        """
+        Sids die with the connection — drop them and blank every book until its snapshot lands.
+        `tickers` limits the blanking to the markets that connection held (replay of several shards).
+        """
+        self._pending_subs.clear()
+        self._subs_acked.set()
+        for sid in list(self.sid_to_ticker):
+            self.seq_tracker.forget(sid)
+        self.sid_to_ticker.clear()
+        self.ticker_to_sid.clear()
+
+        if tickers is None:
+            self._awaiting_snapshot = set(self.target_tickers)
+            tickers = list(self.order_book_cache)
+        else:
+            self._awaiting_snapshot.update(tickers)
+        for ticker in tickers:
+            book = self.order_book_cache.get(ticker)
+            if book is None or ticker in self._warm:
+                continue    # checkpointed ladder stays readable until its snapshot replaces it
+            book.apply_snapshot({}, 0)
+            if self.book_matrix is not None:
+                self.book_matrix.apply_snapshot(ticker, {}, 0)
+
+    def _warm_start(self):
+        """
+        Restart: load each book's latest recent checkpoint so it is readable before Kalshi's
+        snapshot lands. Warm books are not published to strategies, and the snapshot replaces them.
+        """
+        found = load_checkpoints(self.checkpoints.base_path, self.clock.time_ns() // 1_000_000,
+                                 self.target_tickers, max_age=WARM_START_MAX_AGE)
+        for ticker, cp in found.items():
+            book = self.order_book_cache.get(ticker)
+            if book is not None:
+                book.apply_snapshot(cp.snapshot(), cp.seq)
+                self._warm.add(ticker)
+        if found:
+            logger.info(f"Warm start: {len(self._warm)} book(s) loaded from checkpoints")
+
+    async def _resubscribe_all(self, ws):
+        """Subscribe every ticker in batches, waiting for each batch's acks before the next."""
+        tickers = list(self.target_tickers)
+        await self._subscribe_batches(ws, tickers)
+        print(f"📤 Subscribed {len(tickers)} market(s)")
+        self._check_recovered()
+
+    async def _subscribe_batches(self, ws, tickers: list[str]):
+        for i in range(0, len(tickers), SUBSCRIBE_BATCH):
+            batch = tickers[i:i + SUBSCRIBE_BATCH]
+            await self._subscribe_tickers(ws, batch)
+            for attempt in range(SUBSCRIBE_RETRIES + 1):
+                try:
+                    await asyncio.wait_for(self._subs_acked.wait(), timeout=SUBSCRIBE_ACK_TIMEOUT)
+                    break
+                except asyncio.TimeoutError:
+                    missing = list(self._pending_subs.values())
+                    self._pending_subs.clear()
+                    if attempt == SUBSCRIBE_RETRIES:
+                        # Still awaiting their snapshot, so the session never reports recovered
+                        self._subs_acked.set()
+                        logger.error(f"No subscription ack for {len(missing)} market(s) after "
+                                     f"{SUBSCRIBE_RETRIES} retries — giving up: {missing}")
+                        break
+                    logger.warning(f"No subscription ack for {len(missing)} market(s) — retrying: {missing}")
+                    await self._subscribe_tickers(ws, missing)
+
+    def _check_recovered(self):
+        if not self._awaiting_snapshot and not self._pending_subs:
+            self.supervisor.mark_recovered()
+
+    def _next_cmd_id(self) -> int:
+        self._cmd_id += 1
+        return self._cmd_id
+
+    async def _subscribe_tickers(self, ws, tickers: list[str]):
+        """Subscribe each market to orderbook_delta on its own sid."""
+        for ticker in tickers:
+            cmd_id = self._next_cmd_id()
+            self._pending_subs[cmd_id] = ticker
+            self._subs_acked.clear()
+            subscribe_msg = {
+                "id": cmd_id,
+                "cmd": "subscribe",
+                "params": {"channels": ["orderbook_delta"],
+                "market_ticker": ticker}
+            }
+            await ws.send(json.dumps(subscribe_msg))
+
+    async def _unsubscribe_sids(self, ws, sids: list[int]):
+        await ws.send(json.dumps({
+            "id": self._next_cmd_id(),
+            "cmd": "unsubscribe",
+            "params": {"sids": sids},
+        }))
+
+    def _on_subscribed(self, frame: Frame):
+        ticker = self._pending_subs.pop(frame.id, None)
+        sid = frame.msg["sid"]
+        if ticker is None:
+            if not self.replaying:
+                print(f"📨 Unmatched subscription ack: {frame}")
+            return
+        if ticker not in self.markets_ticket_map:
+            # Removed while the subscribe was in flight
+            if not self._pending_subs:
+                self._subs_acked.set()
+            asyncio.create_task(self._unsubscribe_sids(self.ws, [sid]))
+            return
+        self.sid_to_ticker[sid] = ticker
+        self.ticker_to_sid[ticker] = sid
+        if not self._pending_subs:
+            self._subs_acked.set()
+        logger.info(f"Subscribed {ticker} on sid {sid}")
+
+    def _adopt_sid(self, ticker: str, sid: int):
+        """Replay: a recorded snapshot starts a subscription we never made — bind it (and the market)."""
+        if ticker not in self.order_book_cache:
+            self._register_market(MarketRef.from_ticker(ticker))
+        old_sid = self.ticker_to_sid.get(ticker)
+        if old_sid is not None:
+            self.sid_to_ticker.pop(old_sid, None)
+            self.seq_tracker.forget(old_sid)
+        self.sid_to_ticker[sid] = ticker
+        self.ticker_to_sid[ticker] = sid
+
+    async def _serve_ring_resyncs(self):
+        """Republish every consistent book when a ring reader asks (it attached, or was lapped)."""
+        while self.ring is not None:
+            if self.ring.resync_requested():
+                # Books still waiting for their snapshot publish it when it lands
+                self.ring.republish({
+                    t: b for t, b in self.order_book_cache.items()
+                    if t not in self._awaiting_snapshot and t not in self._warm
+                    and not self.seq_tracker.is_quarantined(t)
+                })
+            await asyncio.sleep(RING_RESYNC_POLL)
+
+    async def _resync_market(self, ticker: str):
+        """
+        Quarantine one market and rebuild it from a fresh snapshot by resubscribing
+        it alone — every other market keeps streaming on the same connection.
+        """
+        self.seq_tracker.quarantine(ticker)
+        old_sid = self.ticker_to_sid.pop(ticker, None)
+        if old_sid is not None:
+            self.sid_to_ticker.pop(old_sid, None)
+            self.seq_tracker.forget(old_sid)
+        if self.ws is None:
+            return      # offline (replay): the next recorded snapshot rebuilds it
+        if old_sid is not None:
+            await self._unsubscribe_sids(self.ws, [old_sid])
+        await self._subscribe_tickers(self.ws, [ticker])
+
+    # ————————————————————————
+    # Live market set (see MarketDiscovery)
+    # ————————————————————————
+    def _connected(self) -> bool:
+        return self.ws is not None and self.ws.open
+
+    async def add_markets(self, markets: list[Market]):
+        """Start holding `markets`: books and recorders now, subscriptions in batches if connected."""
+        added = [m.ticker for m in markets if self._register_market(m)]
+        if not added:
+            return
+        self._awaiting_snapshot.update(added)
+        # Not connected → the next session's _resubscribe_all picks them up
+        if self._connected():
+            await self._subscribe_batches(self.ws, added)
+        logger.info(f"Added {len(added)} market(s), now {len(self.target_tickers)}")
+
+    async def remove_markets(self, tickers: list[str]):
+        """Stop holding `tickers`: unsubscribe in batches, finalize their files, free books."""
+        tickers = [t for t in tickers if t in self.markets_ticket_map]
+        if not tickers:
+            return
+        sids = []
+        for ticker in tickers:
+            self.markets_ticket_map.pop(ticker)
+            self.target_tickers.remove(ticker)
+            self._event_of.pop(ticker, None)
+            self._awaiting_snapshot.discard(ticker)
+            self.seq_tracker.discard(ticker)
+            self.order_book_cache.pop(ticker, None)
+            self._warm.discard(ticker)
+            if self.checkpoints is not None:
+                self.checkpoints.forget(ticker)
+            if self.book_matrix is not None:
+                self.book_matrix.remove_ticker(ticker)
+            sid = self.ticker_to_sid.pop(ticker, None)
+            if sid is not None:
+                self.sid_to_ticker.pop(sid, None)
+                self.seq_tracker.forget(sid)
+                sids.append(sid)
+
+        if sids and self._connected():
+            for i in range(0, len(sids), SUBSCRIBE_BATCH):
+                await self._unsubscribe_sids(self.ws, sids[i:i + SUBSCRIBE_BATCH])
+        for ticker in tickers:
+            self.recorder.retire(ticker)
+        self._check_recovered()
+        logger.info(f"Removed {len(tickers)} market(s), now {len(self.target_tickers)}")
+
+    def seq_stats(self) -> dict:
+        """Gap / duplicate / recovery counters (see SeqTracker.stats)."""
+        return self.seq_tracker.stats()
+
+    def health(self) -> dict:
+        """Connection and book-consistency counters in one place, for monitoring."""
+        return {
+            "name": self.name,
+            "connection": self.supervisor.stats(),
+            "seq": self.seq_tracker.stats(),
+            "markets": len(self.target_tickers),
+            "awaiting_snapshot": len(self._awaiting_snapshot),
+            "strategies": self.bus.stats(),
+            "latency": self.tracer.summary(),
+            "recorder": self.recorder.stats(),
+            "discovery": self.discovery.stats() if self.discovery is not None else None,
+            "capture": self.capture.stats() if self.capture is not None else None,
+            "checkpoints": self.checkpoints.stats() if self.checkpoints is not None else None,
+            "warm_books": len(self._warm),
+            "loop_lag": self.loop_lag.stats() if self.loop_lag is not None else None,
         }
-        await ws.send(json.dumps(subscribe_msg))
 
-    async def _handle_message(self, msg: str):
+    async def _handle_message(self, msg, recv_ns: Optional[int] = None, recv_wall_ns: Optional[int] = None):
         """Process incoming messages and trigger on_update."""
-        data = json.loads(msg)
-        msg_type = data.get("type")
-        payload = data['msg']
+        clock = self.clock
+        if recv_ns is None:
+            recv_ns, recv_wall_ns = clock.monotonic_ns(), clock.time_ns()
+        frame = self.decoder.decode(msg)
+        msg_type = frame.type
+        payload = frame.msg
         if msg_type == "ok":
             print(f"✅ Subscription confirmed!")
 
-        elif msg_type == 'orderbook_snapshot':
-            logger.info(f"Applying Snapshot to: {payload['market_ticker']}")
-            mt = payload['market_ticker']
-            self.order_book_cache[mt].apply_snapshot(payload, data['seq'])
-            bbid, bask = self.order_book_cache[mt].best_bid(), self.order_book_cache[mt].best_ask()
-            bid_vol, ask_vol = self.order_book_cache[mt].bid_volume(), self.order_book_cache[mt].ask_volume()
-            mid = self.order_book_cache[mt].mid()
-            top_n = self.order_book_cache[mt].top_n(5)
-            # update tracker
-            await self.order_recorders[mt].log_snapshot(data['seq'], bbid=bbid, bask=bask, mid=mid, bid_vol=bid_vol, ask_vol=ask_vol, top_n=top_n)
-
-        elif msg_type == "orderbook_delta":
+        elif msg_type == "subscribed":
+            self._on_subscribed(frame)
+
+        elif msg_type == "unsubscribed":
+            logger.info(f"Unsubscribed sid {frame.sid}")
+
+        elif msg_type in ("orderbook_snapshot", "orderbook_delta"):
+            sid, seq = frame.sid, frame.seq
             mt = payload['market_ticker']
-            self.order_book_cache[mt].apply_delta(update=payload, seq=data['seq'])
-            # Update tracker
-            bbid, bask = self.order_book_cache[mt].best_bid(), self.order_book_cache[mt].best_ask()
-            bid_vol, ask_vol = self.order_book_cache[mt].bid_volume(), self.order_book_cache[mt].ask_volume()
-            mid = self.order_book_cache[mt].mid()
-            top_n = self.order_book_cache[mt].top_n(5)
-            await self.order_recorders[mt].log_delta(delta_msg=payload, seq=data['seq'], bbid=bbid, bask=bask, mid=mid, bid_vol=bid_vol, ask_vol=ask_vol, top_n=top_n)
+            if self.ticker_to_sid.get(mt) != sid:
+                if not (self.replaying and msg_type == "orderbook_snapshot"):
+                    return  # stale frame from a sid we already dropped
+                self._adopt_sid(mt, sid)
+
+            status = self.seq_tracker.check(sid, seq)
+            if status == SEQ_DUPLICATE:
+                return
+            if status == SEQ_GAP:
+                logger.warning(f"Seq gap on {mt} (sid {sid}) at {seq} — resyncing market")
+                await self._resync_market(mt)
+                return
+
+            book = self.order_book_cache.get(mt)
+            if book is None:
+                return  # market was removed mid-flight
+            if msg_type == 'orderbook_snapshot':
+                logger.info(f"Applying Snapshot to: {mt}")
+                book.apply_snapshot(payload, seq)
+                trace = Trace(None, recv_wall_ns, recv_ns, clock.monotonic_ns())
+                self.tracer.on_applied(mt, trace)
+                if self.book_matrix is not None:
+                    self.book_matrix.apply_snapshot(mt, payload, seq)
+                if self.ring is not None:
+                    self.ring.publish_snapshot(mt, seq, payload, book)
+                latency = self.seq_tracker.release(mt)
+                if latency is not None:
+                    logger.info(f"Recovered {mt} in {latency:.3f}s")
+                self._warm.discard(mt)
+                if mt in self._awaiting_snapshot:
+                    self._awaiting_snapshot.discard(mt)
+                    self._check_recovered()
+                if self.checkpoints is not None:
+                    self.checkpoints.offer(mt, book, seq, recv_wall_ns)
+                # One cached view per book change, shared by the recorder and strategies
+                await self.recorder.log_snapshot(mt, seq, view=book.view(TOP_N_DEPTH), trace=trace)
+                self.bus.publish(mt, self._event_of.get(mt), book)
+            else:
+                book.apply_delta(update=payload, seq=seq)
+                trace = Trace(parse_exchange_ts(payload.get("ts")), recv_wall_ns, recv_ns, clock.monotonic_ns())
+                self.tracer.on_applied(mt, trace)
+                if self.book_matrix is not None:
+                    self.book_matrix.apply_delta(mt, payload, seq)
+                if self.ring is not None:
+                    self.ring.publish_delta(mt, seq, payload, book)
+                if self.checkpoints is not None:
+                    self.checkpoints.offer(mt, book, seq, recv_wall_ns)
+                await self.recorder.log_delta(mt, delta_msg=payload, seq=seq, view=book.view(TOP_N_DEPTH), trace=trace)
+                self.bus.publish(mt, self._event_of.get(mt), book)
+
+        elif msg_type == "error":
+            logger.error(f"Exchange error: {payload}")
         else:
-            print(f"📨 Other: {data}")
+            print(f"📨 Other: {frame}")
 
 if __name__ == "__main__":
+    import argparse
+    import signal
+    from kalshi_bot.core.sharding import ShardCoordinator
+    from kalshi_bot.monitor.loop_lag import LoopLagMonitor
+    from kalshi_bot.util.runtime import LOOPS, run
+
+    parser = argparse.ArgumentParser(description="Kalshi order book recorder")
+    parser.add_argument("--shards", type=int, default=1, help="WebSocket connections, tickers hashed by event_ticker")
+    parser.add_argument("--processes", action="store_true", help="run each shard in its own worker process")
+    parser.add_argument("--book-backend", choices=sorted(ORDER_BOOK_BACKENDS), default="heap")
+    parser.add_argument("--ring", type=str, default=None, help="publish book events to this shared-memory ring")
+    parser.add_argument("--loop", choices=LOOPS, default="asyncio", help="event loop implementation")
+    parser.add_argument("--discover", type=float, default=None, metavar="SECONDS",
+                        help="re-poll open markets this often and follow the live set")
+    parser.add_argument("--backpressure", choices=POLICIES, default=BLOCK,
+                        help="when the recorder queue is full: wait, drop the oldest record, or spill to disk")
+    parser.add_argument("--series", nargs="+", default=[NBA_TICKER], help="series tickers to follow")
+    parser.add_argument("--wal", type=str, default=None, metavar="DIR",
+                        help="log queued rows to a memory-mapped WAL here; replayed into parquet on restart")
+    parser.add_argument("--drain-timeout", type=float, default=DRAIN_TIMEOUT,
+                        help="seconds to finish writing on shutdown before leaving the rest to the WAL")
+    parser.add_argument("--capture", type=str, default=None, metavar="DIR",
+                        help="also log raw frames here (hourly, zstd) for bit-exact replay")
+    parser.add_argument("--checkpoints", type=str, default=None, metavar="DIR",
+                        help="write full-ladder book checkpoints here (replay seeks, warm restarts)")
+    parser.add_argument("--market-cache", type=str, default="market_cache/markets.parquet",
+                        help="on-disk market catalog; restarts within its TTL skip the API")
+    args = parser.parse_args()
+
     api_key, pk = load_credentials()
-    client = KalshiClient(
-        api_key=api_key,
-        pk=pk
-    )
+    # Disk first — the API is only hit for a cold or expired catalog
+    cache = MarketCache(series=args.series, path=args.market_cache)
+    markets = cache.open_markets() if cache.load() and not cache.stale_series() else run(cache.warm())
+
+    if args.shards > 1:
+        client = ShardCoordinator(api_key=api_key, pk=pk, n_shards=args.shards, markets=markets,
+                                  market_cache=cache,
+                                  processes=args.processes, book_backend=args.book_backend,
+                                  ring_name=args.ring, discovery_interval=args.discover,
+                                  record_policy=args.backpressure, wal_dir=args.wal,
+                                  drain_timeout=args.drain_timeout, capture_dir=args.capture,
+                                  checkpoint_dir=args.checkpoints)
+    else:
+        client = KalshiClient(
+            api_key=api_key,
+            pk=pk,
+            markets=markets,
+            market_cache=cache,
+            book_backend=args.book_backend,
+            ring_name=args.ring,
+            discovery_interval=args.discover,
+            record_policy=args.backpressure,
+            wal_dir=args.wal,
+            drain_timeout=args.drain_timeout,
+            capture_dir=args.capture,
+            checkpoint_dir=args.checkpoints,
+        )
     #client.on_update = on_price_update
 
     async def all_tasks():
         # Start heartbeat in background
         asyncio.create_task(heartbeat())
+        # Report scheduling delay and the stack of anything that blocks the loop
+        client.loop_lag = LoopLagMonitor()
+        client.loop_lag.start()
+        # docker stop / restart sends SIGTERM — treat it like Ctrl-C so the finally below drains
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
 
         # Start your bot (websocket listener, etc.)
-        await client.start()
+        try:
+            await client.start()
+        finally:
+            # Ctrl-C / SIGTERM cancel us here — finalize parquet part files before exiting
+            await client.close()
 
-    asyncio.run(all_tasks())
+    run(all_tasks(), loop=args.loop)
@@ -0,0 +1,192 @@
+from array import array
+from typing import Optional
+
+from kalshi_bot.core.data.book_view import BookView
+from kalshi_bot.core.data.features import FeatureEngine, N_LEVELS
+
+_EMPTY_LEVELS = array('q', bytes(8 * N_LEVELS))
+
+
+class ArrayOrderBook:
+    """
+    Fixed-tick order book backend. Drop-in replacement for OrderBook.
+
+    Sizes live in two 100-slot integer arrays (YES bids, YES asks) indexed by
+    YES price in cents, so memory is constant for the life of the book and there
+    are no stale heap entries to clean. Best bid/ask are tracked incrementally;
+    prices are only converted to dollars at the API edge.
+    """
+
+    def __init__(self, ticker: str):
+        self.ticker = ticker
+
+        # index = YES price in cents, value = resting size
+        self.bid_levels = array('q', _EMPTY_LEVELS)
+        self.ask_levels = array('q', _EMPTY_LEVELS)
+
+        # Best prices in cents — 0 means no bids, N_LEVELS means no asks
+        self._best_bid: int = 0
+        self._best_ask: int = N_LEVELS
+
+        # CACHED volumes — updated only when book changes
+        self._total_bid_volume: int = 0
+        self._total_ask_volume: int = 0
+        self._volume_version: int = 0   # increments on every change
+
+        self.last_update_ts: int = 0
+        self.seq: int = 0
+
+        # Derived view, rebuilt lazily when _volume_version moves
+        self._view: Optional[BookView] = None
+        # Microstructure features, updated incrementally — over this book's own ladder, not a copy
+        self.features = FeatureEngine(bids=self.bid_levels, asks=self.ask_levels)
+
+    def bid_volume(self) -> int:
+        return self._total_bid_volume
+
+    def ask_volume(self) -> int:
+        return self._total_ask_volume
+
+    def total_volume(self) -> int:
+        return self._total_bid_volume + self._total_ask_volume
+
+    def _set_bid(self, cents: int, size: int):
+        size = max(0, size)
+        levels = self.bid_levels
+        self._total_bid_volume += size - levels[cents]
+        self._volume_version += 1
+        levels[cents] = size
+
+        if size > 0:
+            if cents > self._best_bid:
+                self._best_bid = cents
+        elif cents == self._best_bid:
+            # Best level emptied → walk down to the next resting bid
+            c = cents - 1
+            while c > 0 and levels[c] == 0:
+                c -= 1
+            self._best_bid = c
+
+    def _set_ask(self, cents: int, size: int):
+        size = max(0, size)
+        levels = self.ask_levels
+        self._total_ask_volume += size - levels[cents]
+        self._volume_version += 1
+        levels[cents] = size
+
+        if size > 0:
+            if cents < self._best_ask:
+                self._best_ask = cents
+        elif cents == self._best_ask:
+            # Best level emptied → walk up to the next resting ask
+            c = cents + 1
+            while c < N_LEVELS and levels[c] == 0:
+                c += 1
+            self._best_ask = c
+
+    def apply_snapshot(self, snapshot: dict, seq: int):
+        """Apply full order book snapshot (yes/no format from Kalshi)"""
+        self.bid_levels[:] = _EMPTY_LEVELS
+        self.ask_levels[:] = _EMPTY_LEVELS
+        self._best_bid = 0
+        self._best_ask = N_LEVELS
+        self._total_bid_volume = 0
+        self._total_ask_volume = 0
+        self._volume_version += 1
+        self.seq = seq
+        ts = snapshot.get("ts", 0)
+
+        # YES bids = people buying YES → direct bids
+        for price_cents, size in snapshot.get("yes", []):
+            if size > 0:
+                self._set_bid(price_cents, size)
+
+        # NO bids at p = YES asks at 100 - p (exact in integer cents)
+        for price_cents, size in snapshot.get("no", []):
+            if size > 0:
+                self._set_ask(N_LEVELS - price_cents, size)
+
+        self.features.apply_snapshot(snapshot)
+        self.last_update_ts = ts
+
+    def apply_delta(self, update: dict, seq: int):
+        """Apply incremental update: {price: int (cents), delta: int, side: 'yes'|'no', ts?: int}"""
+        self.seq = seq
+        price_cents = update["price"]
+        delta = update["delta"]
+        ts = update.get("ts", self.last_update_ts)
+
+        if update["side"] == "yes":
+            old = self.bid_levels[price_cents]
+            self._set_bid(price_cents, old + delta)
+            self.features.bid_changed(price_cents, old, self.bid_levels[price_cents])
+        else:  # side == "no"
+            yes_cents = N_LEVELS - price_cents
+            old = self.ask_levels[yes_cents]
+            self._set_ask(yes_cents, old + delta)
+            self.features.ask_changed(yes_cents, old, self.ask_levels[yes_cents])
+
+        self.last_update_ts = ts
+
+    # ————————————————————————
+    # Integer-cent accessors
+    # ————————————————————————
+    def best_bid_cents(self) -> int:
+        return self._best_bid
+
+    def best_ask_cents(self) -> int:
+        return self._best_ask
+
+    def top_n_cents(self, n: int = 10) -> dict:
+        bids, asks = [], []
+        levels = self.bid_levels
+        c = self._best_bid
+        while c > 0 and len(bids) < n:
+            if levels[c]:
+                bids.append((c, levels[c]))
+            c -= 1
+
+        levels = self.ask_levels
+        c = self._best_ask
+        while c < N_LEVELS and len(asks) < n:
+            if levels[c]:
+                asks.append((c, levels[c]))
+            c += 1
+
+        return {"bids": bids, "asks": asks}
+
+    # ————————————————————————
+    # Dollar API — same contract as OrderBook
+    # ————————————————————————
+    def best_bid(self) -> float:
+        return self._best_bid / 100.0
+
+    def best_ask(self) -> float:
+        return self._best_ask / 100.0
+
+    def mid(self) -> float:
+        bid, ask = self._best_bid, self._best_ask
+        if bid <= 0 and ask >= N_LEVELS: return 0.5
+        if bid <= 0: return ask / 100.0
+        if ask >= N_LEVELS: return bid / 100.0
+        return (bid + ask) / 200.0
+
+    def top_n(self, n: int = 10) -> dict:
+        top = self.top_n_cents(n)
+        return {
+            "bids": [(c / 100.0, size) for c, size in top["bids"]],
+            "asks": [(c / 100.0, size) for c, size in top["asks"]],
+        }
+
+    def view(self, n: int = 5) -> BookView:
+        """Cached top-of-book/mid/spread/top-N — computed at most once per book change."""
+        v = self._view
+        if v is None or v.version != self._volume_version or v.depth != n:
+            v = self._view = BookView.from_book(self, n)
+        return v
+
+    def __repr__(self):
+        bid = self.best_bid()
+        ask = self.best_ask()
+        spread = ask - bid if bid > 0 and ask < 1 else 0.0
+        return f"{self.ticker} | YES {bid:.4f} — {ask:.4f} (spread {spread:.4f})"
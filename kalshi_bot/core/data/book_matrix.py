@@ -0,0 +1,142 @@
+from typing import Dict, List, NamedTuple, Iterable
+
+import numpy as np
+
+from kalshi_bot.core.data.array_order_book import N_LEVELS
+
+# Side axis of the ladder
+BID, ASK = 0, 1
+
+
+class MatrixStats(NamedTuple):
+    """Cross-market top-of-book, one entry per row of BookMatrix.tickers (prices in dollars)."""
+    tickers: List[str]
+    best_bid: np.ndarray
+    best_ask: np.ndarray
+    mid: np.ndarray
+    spread: np.ndarray          # NaN when either side is empty
+    bid_depth: np.ndarray
+    ask_depth: np.ndarray
+    imbalance: np.ndarray       # (bid - ask) / (bid + ask), NaN on an empty book
+
+
+class BookMatrix:
+    """
+    Every subscribed market's ladder in one array: tickers × 100 price levels × 2 sides.
+
+    Sizes are indexed by YES price in cents exactly like ArrayOrderBook, so deltas are
+    applied in place with a single scalar write and every cross-market metric comes
+    out of one vectorized pass in `stats()`.
+    """
+
+    def __init__(self, tickers: Iterable[str] = (), capacity: int = 64):
+        self.levels = np.zeros((capacity, N_LEVELS, 2), dtype=np.int64)
+        self.seq = np.zeros(capacity, dtype=np.int64)
+        self.row_of: Dict[str, int] = {}
+        self.tickers: List[str] = []
+        for t in tickers:
+            self.add_ticker(t)
+
+    def __len__(self) -> int:
+        return len(self.tickers)
+
+    def add_ticker(self, ticker: str) -> int:
+        row = self.row_of.get(ticker)
+        if row is not None:
+            return row
+
+        row = len(self.tickers)
+        if row >= self.levels.shape[0]:
+            self._grow(2 * self.levels.shape[0])
+        self.row_of[ticker] = row
+        self.tickers.append(ticker)
+        return row
+
+    def remove_ticker(self, ticker: str):
+        """Free a market's row by moving the last row into it (rows stay dense)."""
+        row = self.row_of.pop(ticker, None)
+        if row is None:
+            return
+        last = len(self.tickers) - 1
+        if row != last:
+            moved = self.tickers[last]
+            self.levels[row] = self.levels[last]
+            self.seq[row] = self.seq[last]
+            self.tickers[row] = moved
+            self.row_of[moved] = row
+        self.levels[last] = 0
+        self.seq[last] = 0
+        self.tickers.pop()
+
+    def _grow(self, capacity: int):
+        levels = np.zeros((capacity, N_LEVELS, 2), dtype=np.int64)
+        levels[:self.levels.shape[0]] = self.levels
+        seq = np.zeros(capacity, dtype=np.int64)
+        seq[:self.seq.shape[0]] = self.seq
+        self.levels, self.seq = levels, seq
+
+    def apply_snapshot(self, ticker: str, snapshot: dict, seq: int):
+        """Replace one market's ladder with a Kalshi yes/no snapshot."""
+        row = self.add_ticker(ticker)
+        ladder = self.levels[row]
+        ladder[:] = 0
+        for price_cents, size in snapshot.get("yes", []):
+            if size > 0:
+                ladder[price_cents, BID] = size
+        # NO bids at p = YES asks at 100 - p
+        for price_cents, size in snapshot.get("no", []):
+            if size > 0:
+                ladder[N_LEVELS - price_cents, ASK] = size
+        self.seq[row] = seq
+
+    def apply_delta(self, ticker: str, update: dict, seq: int):
+        """In-place incremental update: {price: int (cents), delta: int, side: 'yes'|'no'}"""
+        row = self.row_of[ticker]
+        price_cents = update["price"]
+        if update["side"] == "yes":
+            c, side = price_cents, BID
+        else:
+            c, side = N_LEVELS - price_cents, ASK
+        ladder = self.levels[row]
+        ladder[c, side] = max(0, int(ladder[c, side]) + update["delta"])
+        self.seq[row] = seq
+
+    def stats(self) -> MatrixStats:
+        """Best bid/ask, mid, spread, depth and imbalance for every market in one call."""
+        n = len(self.tickers)
+        bids = self.levels[:n, :, BID]
+        asks = self.levels[:n, :, ASK]
+        has_bid = bids > 0
+        has_ask = asks > 0
+        any_bid = has_bid.any(axis=1)
+        any_ask = has_ask.any(axis=1)
+
+        # Highest resting bid / lowest resting ask, in cents (0 / 100 when empty)
+        bid_c = np.where(any_bid, N_LEVELS - 1 - np.argmax(has_bid[:, ::-1], axis=1), 0)
+        ask_c = np.where(any_ask, np.argmax(has_ask, axis=1), N_LEVELS)
+
+        best_bid = bid_c / 100.0
+        best_ask = ask_c / 100.0
+
+        # Same conventions as OrderBook.mid()
+        mid = np.where(any_bid & any_ask, (bid_c + ask_c) / 200.0,
+              np.where(any_bid, best_bid,
+              np.where(any_ask, best_ask, 0.5)))
+        spread = np.where(any_bid & any_ask, best_ask - best_bid, np.nan)
+
+        bid_depth = bids.sum(axis=1)
+        ask_depth = asks.sum(axis=1)
+        total = bid_depth + ask_depth
+        with np.errstate(invalid="ignore", divide="ignore"):
+            imbalance = np.where(total > 0, (bid_depth - ask_depth) / total, np.nan)
+
+        return MatrixStats(
+            tickers=list(self.tickers),
+            best_bid=best_bid,
+            best_ask=best_ask,
+            mid=mid,
+            spread=spread,
+            bid_depth=bid_depth,
+            ask_depth=ask_depth,
+            imbalance=imbalance,
+        )
@@ -0,0 +1,43 @@
+from typing import NamedTuple, Optional
+
+from kalshi_bot.core.data.features import BookFeatures
+
+
+class BookView(NamedTuple):
+    """
+    Immutable snapshot of everything derived from a book at one `_volume_version`.
+
+    Built at most once per book change (see `OrderBook.view`) and shared by the
+    recorder and strategies, so top-of-book/mid/top-N are never recomputed per consumer.
+    NamedTuple rather than a frozen dataclass — construction sits on the hot path.
+    """
+    ticker: str
+    version: int
+    seq: int
+    depth: int
+    best_bid: float
+    best_ask: float
+    mid: float
+    spread: Optional[float]     # None when either side is empty
+    bid_volume: int
+    ask_volume: int
+    top_n: dict
+    features: BookFeatures
+
+    @classmethod
+    def from_book(cls, book, n: int) -> "BookView":
+        bid, ask = book.best_bid(), book.best_ask()
+        return cls(
+            book.ticker,
+            book._volume_version,
+            book.seq,
+            n,
+            bid,
+            ask,
+            book.mid(),
+            (ask - bid) if bid > 0 and ask < 1 else None,
+            book.bid_volume(),
+            book.ask_volume(),
+            book.top_n(n),
+            book.features.values(),
+        )
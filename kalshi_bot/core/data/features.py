@@ -0,0 +1,212 @@
+from array import array
+from typing import NamedTuple, Optional
+
+# Kalshi prices sit on a 1–99 cent grid → one slot per cent, index = YES price in cents
+N_LEVELS = 100
+_EMPTY_LEVELS = array('q', bytes(8 * N_LEVELS))
+
+
+class BookFeatures(NamedTuple):
+    """Microstructure features at one book version. Prices in dollars."""
+    microprice: float
+    imbalance_l1: Optional[float]   # None when the top level is empty on both sides
+    imbalance_l5: Optional[float]
+    vwap_buy: Optional[float]       # avg YES price to buy `vwap_size` contracts, None if too thin
+    vwap_sell: Optional[float]      # avg YES price to sell `vwap_size` contracts
+    bid_levels: int
+    ask_levels: int
+
+
+class FeatureEngine:
+    """
+    Incremental microstructure features fed by the same snapshot/delta messages as the book.
+
+    Keeps its own integer-cent ladder so it can run standalone over recorded deltas —
+    live and offline features then come from the same code. Given a book's ladder
+    (`bids`/`asks`, as ArrayOrderBook has) it reads that one instead: the book writes
+    each level once and reports the change through `bid_changed`/`ask_changed`.
+    Each delta costs O(1) except when a level enters or leaves the top-`depth` window,
+    which re-walks at most `depth` resting levels.
+    """
+
+    def __init__(self, depth: int = 5, vwap_size: int = 100, bids: Optional[array] = None,
+                 asks: Optional[array] = None):
+        self.depth = depth
+        self.vwap_size = vwap_size
+
+        self._owns_ladder = bids is None
+        self.bids = array('q', _EMPTY_LEVELS) if bids is None else bids     # index = YES cents
+        self.asks = array('q', _EMPTY_LEVELS) if asks is None else asks
+        self.best_bid = 0                       # 0 = no bids
+        self.best_ask = N_LEVELS                # 100 = no asks
+        self.bid_levels = 0
+        self.ask_levels = 0
+
+        # Top-`depth` window: summed size and price of its deepest level (0 / 100 when not full)
+        self.bid_depth_sum = 0
+        self.ask_depth_sum = 0
+        self._bid_floor = 0
+        self._ask_floor = N_LEVELS
+
+        self.version = 0
+        self._cache: Optional[BookFeatures] = None
+        self._cache_version = -1
+
+    # ————————————————————————
+    # Input — same messages as OrderBook
+    # ————————————————————————
+    def apply_snapshot(self, snapshot: dict):
+        """With a shared ladder the book has already written it — only the derived state is rebuilt."""
+        if self._owns_ladder:
+            self.bids[:] = _EMPTY_LEVELS
+            self.asks[:] = _EMPTY_LEVELS
+            for price_cents, size in snapshot.get("yes", []):
+                if size > 0:
+                    self.bids[price_cents] = size
+            for price_cents, size in snapshot.get("no", []):
+                if size > 0:
+                    self.asks[N_LEVELS - price_cents] = size
+
+        self.bid_levels = sum(1 for s in self.bids if s)
+        self.ask_levels = sum(1 for s in self.asks if s)
+        self.best_bid = next((c for c in range(N_LEVELS - 1, 0, -1) if self.bids[c]), 0)
+        self.best_ask = next((c for c in range(1, N_LEVELS) if self.asks[c]), N_LEVELS)
+        self._rewalk_bids()
+        self._rewalk_asks()
+        self.version += 1
+
+    def apply_delta(self, update: dict):
+        """Own ladder only — a book sharing its ladder calls bid_changed/ask_changed instead."""
+        price_cents = update["price"]
+        if update["side"] == "yes":
+            old = self.bids[price_cents]
+            self.bids[price_cents] = size = max(0, old + update["delta"])
+            self.bid_changed(price_cents, old, size)
+        else:
+            c = N_LEVELS - price_cents
+            old = self.asks[c]
+            self.asks[c] = size = max(0, old + update["delta"])
+            self.ask_changed(c, old, size)
+
+    def bid_changed(self, c: int, old: int, size: int):
+        """The bid at `c` cents went from `old` to `size` (already written to the ladder)."""
+        self.version += 1
+        if (old > 0) == (size > 0):
+            # Level resized in place — window membership unchanged
+            if size and c >= self._bid_floor:
+                self.bid_depth_sum += size - old
+            return
+
+        if size:
+            self.bid_levels += 1
+            if c > self.best_bid:
+                self.best_bid = c
+        else:
+            self.bid_levels -= 1
+            if c == self.best_bid:
+                nc = c - 1
+                while nc > 0 and self.bids[nc] == 0:
+                    nc -= 1
+                self.best_bid = nc
+        # A level appeared/vanished: only the window needs re-walking, and only if touched
+        if c >= self._bid_floor:
+            self._rewalk_bids()
+
+    def ask_changed(self, c: int, old: int, size: int):
+        """The ask at `c` cents went from `old` to `size` (already written to the ladder)."""
+        self.version += 1
+        if (old > 0) == (size > 0):
+            if size and c <= self._ask_floor:
+                self.ask_depth_sum += size - old
+            return
+
+        if size:
+            self.ask_levels += 1
+            if c < self.best_ask:
+                self.best_ask = c
+        else:
+            self.ask_levels -= 1
+            if c == self.best_ask:
+                nc = c + 1
+                while nc < N_LEVELS and self.asks[nc] == 0:
+                    nc += 1
+                self.best_ask = nc
+        if c <= self._ask_floor:
+            self._rewalk_asks()
+
+    def _rewalk_bids(self):
+        total, found, c = 0, 0, self.best_bid
+        while c > 0 and found < self.depth:
+            if self.bids[c]:
+                total += self.bids[c]
+                found += 1
+            c -= 1
+        self.bid_depth_sum = total
+        # Window not full → every new level belongs to it
+        self._bid_floor = c + 1 if found == self.depth else 0
+
+    def _rewalk_asks(self):
+        total, found, c = 0, 0, self.best_ask
+        while c < N_LEVELS and found < self.depth:
+            if self.asks[c]:
+                total += self.asks[c]
+                found += 1
+            c += 1
+        self.ask_depth_sum = total
+        self._ask_floor = c - 1 if found == self.depth else N_LEVELS
+
+    # ————————————————————————
+    # Features
+    # ————————————————————————
+    def microprice(self) -> float:
+        bid, ask = self.best_bid, self.best_ask
+        bid_sz = self.bids[bid] if bid > 0 else 0
+        ask_sz = self.asks[ask] if ask < N_LEVELS else 0
+        total = bid_sz + ask_sz
+        if bid_sz and ask_sz:
+            return (bid * ask_sz + ask * bid_sz) / total / 100.0
+        # One-sided or empty — same fallbacks as OrderBook.mid()
+        if bid_sz: return bid / 100.0
+        if ask_sz: return ask / 100.0
+        return 0.5
+
+    def imbalance_l1(self) -> Optional[float]:
+        bid_sz = self.bids[self.best_bid] if self.best_bid > 0 else 0
+        ask_sz = self.asks[self.best_ask] if self.best_ask < N_LEVELS else 0
+        total = bid_sz + ask_sz
+        return (bid_sz - ask_sz) / total if total else None
+
+    def imbalance_l5(self) -> Optional[float]:
+        total = self.bid_depth_sum + self.ask_depth_sum
+        return (self.bid_depth_sum - self.ask_depth_sum) / total if total else None
+
+    def vwap(self, size: int, buy: bool) -> Optional[float]:
+        """Average YES price to buy (lift asks) or sell (hit bids) `size` contracts."""
+        remaining, notional = size, 0
+        if buy:
+            levels, c, step, stop = self.asks, self.best_ask, 1, N_LEVELS
+        else:
+            levels, c, step, stop = self.bids, self.best_bid, -1, 0
+        while c != stop and remaining > 0:
+            take = min(levels[c], remaining)
+            notional += take * c
+            remaining -= take
+            c += step
+        if remaining > 0:
+            return None
+        return notional / size / 100.0
+
+    def values(self) -> BookFeatures:
+        """All features, computed at most once per ladder change."""
+        if self._cache_version != self.version:
+            self._cache = BookFeatures(
+                self.microprice(),
+                self.imbalance_l1(),
+                self.imbalance_l5(),
+                self.vwap(self.vwap_size, buy=True),
+                self.vwap(self.vwap_size, buy=False),
+                self.bid_levels,
+                self.ask_levels,
+            )
+            self._cache_version = self.version
+        return self._cache
@@ -1,67 +1,151 @@
-from dataclasses import dataclass, field
 from datetime import datetime
 from decimal import Decimal
-from typing import Dict, List, Optional
+from typing import Any, Dict, Iterable, NamedTuple, Optional
+
+import pyarrow as pa
+
+# API timestamps — kept as ISO strings until first read
+_TIME_FIELDS = (
+    "close_time",
+    "created_time",
+    "expected_expiration_time",
+    "expiration_time",
+    "latest_expiration_time",
+    "open_time",
+)
+
+# === Required fields (no defaults) ===
+_REQUIRED = (
+    "can_close_early", "category", "close_time", "created_time", "event_ticker",
+    "expected_expiration_time", "expiration_time", "expiration_value", "last_price",
+    "market_type", "no_ask", "no_bid", "open_interest", "volume", "volume_24h", "open_time",
+    "previous_price", "previous_yes_ask", "previous_yes_bid", "rules_primary", "status",
+    "strike_type", "tick_size", "ticker", "title", "yes_ask", "yes_bid",
+)
+
+# === Optional / defaulted fields ===
+_DEFAULTS: Dict[str, Any] = {
+    "custom_strike": None,
+    "early_close_condition": None,
+    "latest_expiration_time": None,
+    "liquidity": 0,
+    "liquidity_dollars": None,
+    "no_ask_dollars": None,
+    "no_bid_dollars": None,
+    "no_sub_title": None,
+    "notional_value": None,
+    "notional_value_dollars": None,
+    "previous_price_dollars": None,
+    "previous_yes_ask_dollars": None,
+    "previous_yes_bid_dollars": None,
+    "price_level_structure": None,
+    "price_ranges": (),
+    "response_price_units": "per_share",  # almost always this
+    "result": "",  # empty until settled
+    "risk_limit_cents": None,
+    "rules_secondary": None,
+    "settlement_timer_seconds": None,
+    "subtitle": None,
+    "yes_ask_dollars": None,
+    "yes_bid_dollars": None,
+    "yes_sub_title": None,
+    "last_price_dollars": None,
+}
+
+FIELDS = _REQUIRED + tuple(_DEFAULTS)
+_REQUIRED_SET = frozenset(_REQUIRED)
+
+
+def _parse_time(ts) -> Optional[datetime]:
+    if ts is None or isinstance(ts, datetime):
+        return ts
+    return datetime.fromisoformat(ts.replace("Z", "+00:00"))
+
+
+class _LazyTime:
+    """Datetime attribute backed by the raw ISO string; parsed on first read, then cached."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.slot = "_" + name
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        value = getattr(obj, self.slot)
+        if isinstance(value, str):
+            value = _parse_time(value)
+            object.__setattr__(obj, self.slot, value)
+        return value
+
+    def __set__(self, obj, value):
+        raise AttributeError(f"Market is immutable ({self.name})")
+
 
-@dataclass(frozen=True)
 class Market:
-    # === Required fields (no defaults) – must come first ===
-    can_close_early: bool
-    category: str
-    close_time: datetime
-    created_time: datetime
-    event_ticker: str
-    expected_expiration_time: datetime
-    expiration_time: datetime
-    expiration_value: str
-    last_price: int
-    market_type: str
-    no_ask: int
-    no_bid: int
-    open_interest: int
-    volume: int
-    volume_24h: int
-    open_time: datetime
-    previous_price: int
-    previous_yes_ask: int
-    previous_yes_bid: int
-    rules_primary: str
-    status: str
-    strike_type: str
-    tick_size: int
-    ticker: str
-    title: str
-    yes_ask: int
-    yes_bid: int
-
-    # === Optional / defaulted fields – all go after ===
-    custom_strike: Optional[Dict[str, str]] = None
-    early_close_condition: Optional[str] = None
-    latest_expiration_time: Optional[datetime] = None
-    liquidity: int = 0
-    liquidity_dollars: Optional[str] = None
-    no_ask_dollars: Optional[str] = None
-    no_bid_dollars: Optional[str] = None
-    no_sub_title: Optional[str] = None
-    notional_value: Optional[int] = None
-    notional_value_dollars: Optional[str] = None
-    previous_price_dollars: Optional[str] = None
-    previous_yes_ask_dollars: Optional[str] = None
-    previous_yes_bid_dollars: Optional[str] = None
-    price_level_structure: Optional[str] = None
-    price_ranges: List[Dict] = field(default_factory=list)
-    response_price_units: str = "per_share"  # almost always this
-    result: str = ""  # empty until settled
-    risk_limit_cents: Optional[int] = None
-    rules_secondary: Optional[str] = None
-    settlement_timer_seconds: Optional[int] = None
-    subtitle: Optional[str] = None
-    yes_ask_dollars: Optional[str] = None
-    yes_bid_dollars: Optional[str] = None
-    yes_sub_title: Optional[str] = None
-    last_price_dollars: Optional[str] = None
+    """
+    One Kalshi market. Slotted (no per-instance dict), immutable, prices in integer cents.
+
+    Timestamps stay as the API's ISO strings until they are read, so building thousands
+    of markets for a catalog never pays for datetime parsing it does not use.
+    """
+
+    __slots__ = tuple(f for f in FIELDS if f not in _TIME_FIELDS) + tuple("_" + f for f in _TIME_FIELDS)
+
+    def __init__(self, **fields):
+        self._fill(fields)
+
+    @classmethod
+    def from_api(cls, raw: dict) -> "Market":
+        """Build from one entry of a `/markets` response. Unknown keys are ignored."""
+        self = object.__new__(cls)
+        self._fill(raw)
+        return self
+
+    def _fill(self, fields: dict):
+        if not _REQUIRED_SET.issubset(fields):
+            missing = sorted(_REQUIRED_SET.difference(fields))
+            raise TypeError(f"Market missing required field(s): {', '.join(missing)}")
+        get = fields.get
+        for set_slot, name, default in _SLOT_SETTERS:
+            set_slot(self, get(name, default))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Market is immutable ({name})")
+
+    def __getstate__(self):
+        return {s: object.__getattribute__(self, s) for s in self.__slots__}
+
+    def __setstate__(self, state):
+        for k, v in state.items():
+            object.__setattr__(self, k, v)
+
+    def __eq__(self, other):
+        if not isinstance(other, Market):
+            return NotImplemented
+        return self.__getstate__() == other.__getstate__()
+
+    def __hash__(self):
+        return hash(self.ticker)
+
+    def __repr__(self):
+        return f"Market(ticker={self.ticker!r}, status={self.status!r}, yes_bid={self.yes_bid}, yes_ask={self.yes_ask})"
 
     # === Helpful computed properties ===
+    @property
+    def spread_cents(self) -> int:
+        return self.yes_ask - self.yes_bid
+
+    @property
+    def spread_bp(self) -> int:
+        # 1¢ on a $1 contract = 100bp
+        return self.spread_cents * 100
+
+    @property
+    def mid_cents_x2(self) -> int:
+        """Twice the mid in cents — stays an integer."""
+        return self.yes_bid + self.yes_ask
+
     @property
     def yes_bid_decimal(self) -> Decimal:
         return Decimal(self.yes_bid) / 100
@@ -78,10 +162,76 @@ class Market:
     def previous_price_decimal(self) -> Decimal:
         return Decimal(self.previous_price) / 100
 
-    @property
-    def spread_cents(self) -> int:
-        return self.yes_ask - self.yes_bid
 
-    @property
-    def spread_bp(self) -> Decimal:
-        return Decimal(self.spread_cents) / 100
\ No newline at end of file
+for _name in _TIME_FIELDS:
+    setattr(Market, _name, _LazyTime(_name))
+del _name
+
+# Slot descriptors' own setters — bypass the immutable __setattr__ and any per-field branching
+_SLOT_SETTERS = tuple(
+    (Market.__dict__["_" + f if f in _TIME_FIELDS else f].__set__, f, _DEFAULTS.get(f)) for f in FIELDS
+)
+
+
+class MarketRef(NamedTuple):
+    """Just enough of a market to hold its book — replays know tickers, not `/markets` entries."""
+    ticker: str
+    event_ticker: str
+
+    @classmethod
+    def from_ticker(cls, ticker: str) -> "MarketRef":
+        # KXNBAGAME-25DEC04LALBOS-LAL → KXNBAGAME-25DEC04LALBOS
+        return cls(ticker, ticker.rsplit("-", 1)[0])
+
+
+# ————————————————————————
+# Columnar catalog
+# ————————————————————————
+_TS = pa.timestamp("us", tz="UTC")
+
+MARKET_ARROW_SCHEMA = pa.schema([
+    ("ticker", pa.string()),
+    ("event_ticker", pa.string()),
+    ("status", pa.string()),
+    ("market_type", pa.string()),
+    ("category", pa.string()),
+    ("title", pa.string()),
+    ("yes_bid", pa.int32()),
+    ("yes_ask", pa.int32()),
+    ("no_bid", pa.int32()),
+    ("no_ask", pa.int32()),
+    ("last_price", pa.int32()),
+    ("previous_price", pa.int32()),
+    ("volume", pa.int64()),
+    ("volume_24h", pa.int64()),
+    ("open_interest", pa.int64()),
+    ("liquidity", pa.int64()),
+    ("tick_size", pa.int32()),
+    ("result", pa.string()),
+    ("can_close_early", pa.bool_()),
+    ("open_time", _TS),
+    ("close_time", _TS),
+    ("expected_expiration_time", _TS),
+    ("expiration_time", _TS),
+    ("latest_expiration_time", _TS),
+])
+
+_RAW_SCHEMA = pa.schema([
+    pa.field(f.name, pa.string() if f.type == _TS else f.type) for f in MARKET_ARROW_SCHEMA
+])
+
+
+def markets_to_arrow(raws: Iterable[dict]) -> pa.Table:
+    """
+    Raw `/markets` entries → Arrow table (MARKET_ARROW_SCHEMA) without building Market
+    objects; timestamps are converted column-wise.
+    """
+    raws = raws if isinstance(raws, list) else list(raws)
+    columns = [pa.array([r.get(f.name) for r in raws], type=f.type) for f in _RAW_SCHEMA]
+    # ISO-8601 strings ("...Z") cast straight to tz-aware timestamps
+    return pa.Table.from_arrays(columns, schema=_RAW_SCHEMA).cast(MARKET_ARROW_SCHEMA)
+
+
+def page_to_arrow(page: dict) -> pa.Table:
+    """One `/markets` response page (`{"markets": [...], "cursor": ...}`) → Arrow table."""
+    return markets_to_arrow(page.get("markets") or [])
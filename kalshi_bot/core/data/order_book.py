@@ -1,8 +1,11 @@
 from dataclasses import dataclass
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional
 import heapq
 from functools import total_ordering
 
+from kalshi_bot.core.data.book_view import BookView
+from kalshi_bot.core.data.features import FeatureEngine
+
 @dataclass(frozen=True)
 class PriceLevel:
     # For bids: higher price = "smaller" in min-heap → we store negated price as sort key
@@ -42,6 +45,11 @@ class OrderBook:
         self.last_update_ts: int = 0
         self.seq: int = 0
 
+        # Derived view, rebuilt lazily when _volume_version moves
+        self._view: Optional[BookView] = None
+        # Microstructure features, updated incrementally from the same messages
+        self.features = FeatureEngine()
+
     def bid_volume(self) -> int:
         return self._total_bid_volume
 
@@ -86,6 +94,9 @@ class OrderBook:
         self.asks.clear()
         self.bid_sizes.clear()
         self.ask_sizes.clear()
+        self._total_bid_volume = 0
+        self._total_ask_volume = 0
+        self._volume_version += 1
         self.seq = seq
         ts = snapshot.get("ts", 0)
 
@@ -101,6 +112,7 @@ class OrderBook:
                 yes_price = 1.0 - (price_cents / 100.0)
                 self._add_ask(yes_price, size, ts)
 
+        self.features.apply_snapshot(snapshot)
         self.last_update_ts = ts
 
     def apply_delta(self, update: dict, seq: int):
@@ -120,6 +132,7 @@ class OrderBook:
             new_size = self.ask_sizes.get(yes_price, 0) + delta
             self._add_ask(yes_price, new_size, ts)
 
+        self.features.apply_delta(update)
         self.last_update_ts = ts
 
     def _clean_heap(self, heap: List[PriceLevel], size_map: Dict[float, int]) -> None:
@@ -151,8 +164,8 @@ class OrderBook:
         self._clean_heap(self.asks, self.ask_sizes)
 
         # Extract up to n valid levels (since heap may have more, but we slice post-clean)
-        valid_bids = [p for p in list(self.bids)[:n*2] if self.bid_sizes.get(p.price, 0) == p.size]  # Buffer for cleans
-        valid_asks = [p for p in list(self.asks)[:n*2] if self.ask_sizes.get(p.price, 0) == p.size]
+        valid_bids = [p for p in self.bids[:n*2] if self.bid_sizes.get(p.price, 0) == p.size]  # Buffer for cleans
+        valid_asks = [p for p in self.asks[:n*2] if self.ask_sizes.get(p.price, 0) == p.size]
 
         top_bids = sorted(valid_bids, key=lambda x: -x.price)[:n]  # highest first
         top_asks = sorted(valid_asks, key=lambda x: x.price)[:n]   # lowest first
@@ -162,6 +175,13 @@ class OrderBook:
             "asks": [(p.price, p.size) for p in top_asks],
         }
 
+    def view(self, n: int = 5) -> BookView:
+        """Cached top-of-book/mid/spread/top-N — computed at most once per book change."""
+        v = self._view
+        if v is None or v.version != self._volume_version or v.depth != n:
+            v = self._view = BookView.from_book(self, n)
+        return v
+
     def __repr__(self):
         bid = self.best_bid()
         ask = self.best_ask()
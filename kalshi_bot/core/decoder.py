@@ -0,0 +1,118 @@
+# kalshi_bot/core/decoder.py
+import json
+from typing import Any, ClassVar, NamedTuple, Optional, Union
+
+# Optional fast decoders — stdlib json is always available
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+class Frame(NamedTuple):
+    """One decoded WebSocket frame: envelope fields pulled out once, `msg` left as-is."""
+    type: Optional[str]
+    id: Optional[int]
+    sid: Optional[int]
+    seq: Optional[int]
+    msg: Any            # dict, or a typed struct with dict-style access
+
+
+class JsonDecoder:
+    """Stdlib fallback."""
+    name = "json"
+
+    def decode(self, raw: Union[str, bytes]) -> Frame:
+        d = json.loads(raw)
+        return Frame(d.get("type"), d.get("id"), d.get("sid"), d.get("seq"), d.get("msg", {}))
+
+
+class OrjsonDecoder:
+    """Same generic dicts as JsonDecoder, parsed by orjson."""
+    name = "orjson"
+
+    def decode(self, raw: Union[str, bytes]) -> Frame:
+        d = orjson.loads(raw)
+        return Frame(d.get("type"), d.get("id"), d.get("sid"), d.get("seq"), d.get("msg", {}))
+
+
+if msgspec is not None:
+
+    class _DictLike(msgspec.Struct):
+        """Lets typed payloads flow through code written against dicts (book.apply_delta etc.)."""
+
+        def __getitem__(self, key: str):
+            return getattr(self, key)
+
+        def get(self, key: str, default=None):
+            value = getattr(self, key, None)
+            return default if value is None else value
+
+    class OrderbookSnapshot(_DictLike):
+        market_ticker: str
+        yes: list[list[int]] = []
+        no: list[list[int]] = []
+
+    class OrderbookDelta(_DictLike):
+        market_ticker: str
+        price: int
+        delta: int
+        side: str
+        ts: Optional[str] = None
+
+    # Whole frames as one tagged union → a single decode pass for the hot message types
+    class _DeltaFrame(msgspec.Struct, tag_field="type", tag="orderbook_delta"):
+        kind: ClassVar[str] = "orderbook_delta"
+        sid: int
+        seq: int
+        msg: OrderbookDelta
+
+    class _SnapshotFrame(msgspec.Struct, tag_field="type", tag="orderbook_snapshot"):
+        kind: ClassVar[str] = "orderbook_snapshot"
+        sid: int
+        seq: int
+        msg: OrderbookSnapshot
+
+    class MsgspecDecoder:
+        """Typed structs for orderbook_snapshot / orderbook_delta, generic dicts for the rest."""
+        name = "msgspec"
+
+        def __init__(self):
+            self._typed = msgspec.json.Decoder(Union[_DeltaFrame, _SnapshotFrame])
+            self._generic = msgspec.json.Decoder()
+
+        def decode(self, raw: Union[str, bytes]) -> Frame:
+            try:
+                f = self._typed.decode(raw)
+            except msgspec.ValidationError:
+                # Control frames (subscribed, ok, error, ...) are rare — decode generically
+                d = self._generic.decode(raw)
+                return Frame(d.get("type"), d.get("id"), d.get("sid"), d.get("seq"), d.get("msg", {}))
+            return Frame(f.kind, None, f.sid, f.seq, f.msg)
+
+else:
+    MsgspecDecoder = None
+
+
+DECODERS = {
+    "json": JsonDecoder,
+    "orjson": OrjsonDecoder if orjson is not None else None,
+    "msgspec": MsgspecDecoder,
+}
+
+
+def get_decoder(name: str = "auto"):
+    """Return a decoder by name; "auto" picks the fastest one installed."""
+    if name == "auto":
+        for candidate in ("msgspec", "orjson", "json"):
+            if DECODERS[candidate] is not None:
+                return DECODERS[candidate]()
+    cls = DECODERS.get(name)
+    if cls is None:
+        raise ValueError(f"Decoder {name!r} is not available (install it or use 'json')")
+    return cls()
@@ -1,193 +1,799 @@
 # kalshi_bot/core/delta_recorder.py
 import asyncio
-import json
 import os
-from datetime import datetime
-from typing import Dict, Any
+import threading
+import time
+from array import array
+from collections import deque
+from functools import lru_cache
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 import pyarrow as pa
-import pyarrow.parquet as pq
-
-from kalshi_bot.core.data.order_book import OrderBook
-
-
-# Fixed schema — all fields defined once, works forever
-SCHEMA = pa.schema([
-    ("ts", pa.timestamp('ms')),
-    ("date", pa.date32()),
-    ("ticker", pa.string()),
-    ("seq", pa.int64()),
-    ("msg_type", pa.string()),
-    ("price_cents", pa.int32()),
-    ("price", pa.float64()),
-    ("delta", pa.int64()),
-    ("side", pa.string()),
-    ("best_bid", pa.float64()),
-    ("best_ask", pa.float64()),
-    ("mid", pa.float64()),
-    ("spread", pa.float64()),
-    ("total_bid_vol", pa.int64()),
-    ("total_ask_vol", pa.int64()),
-    ("top_bids_and_asks", pa.string()),  # JSON string
-])
-
-
-class DeltaRecorder:
-    def __init__(self, ticker: str, max_buffer: int = 25_000):
-        self.ticker = ticker
-        self.max_buffer = 10
-        self.buffer: list[Dict[str, Any]] = []
-        self.queue: asyncio.Queue[Dict[str, Any]] = asyncio.Queue(maxsize=100_000)
-
-        self.base_path = f"kalshi_deltas/{ticker}"
-        os.makedirs(self.base_path, exist_ok=True)
-
-        # Start the background flusher immediately
-        self._flush_task = None
 
+from kalshi_bot.core.data.book_view import BookView
+from kalshi_bot.core.parquet_writer import RollingParquetWriter
+from kalshi_bot.core.wal import WriteAheadLog
+from kalshi_bot.monitor.latency import LatencyTracer, Trace
+from kalshi_bot.util.clock import SYSTEM_CLOCK, Clock
+from kalshi_bot.util.logger import get_logger
+
+logger = get_logger('recorder')
+
+LADDER_DEPTH = 5
+
+# One price level of the recorded ladder; a book thinner than the depth pads with null levels
+LEVEL = pa.struct([("price", pa.float64()), ("size", pa.int64())])
+
+MSG_TYPES = ("delta", "orderbook_snapshot")
+SIDES = ("yes", "no")
+DELTA, SNAPSHOT = 0, 1
+_SIDE_CODES = {side: i for i, side in enumerate(SIDES)}
+_CATEGORY = pa.dictionary(pa.int8(), pa.string())
+
+
+def schema_for(depth: int = LADDER_DEPTH) -> pa.Schema:
+    """Fixed schema — all fields defined once; only the ladder width varies."""
+    ladder = pa.list_(LEVEL, depth)
+    return pa.schema([
+        ("ts", pa.timestamp('ms')),
+        ("date", pa.date32()),
+        ("ticker", pa.string()),
+        ("seq", pa.int64()),
+        ("msg_type", _CATEGORY),
+        ("price_cents", pa.int32()),
+        ("price", pa.float64()),
+        ("delta", pa.int64()),
+        ("side", _CATEGORY),
+        ("best_bid", pa.float64()),
+        ("best_ask", pa.float64()),
+        ("mid", pa.float64()),
+        ("spread", pa.float64()),
+        ("total_bid_vol", pa.int64()),
+        ("total_ask_vol", pa.int64()),
+        ("top_bids", ladder),               # best first: top_bids[1].price in DuckDB
+        ("top_asks", ladder),
+        ("microprice", pa.float64()),
+        ("imbalance_l1", pa.float64()),
+        ("imbalance_l5", pa.float64()),
+        ("bid_levels", pa.int32()),
+        ("ask_levels", pa.int32()),
+        ("exch_to_recv_us", pa.int64()),     # exchange ts → socket read (wall clock)
+        ("recv_to_apply_us", pa.int64()),    # socket read → book applied (monotonic)
+    ])
+
+
+# Hive layout: date and ticker live in the path (date=…/ticker=…/), not in the files
+PARTITION_KEYS = ("date", "ticker")
+
+# Low-cardinality columns written dictionary-encoded (the ticker is the directory)
+DICTIONARY_COLUMNS = ("msg_type", "side")
+
+
+def file_schema(schema: pa.Schema) -> pa.Schema:
+    return pa.schema([f for f in schema if f.name not in PARTITION_KEYS])
+
+
+@lru_cache(maxsize=None)
+def batch_schema(depth: int = LADDER_DEPTH) -> pa.Schema:
+    """What a ColumnBatch exports: file columns plus the ticker and the trace clocks."""
+    return pa.schema([("ticker", pa.dictionary(pa.int32(), pa.string()))]
+                     + list(file_schema(schema_for(depth)))
+                     + [("recv_ns", pa.int64()), ("apply_ns", pa.int64())])
+
+
+SCHEMA = schema_for(LADDER_DEPTH)
+FILE_SCHEMA = file_schema(SCHEMA)
+
+# Backpressure policies when the ingest queue is full
+BLOCK = "block"                 # the hot path waits for the writer — nothing is lost
+DROP_OLDEST = "drop_oldest"     # evict the oldest queued batch — the hot path never waits
+SPILL = "spill"                 # append to a local spill file, written to parquet once the writer catches up
+POLICIES = (BLOCK, DROP_OLDEST, SPILL)
+
+# Seconds a recorder part stays open: bounds reader staleness and, without a WAL, crash loss.
+# Hourly keeps a ticker's day to ~24 files; pass a smaller part_age for fresher reads.
+PART_AGE = 3600.0
+# Row groups close on rows or bytes; this only backstops quiet tickers, so their groups aren't tiny
+ROW_GROUP_INTERVAL = 900.0
+
+_RETIRE = object()              # queue marker: finalize a ticker's open part file
+
+# WAL: finalize open part files once they pin more than this share of the ring
+WAL_ROTATE_AT = 0.5
+
+_EPOCH = date(1970, 1, 1)
+_DAY_MS = 86_400_000
+_NAN = float("nan")
+_NULL32 = -(1 << 31)            # null sentinels in integer buffers
+_NULL64 = -(1 << 63)
+_NULL8 = -1
+
+
+# ————————————————————————
+# Column buffers — appended on the hot path, super fast
+# ————————————————————————
+def _ints(buf: array, type_: pa.DataType, null: Optional[int] = None) -> pa.Array:
+    values = np.frombuffer(buf, dtype=buf.typecode)
+    if null is None:
+        return pa.array(values, type=type_)
+    return pa.array(values, type=type_, mask=values == null)
+
+
+def _floats(buf: array) -> pa.Array:
+    """NaN → null."""
+    return pa.array(np.frombuffer(buf, dtype="d"), from_pandas=True)
+
+
+def _category(buf: array, names: pa.Array) -> pa.Array:
+    codes = np.frombuffer(buf, dtype="b")
+    return pa.DictionaryArray.from_arrays(pa.array(codes, mask=codes == _NULL8), names)
+
+
+_MSG_TYPE_NAMES = pa.array(MSG_TYPES, pa.string())
+_SIDE_NAMES = pa.array(SIDES, pa.string())
+
+# Per-row column buffers in raw (WAL) order, then the four `depth`-wide ladder buffers
+_SCALAR_COLUMNS = ("ts", "seq", "msg_type", "price_cents", "delta", "side", "best_bid", "best_ask", "mid",
+                   "spread", "total_bid_vol", "total_ask_vol", "microprice", "imbalance_l1", "imbalance_l5",
+                   "bid_levels", "ask_levels", "exch_to_recv_us", "recv_to_apply_us")
+_LADDER_COLUMNS = ("bid_px", "bid_sz", "ask_px", "ask_sz")
+
+
+class ColumnBatch:
+    """
+    Up to one batch of recorder rows held as typed column buffers (stdlib `array`).
+    The hot path appends scalars in place — no dict, no JSON — and `to_arrow()` wraps
+    the buffers as Arrow arrays without copying them. Nulls are sentinels in the buffers
+    (NaN, `_NULL*`) turned into validity bitmaps at export.
+
+    Exported buffers are borrowed by Arrow, so a batch is append-only until it is
+    sealed and is never appended to again afterwards.
+    """
+
+    __slots__ = ("depth", "n", "tickers", "_ticker_ids", "ticker", "ts", "seq", "msg_type", "price_cents",
+                 "delta", "side", "best_bid", "best_ask", "mid", "spread", "total_bid_vol", "total_ask_vol",
+                 "bid_px", "bid_sz", "ask_px", "ask_sz", "microprice", "imbalance_l1", "imbalance_l5",
+                 "bid_levels", "ask_levels", "exch_to_recv_us", "recv_to_apply_us", "recv_ns", "apply_ns",
+                 "_pad_px", "_pad_sz", "_scalars", "_ladders", "wal_first")
+
+    def __init__(self, depth: int = LADDER_DEPTH):
+        self.depth = depth
+        self.n = 0
+        self.tickers: List[str] = []
+        self._ticker_ids: Dict[str, int] = {}
+        self.ticker = array("i")
+        self.ts = array("q")
+        self.seq = array("q")
+        self.msg_type = array("b")
+        self.price_cents = array("i")
+        self.delta = array("q")
+        self.side = array("b")
+        self.best_bid = array("d")
+        self.best_ask = array("d")
+        self.mid = array("d")
+        self.spread = array("d")
+        self.total_bid_vol = array("q")
+        self.total_ask_vol = array("q")
+        # Ladders: `depth` slots per row, flattened
+        self.bid_px = array("d")
+        self.bid_sz = array("q")
+        self.ask_px = array("d")
+        self.ask_sz = array("q")
+        self.microprice = array("d")
+        self.imbalance_l1 = array("d")
+        self.imbalance_l5 = array("d")
+        self.bid_levels = array("i")
+        self.ask_levels = array("i")
+        self.exch_to_recv_us = array("q")
+        self.recv_to_apply_us = array("q")
+        self.recv_ns = array("q")       # 0 = untraced
+        self.apply_ns = array("q")
+        # Padding for books thinner than `depth`, indexed by how many levels are present
+        self._pad_px = [array("d", [_NAN] * (depth - k)) for k in range(depth + 1)]
+        self._pad_sz = [array("q", [0] * (depth - k)) for k in range(depth + 1)]
+        self._scalars = tuple(getattr(self, c) for c in _SCALAR_COLUMNS)
+        self._ladders = tuple(getattr(self, c) for c in _LADDER_COLUMNS)
+        self.wal_first = -1             # WAL sequence of row 0, when logged
+
+    def __len__(self):
+        return self.n
+
+    def raw_format(self) -> str:
+        """struct format of `raw_row()` — sentinels and all, so a row round-trips exactly."""
+        d = self.depth
+        return "<" + "".join(col.typecode for col in self._scalars) + f"{d}d{d}q{d}d{d}q"
+
+    def raw_row(self, i: int) -> list:
+        lo, hi = i * self.depth, (i + 1) * self.depth
+        row = [col[i] for col in self._scalars]
+        for col in self._ladders:
+            row += col[lo:hi]
+        return row
+
+    def append_raw(self, ticker: str, values):
+        """Append a `raw_row()` — WAL replay. Trace clocks are not kept."""
+        tid = self._ticker_ids.get(ticker)
+        if tid is None:
+            tid = self._ticker_ids[ticker] = len(self.tickers)
+            self.tickers.append(ticker)
+        self.ticker.append(tid)
+        k, d = len(self._scalars), self.depth
+        for col, value in zip(self._scalars, values):
+            col.append(value)
+        for j, col in enumerate(self._ladders):
+            col.extend(values[k + j * d:k + (j + 1) * d])
+        self.recv_ns.append(0)
+        self.apply_ns.append(0)
+        self.n += 1
+
+    def append(self, ticker: str, ts: int, seq: int, msg_type: int, price_cents: Optional[int],
+               delta: Optional[int], side: int, view: BookView, trace: Optional[Trace]):
+        tid = self._ticker_ids.get(ticker)
+        if tid is None:
+            tid = self._ticker_ids[ticker] = len(self.tickers)
+            self.tickers.append(ticker)
+        self.ticker.append(tid)
+        self.ts.append(ts)
+        self.seq.append(seq)
+        self.msg_type.append(msg_type)
+        self.price_cents.append(_NULL32 if price_cents is None else price_cents)
+        self.delta.append(_NULL64 if delta is None else delta)
+        self.side.append(side)
+
+        bbid, bask, spread = view.best_bid, view.best_ask, view.spread
+        self.best_bid.append(bbid if bbid > 0 else _NAN)
+        self.best_ask.append(bask if bask < 1 else _NAN)
+        self.mid.append(view.mid)
+        self.spread.append(_NAN if spread is None else spread)
+        self.total_bid_vol.append(view.bid_volume)
+        self.total_ask_vol.append(view.ask_volume)
+
+        top = view.top_n
+        self._ladder(self.bid_px, self.bid_sz, top["bids"])
+        self._ladder(self.ask_px, self.ask_sz, top["asks"])
+
+        features = view.features
+        imb1, imb5 = features.imbalance_l1, features.imbalance_l5
+        self.microprice.append(features.microprice)
+        self.imbalance_l1.append(_NAN if imb1 is None else imb1)
+        self.imbalance_l5.append(_NAN if imb5 is None else imb5)
+        self.bid_levels.append(features.bid_levels)
+        self.ask_levels.append(features.ask_levels)
+
+        if trace is None:
+            self.exch_to_recv_us.append(_NULL64)
+            self.recv_to_apply_us.append(_NULL64)
+            self.recv_ns.append(0)
+            self.apply_ns.append(0)
+        else:
+            exch = trace.exchange_to_receive_us
+            self.exch_to_recv_us.append(_NULL64 if exch is None else exch)
+            self.recv_to_apply_us.append(trace.receive_to_apply_us)
+            self.recv_ns.append(trace.recv_ns)
+            self.apply_ns.append(trace.apply_ns)
+        self.n += 1
+
+    def _ladder(self, px: array, sz: array, levels):
+        depth = self.depth
+        if len(levels) > depth:
+            levels = levels[:depth]
+        for price, size in levels:
+            px.append(price)
+            sz.append(size)
+        k = len(levels)
+        if k < depth:
+            px.extend(self._pad_px[k])
+            sz.extend(self._pad_sz[k])
+
+    def _ladder_array(self, px: array, sz: array) -> pa.Array:
+        prices = np.frombuffer(px, dtype="d")
+        levels = pa.StructArray.from_arrays(
+            [pa.array(prices), pa.array(np.frombuffer(sz, dtype="q"))],
+            fields=list(LEVEL), mask=pa.array(np.isnan(prices)))
+        return pa.FixedSizeListArray.from_arrays(levels, type=pa.list_(LEVEL, self.depth))
+
+    def to_arrow(self) -> pa.RecordBatch:
+        """The batch as Arrow (`batch_schema(depth)`), sharing this batch's buffers."""
+        cents = np.frombuffer(self.price_cents, dtype="i")
+        columns = [
+            pa.DictionaryArray.from_arrays(_ints(self.ticker, pa.int32()), pa.array(self.tickers, pa.string())),
+            _ints(self.ts, pa.int64()).view(pa.timestamp('ms')),
+            _ints(self.seq, pa.int64()),
+            _category(self.msg_type, _MSG_TYPE_NAMES),
+            pa.array(cents, type=pa.int32(), mask=cents == _NULL32),
+            pa.array(np.where(cents == _NULL32, np.nan, cents / 100.0), from_pandas=True),
+            _ints(self.delta, pa.int64(), _NULL64),
+            _category(self.side, _SIDE_NAMES),
+            _floats(self.best_bid),
+            _floats(self.best_ask),
+            _floats(self.mid),
+            _floats(self.spread),
+            _ints(self.total_bid_vol, pa.int64()),
+            _ints(self.total_ask_vol, pa.int64()),
+            self._ladder_array(self.bid_px, self.bid_sz),
+            self._ladder_array(self.ask_px, self.ask_sz),
+            _floats(self.microprice),
+            _floats(self.imbalance_l1),
+            _floats(self.imbalance_l5),
+            _ints(self.bid_levels, pa.int32()),
+            _ints(self.ask_levels, pa.int32()),
+            _ints(self.exch_to_recv_us, pa.int64(), _NULL64),
+            _ints(self.recv_to_apply_us, pa.int64(), _NULL64),
+            _ints(self.recv_ns, pa.int64()),
+            _ints(self.apply_ns, pa.int64()),
+        ]
+        return pa.RecordBatch.from_arrays(columns, schema=batch_schema(self.depth))
+
+
+class RecorderService:
+    """
+    One recorder for every ticker: a bounded ingest queue on the event loop side, one
+    writer thread, Hive-partitioned parquet out (`base_path/date=…/ticker=…/`).
+
+    The loop appends rows straight into the front ColumnBatch; every `batch_rows` rows
+    it is sealed onto the ready queue and a fresh one takes its place, so the writer
+    thread converts and writes sealed batches while the loop keeps filling. When
+    `max_queue` rows are waiting, `policy` decides what gives: BLOCK waits, DROP_OLDEST
+    evicts the oldest sealed batch, SPILL diverts to a local Arrow stream file — each counted.
+
+    Part files hold ts-sorted row groups of `row_group_rows` / `row_group_bytes` (a quiet
+    ticker's is cut after `row_group_interval` seconds) with min/max statistics, and
+    DICTIONARY_COLUMNS dictionary-encoded. Each part is finalized `part_age` seconds after
+    its first row (hourly by default): an open part has no footer, so that is how stale
+    readers (DuckDB signals, replay) can be and — without a WAL — how much a crash can
+    lose. With a WAL, parts are also finalized early once they pin too much of it.
+
+    With `wal_path`, every queued row is also logged to a memory-mapped WriteAheadLog
+    and released once it is in a finalized part file; `start()` replays whatever a
+    previous run left there before accepting new rows. A batch that fails to write is
+    counted in `dropped` and pins its rows in the WAL, so the next start replays them.
+    """
+
+    def __init__(self, base_path: str = "kalshi_deltas", max_queue: int = 200_000, batch_rows: int = 25_000,
+                 flush_interval: float = 5.0, policy: str = BLOCK, spill_dir: Optional[str] = None,
+                 tracer: Optional[LatencyTracer] = None, depth: int = LADDER_DEPTH,
+                 wal_path: Optional[str] = None, wal_capacity: int = 524_288, clock: Clock = SYSTEM_CLOCK,
+                 row_group_rows: int = 50_000, row_group_bytes: int = 32 << 20,
+                 row_group_interval: float = ROW_GROUP_INTERVAL,
+                 part_age: float = PART_AGE, **writer_kwargs):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown backpressure policy {policy!r} (expected one of {POLICIES})")
+        self.base_path = base_path
+        self.max_queue = max_queue
+        self.batch_rows = batch_rows
+        self.flush_interval = flush_interval
+        self.policy = policy
+        self.spill_dir = spill_dir or os.path.join(base_path, "_spill")
+        self.tracer = tracer
+        self.depth = depth
+        self.clock = clock
+        self.file_schema = file_schema(schema_for(depth))
+        self._file_columns = self.file_schema.names
+        # ts-sorted row groups with min/max statistics, so time-range filters skip row groups
+        self.writer_kwargs = {
+            "row_group_rows": row_group_rows,
+            "row_group_bytes": row_group_bytes,
+            "max_file_age": part_age,
+            "sort_by": "ts",
+            "use_dictionary": list(DICTIONARY_COLUMNS),
+            "write_statistics": True,
+            **writer_kwargs,
+        }
+        self.row_group_interval = row_group_interval
+
+        # Front batch and sealed batches, shared with the writer thread
+        self._front = ColumnBatch(depth)
+        self._ready: deque = deque()
+        self._queued = 0
+        self._cond = threading.Condition()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._space: Optional[asyncio.Event] = None
+
+        # Spill (SPILL policy): rows batched on the loop, written as Arrow IPC streams, drained by the writer
+        self._spill_lock = threading.Lock()
+        self._spill_batch = ColumnBatch(depth)
+        self._spill_file = None
+        self._spill_writer: Optional[pa.ipc.RecordBatchStreamWriter] = None
+        self._spill_path: Optional[str] = None
+        # Closed spill files awaiting the writer — including any left by a previous run
+        self._spill_closed: List[str] = sorted(
+            os.path.join(self.spill_dir, n) for n in os.listdir(self.spill_dir)
+            if n.endswith(".arrows") or n.endswith(".arrows.tmp")    # .tmp: a crash mid-spill
+        ) if os.path.isdir(self.spill_dir) else []
+
+        # Writer-thread state
+        self.writers: Dict[Tuple[date, str], RollingParquetWriter] = {}
+        # Optional WAL, and the oldest WAL sequence each open part file still depends on
+        self.wal = WriteAheadLog(wal_path, depth, self._front.raw_format(), wal_capacity) if wal_path else None
+        self._wal_low: Dict[Tuple[date, str], int] = {}
+        # Oldest WAL sequence of a batch that failed to write: kept for the next start's replay
+        self._wal_pin: Optional[int] = None
+
+        # Counters
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.spilled = 0
+        self.unspilled = 0
+        self.blocked = 0
+        self.blocked_seconds = 0.0
+        self.batches = 0
+        self.write_errors = 0
+        self.wal_replayed = 0
+        self.wal_rotations = 0
+
+    # ————————————————————————
+    # Lifecycle
+    # ————————————————————————
     async def start(self):
-        """Call this once the event loop is running."""
-        if self._flush_task is None:
-            self._flush_task = asyncio.create_task(self._flush_worker())
+        """Call once the event loop is running."""
+        if self._thread is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._space = asyncio.Event()
+        if self.wal is not None:
+            # Last run's unfinalized rows reach parquet before any new row is queued
+            await asyncio.to_thread(self._replay_wal)
+        self._thread = threading.Thread(target=self._run, name="recorder-writer", daemon=True)
+        self._thread.start()
 
-    async def _flush_worker(self):
-        """Background task — does ALL disk I/O. Runs forever."""
-        while True:
-            # Wait for at least one item (or timeout to force periodic flush)
-            try:
-                item = await asyncio.wait_for(self.queue.get(), timeout=10.0)
-            except asyncio.TimeoutError:
-                item = None  # will trigger flush if buffer has data
+    async def close(self, timeout: Optional[float] = None):
+        """
+        Write everything queued and spilled, finalize every part file, stop the thread.
+        With `timeout`, give up waiting after that many seconds — rows still queued are
+        in the WAL (if any) for the next start.
+        """
+        if self._thread is None:
+            return
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        try:
+            await asyncio.wait_for(asyncio.to_thread(self._thread.join), timeout)
+        except asyncio.TimeoutError:
+            if self.wal is None:
+                logger.warning(f"Recorder drain exceeded {timeout:.1f}s — unwritten rows will be lost")
+                return
+            self.wal.sync()
+            logger.warning(f"Recorder drain exceeded {timeout:.1f}s — {self.wal.pending():,} unfinalized rows "
+                           f"stay in the WAL for the next start")
+            return
+        self._thread = None
+        if self.wal is not None:
+            self.wal.close()
 
-            if item is not None:
-                self.buffer.append(item)
+    def retire(self, ticker: str):
+        """Market is gone: finalize its open part file once its queued records are written."""
+        with self._cond:
+            self._seal()
+            self._ready.append((_RETIRE, ticker))
+            self._cond.notify()
 
-            # Drain as much as possible without blocking
-            while len(self.buffer) < self.max_buffer:
-                try:
-                    item2 = self.queue.get_nowait()
-                    self.buffer.append(item2)
-                except asyncio.QueueEmpty:
-                    break
+    # ————————————————————————
+    # Hot path
+    # ————————————————————————
+    async def log_delta(self, ticker: str, delta_msg: dict, seq: int, view: BookView,
+                        trace: Optional[Trace] = None):
+        await self._put(ticker, seq, DELTA, delta_msg.get("price"), delta_msg.get("delta"),
+                        _SIDE_CODES.get(delta_msg.get("side"), _NULL8), view, trace)
 
-            # Flush when buffer full OR on timeout and has data
-            if len(self.buffer) >= self.max_buffer or (item is None and self.buffer):
-                if self.buffer:
-                    # Offload heavy I/O to thread pool
-                    await asyncio.to_thread(self._write_parquet_batch, self.buffer.copy())
-                    self.buffer.clear()
-
-            # Mark everything we consumed as done
-            if item is not None:
-                self.queue.task_done()
-            # Mark everything we drained with get_nowait()
-            drained = 0
-            while True:
-                try:
-                    self.queue.get_nowait()
-                    self.queue.task_done()
-                    drained += 1
-                except asyncio.QueueEmpty:
-                    break
+    async def log_snapshot(self, ticker: str, seq: int, view: BookView, trace: Optional[Trace] = None):
+        await self._put(ticker, seq, SNAPSHOT, None, None, _NULL8, view, trace)
 
-    def _write_parquet_batch(self, records: list[dict]):
-        if not records:
+    async def _put(self, ticker: str, seq: int, msg_type: int, price_cents: Optional[int],
+                   delta: Optional[int], side: int, view: BookView, trace: Optional[Trace]):
+        row = (ticker, self.clock.time_ns() // 1_000_000, seq, msg_type, price_cents, delta, side, view, trace)
+        with self._cond:
+            if self._queued < self.max_queue:
+                self._append(row)
+                return
+            self._cond.notify()     # full — make sure the writer is draining
+            if self.policy == DROP_OLDEST:
+                self._drop_oldest()
+                self._append(row)
+                return
+
+        if self.policy == SPILL:
+            self._spill(row)
             return
 
-        # CRITICAL: ALWAYS add date column BEFORE creating table
-        for r in records:
-            r["date"] = datetime.utcfromtimestamp(r["ts"] / 1000.0).date()
+        # BLOCK: wait for the writer to take sealed batches off the queue
+        self.blocked += 1
+        started = time.monotonic()
+        while True:
+            self._space.clear()
+            with self._cond:
+                if self._queued < self.max_queue:
+                    self._append(row)
+                    break
+                self._cond.notify()
+            await self._space.wait()
+        self.blocked_seconds += time.monotonic() - started
 
-        # FORCE the schema — this time — no inference allowed
-        table = pa.Table.from_pylist(records, schema=SCHEMA)
+    def _append(self, row: tuple):
+        """Caller holds `_cond`."""
+        front = self._front
+        front.append(*row)
+        if self.wal is not None:
+            seq = self.wal.append(row[0], front.raw_row(front.n - 1))
+            if front.wal_first < 0:
+                front.wal_first = seq
+        self._queued += 1
+        self.enqueued += 1
+        if front.n >= self.batch_rows:
+            self._seal()
+            self._cond.notify()
+
+    def _seal(self):
+        """Move the front batch onto the ready queue. Caller holds `_cond`."""
+        if self._front.n:
+            self._ready.append(self._front)
+            self._front = ColumnBatch(self.depth)
+
+    def _drop_oldest(self):
+        """Evict the oldest queued batch (the front one if nothing is sealed). Caller holds `_cond`."""
+        for i, item in enumerate(self._ready):
+            if type(item) is ColumnBatch:
+                del self._ready[i]
+                break
+        else:
+            item, self._front = self._front, ColumnBatch(self.depth)
+        self._queued -= item.n
+        self.dropped += item.n
+
+    def _spill(self, row: tuple):
+        with self._spill_lock:
+            batch = self._spill_batch
+            batch.append(*row)
+            if batch.n >= self.batch_rows:
+                self._spill_out()
+        self.spilled += 1
+
+    def _spill_out(self):
+        """Append the pending spill rows to the open spill file. Caller holds `_spill_lock`."""
+        if not self._spill_batch.n:
+            return
+        if self._spill_writer is None:
+            os.makedirs(self.spill_dir, exist_ok=True)
+            self._spill_path = os.path.join(self.spill_dir, f"spill-{time.time_ns()}.arrows")
+            self._spill_file = pa.OSFile(f"{self._spill_path}.tmp", "wb")
+            self._spill_writer = pa.ipc.new_stream(self._spill_file, batch_schema(self.depth))
+        self._spill_writer.write_batch(self._spill_batch.to_arrow())
+        self._spill_batch = ColumnBatch(self.depth)
 
-        today = datetime.utcnow().strftime("%Y-%m-%d")
-        file_path = os.path.join(self.base_path, f"{today}.parquet")
+    # ————————————————————————
+    # Writer thread
+    # ————————————————————————
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._ready and not self._stopping:
+                    self._cond.wait(timeout=self.flush_interval)
+                if not self._ready:
+                    self._seal()        # quiet stream or shutdown: take the partial batch
+                work, self._ready = self._ready, deque()
+                self._queued -= sum(item.n for item in work if type(item) is ColumnBatch)
+                stopping = self._stopping
+            if work and self._loop is not None:
+                self._loop.call_soon_threadsafe(self._space.set)
 
-        if os.path.exists(file_path):
+            # One failure (disk full, …) costs its own item, never the rest of the cycle's work
+            for item in work:
+                try:
+                    if type(item) is tuple:
+                        self._retire(item[1])
+                    else:
+                        self._write_batch(item.to_arrow(), wal_first=item.wal_first)
+                except Exception as e:
+                    self.write_errors += 1
+                    if type(item) is ColumnBatch:
+                        self.dropped += item.n
+                        if item.wal_first >= 0:
+                            self._wal_pin = item.wal_first if self._wal_pin is None \
+                                else min(self._wal_pin, item.wal_first)
+                    logger.error(f"Recorder write failed: {e!r}")
             try:
-                existing = pq.read_table(file_path, schema=SCHEMA)  # ← force same schema
-                table = pa.concat_tables([existing, table], promote=True)
+                # Spilled rows go in once the live queue is quiet (or we are shutting down)
+                if (self._spill_batch.n or self._spill_writer is not None or self._spill_closed) \
+                        and (stopping or self._queued < self.batch_rows // 2):
+                    self._drain_spill()
+                for key, writer in self.writers.items():
+                    writer.flush_if_due()
+                    if writer.idle:
+                        self._wal_low.pop(key, None)
+                if self.wal is not None:
+                    self._wal_checkpoint()
             except Exception as e:
-                print(f"[WARN] Corrupted Parquet {file_path}: {e}. Overwriting with fresh file.")
-        
-        # Write with EXACT schema
-        print(f"Writing {len(records)} record(s) for {self.ticker} at {datetime.utcnow()}")
-        print(file_path)
-        pq.write_table(
-            table,
-            file_path,
-            compression="zstd",           # keep zstd — it's still the best
-            compression_level=3,          # 1–3 is plenty fast and avoids the hang
-            use_dictionary=False,         # ← THIS IS THE KEY — disables the buggy path
-            write_statistics=False,   # ← KEY: Avoids metadata threading deadlock
-            flavor="default",         # ← KEY: Skip "spark" (it's the culprit)
-        )
+                self.write_errors += 1
+                logger.error(f"Recorder write failed: {e!r}")
+
+            if stopping:
+                with self._cond:
+                    if self._ready or self._front.n:
+                        continue        # records that raced in with close()
+                for key in list(self.writers):
+                    self._close_writer(key)
+                if self.wal is not None:
+                    self._wal_checkpoint()
+                return
+
+    def _writer_for(self, day: date, ticker: str) -> RollingParquetWriter:
+        writer = self.writers.get((day, ticker))
+        if writer is None:
+            # Yesterday's parts for this ticker are complete
+            for key in [k for k in self.writers if k[1] == ticker and k[0] != day]:
+                self._close_writer(key)
+            path = os.path.join(self.base_path, f"date={day.isoformat()}", f"ticker={ticker}")
+            writer = self.writers[(day, ticker)] = RollingParquetWriter(
+                path, self.file_schema, flush_interval=self.row_group_interval, **self.writer_kwargs)
+        return writer
+
+    def _close_writer(self, key: Tuple[date, str]):
+        self.writers.pop(key).close()
+        self._wal_low.pop(key, None)
+
+    def _retire(self, ticker: str):
+        for key in [k for k in self.writers if k[1] == ticker]:
+            self._close_writer(key)
+
+    def _write_batch(self, batch: pa.RecordBatch, traced: bool = True, wal_first: int = -1):
+        """One exported ColumnBatch → a table per (date, ticker) partition."""
+        tickers = batch.column(0)
+        ticker_ids = tickers.indices.to_numpy()
+        days = batch.column(1).view(pa.int64()).to_numpy() // _DAY_MS
+        # One key per (day, ticker); a batch is usually a single day
+        keys = days * len(tickers.dictionary) + ticker_ids
+        order = np.argsort(keys, kind="stable")
+        keys = keys[order]
+        bounds = np.flatnonzero(np.diff(keys)) + 1
+        rows = pa.Table.from_batches([batch.select(self._file_columns)])
+        recv_ns, apply_ns = batch.column("recv_ns").to_numpy(), batch.column("apply_ns").to_numpy()
+
+        for idx in np.split(order, bounds):
+            first = idx[0]
+            day = _EPOCH + timedelta(days=int(days[first]))
+            ticker = tickers.dictionary[ticker_ids[first]].as_py()
+            part = rows if len(idx) == len(rows) else rows.take(pa.array(idx))
+            writer = self._writer_for(day, ticker)
+            closed = writer.files_closed
+            writer.write(part, day)
+            if writer.idle:
+                self._wal_low.pop((day, ticker), None)
+            elif wal_first >= 0 and (writer.files_closed != closed or (day, ticker) not in self._wal_low):
+                # A roll during this write took every earlier row with it
+                self._wal_low[(day, ticker)] = wal_first + int(first)
+            self.written += len(idx)
+            if traced and self.tracer is not None:
+                traced_rows = idx[apply_ns[idx] != 0]
+                self.tracer.on_persisted(ticker, apply_ns[traced_rows], recv_ns[traced_rows])
+        self.batches += 1
+
     # ————————————————————————
-    # These are called from the hot path — super fast
+    # WAL
     # ————————————————————————
-    async def log_delta(self, delta_msg: dict, seq: int, bbid: float, bask: float, mid: float, bid_vol: float, ask_vol: float, top_n):
-
-        record: Dict[str, Any] = {
-            "ts": int(datetime.utcnow().timestamp() * 1000),
-            "ticker": self.ticker,
-            "seq": seq,
-            "msg_type": "delta",
-            "price_cents": delta_msg.get("price"),
-            "price": (delta_msg.get("price", 0) / 100.0) if delta_msg.get("price") is not None else None,
-            "delta": delta_msg.get("delta"),
-            "side": delta_msg.get("side"),
-            "best_bid": bbid if bbid > 0 else None,
-            "best_ask": bask if bask < 1 else None,
-            "mid": mid,
-            "spread": (bask - bbid) if bbid > 0 and bask < 1 else None,
-            "total_bid_vol": bid_vol,
-            "total_ask_vol": ask_vol,
-            "top_bids_and_asks": json.dumps(top_n),
-        }
+    def _replay_wal(self):
+        """Rows a previous run logged but never got into a finalized part file → parquet."""
+        # Part files that were open at the crash have no footer — their rows are in the WAL.
+        # Only this WAL's tickers: shards share base_path, and another shard's open parts are live.
+        tickers = {ticker for ticker, _ in self.wal.records()}
+        orphans = 0
+        for day_dir in os.listdir(self.base_path) if tickers else ():
+            for ticker in tickers:
+                directory = os.path.join(self.base_path, day_dir, f"ticker={ticker}")
+                if not day_dir.startswith("date=") or not os.path.isdir(directory):
+                    continue
+                for name in os.listdir(directory):
+                    if name.endswith(".parquet.tmp"):
+                        os.remove(os.path.join(directory, name))
+                        orphans += 1
+        pending = self.wal.pending()
+        if not pending and not orphans:
+            return
+        logger.info(f"WAL replay: {pending:,} rows, {orphans} unfinalized part files discarded")
+        batch = ColumnBatch(self.depth)
+        for ticker, values in self.wal.records():
+            batch.append_raw(ticker, values)
+            if batch.n >= self.batch_rows:
+                self._write_batch(batch.to_arrow(), traced=False)
+                self.wal_replayed += batch.n
+                batch = ColumnBatch(self.depth)
+        if batch.n:
+            self._write_batch(batch.to_arrow(), traced=False)
+            self.wal_replayed += batch.n
+        for key in list(self.writers):
+            self._close_writer(key)
+        self.wal.release(self.wal.head)
+        self.wal.sync()
 
-        try:
-            self.queue.put_nowait(record)
-        except asyncio.QueueFull:
-            # Don't lose data — wait briefly
-            await self.queue.put(record)
-
-    async def log_snapshot(self, seq: int, bbid: float, bask: float, mid: float, bid_vol: float, ask_vol: float, top_n):
-
-        record: Dict[str, Any] = {
-            "ts": int(datetime.utcnow().timestamp() * 1000),
-            "ticker": self.ticker,
-            "seq": seq,
-            "msg_type": "orderbook_snapshot",
-            "price_cents": None,
-            "price": None,
-            "delta": None,
-            "side": None,
-            "best_bid": bbid if bbid > 0 else None,
-            "best_ask": bask if bask < 1 else None,
-            "mid": mid,
-            "spread": (bask - bbid) if bbid > 0 and bask < 1 else None,
-            "total_bid_vol": bid_vol,
-            "total_ask_vol": ask_vol,
-            "top_bids_and_asks": json.dumps(top_n),
+    def _wal_checkpoint(self):
+        """Release every WAL row that is in a finalized part file; roll parts that pin too much of the ring."""
+        if self._wal_low and self.wal.head - min(self._wal_low.values()) > self.wal.capacity * WAL_ROTATE_AT:
+            for key in list(self._wal_low):
+                self._close_writer(key)
+            self.wal_rotations += 1
+        with self._cond:
+            lows = [item.wal_first for item in self._ready if type(item) is ColumnBatch and item.wal_first >= 0]
+            if self._front.wal_first >= 0:
+                lows.append(self._front.wal_first)
+            lows.extend(self._wal_low.values())
+            if self._wal_pin is not None:
+                lows.append(self._wal_pin)
+            self.wal.release(min(lows) if lows else self.wal.head)
+        self.wal.sync()
+
+    def _drain_spill(self):
+        with self._spill_lock:
+            # New spills go to a fresh file; we only touch closed ones
+            self._spill_out()
+            if self._spill_writer is not None:
+                self._spill_writer.close()
+                self._spill_file.close()
+                os.replace(f"{self._spill_path}.tmp", self._spill_path)
+                self._spill_closed.append(self._spill_path)
+                self._spill_writer = self._spill_file = self._spill_path = None
+            paths, self._spill_closed = self._spill_closed, []
+        for path in paths:
+            with pa.OSFile(path, "rb") as f:
+                batches = self._read_spill(f)
+                while True:
+                    try:
+                        batch = next(batches)
+                    except StopIteration:
+                        break
+                    except (pa.ArrowInvalid, OSError) as e:
+                        logger.warning(f"Spill file {path} is truncated, keeping what was readable: {e}")
+                        break
+                    # Trace clocks are from another moment (or process) — not a persist latency
+                    self._write_batch(batch, traced=False)
+                    self.unspilled += batch.num_rows
+            os.remove(path)
+
+    @staticmethod
+    def _read_spill(f):
+        yield from pa.ipc.open_stream(f)
+
+    def stats(self) -> dict:
+        return {
+            "policy": self.policy,
+            "queued": self._queued,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "spilled": self.spilled,
+            "unspilled": self.unspilled,
+            "blocked": self.blocked,
+            "blocked_seconds": self.blocked_seconds,
+            "batches": self.batches,
+            "write_errors": self.write_errors,
+            "open_files": len(self.writers),
+            "wal": self.wal.stats() if self.wal is not None else None,
+            "wal_replayed": self.wal_replayed,
+            "wal_rotations": self.wal_rotations,
         }
 
-        try:
-            self.queue.put_nowait(record)
-        except asyncio.QueueFull:
-            await self.queue.put(record)
-
-    async def flush(self):
-        """Call at shutdown to write everything left."""
-        # Drain queue into buffer
-        while not self.queue.empty():
-            try:
-                item = self.queue.get_nowait()
-                self.buffer.append(item)
-                self.queue.task_done()
-            except asyncio.QueueEmpty:
-                break
 
-        if self.buffer:
-            await asyncio.to_thread(self._write_parquet_batch, self.buffer.copy())
-            self.buffer.clear()
\ No newline at end of file
+class NullRecorder:
+    """Same interface as RecorderService, keeps nothing — for replays that only want the books."""
+
+    async def start(self):
+        pass
+
+    async def close(self, timeout: Optional[float] = None):
+        pass
+
+    def retire(self, ticker: str):
+        pass
+
+    async def log_delta(self, ticker: str, delta_msg: dict, seq: int, view: BookView,
+                        trace: Optional[Trace] = None):
+        pass
+
+    async def log_snapshot(self, ticker: str, seq: int, view: BookView, trace: Optional[Trace] = None):
+        pass
+
+    def stats(self) -> dict:
+        return {"policy": None}
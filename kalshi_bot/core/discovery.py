@@ -0,0 +1,106 @@
+# kalshi_bot/core/discovery.py
+import asyncio
+from typing import Callable, Dict, List, Optional
+
+from kalshi_bot.core.data.market import Market
+from kalshi_bot.util.logger import get_logger
+from kalshi_bot.util.timer_wheel import TimerWheel
+
+logger = get_logger('discovery')
+
+# Keep a market this long past close_time so settlement-time prints are still recorded
+CLOSE_GRACE = 300.0
+
+
+class MarketDiscovery:
+    """
+    Keeps a client's subscriptions equal to the live market set.
+
+    Every `interval` seconds the open markets are re-fetched and diffed against what the
+    client holds: new markets are added, vanished ones removed. Independently, each
+    market's `close_time` is scheduled on a timer wheel, so teardown happens on time
+    even between polls. A market torn down by its timer is not re-added.
+    """
+
+    def __init__(self, client, fetch: Callable[[], List[Market]], interval: float = 60.0,
+                 market_filter: Optional[Callable[[Market], bool]] = None,
+                 wheel: Optional[TimerWheel] = None, close_grace: float = CLOSE_GRACE):
+        self.client = client
+        self.fetch = fetch
+        self.interval = interval
+        self.market_filter = market_filter
+        self.wheel = wheel or TimerWheel()
+        self.close_grace = close_grace
+        self._retired: set[str] = set()
+
+        # Stats
+        self.polls = 0
+        self.poll_errors = 0
+        self.added = 0
+        self.removed = 0
+        self.expired = 0
+
+    async def run(self):
+        wheel_task = asyncio.create_task(self.wheel.run())
+        try:
+            while True:
+                try:
+                    await self.refresh()
+                except Exception as e:
+                    self.poll_errors += 1
+                    logger.error(f"Market discovery failed: {e!r}")
+                await asyncio.sleep(self.interval)
+        finally:
+            wheel_task.cancel()
+
+    async def refresh(self):
+        """One poll: fetch, diff, add/remove, (re)schedule close timers."""
+        if asyncio.iscoroutinefunction(self.fetch):
+            markets = await self.fetch()
+        else:
+            # Plain functions do blocking HTTP — keep them off the loop
+            markets = await asyncio.to_thread(self.fetch)
+        self.polls += 1
+
+        live: Dict[str, Market] = {
+            m.ticker: m for m in markets
+            if m.ticker not in self._retired and (self.market_filter is None or self.market_filter(m))
+        }
+        held = set(self.client.target_tickers)
+        added = [m for t, m in live.items() if t not in held]
+        removed = [t for t in held if t not in live]
+
+        if added:
+            logger.info(f"Discovered {len(added)} new market(s)")
+            await self.client.add_markets(added)
+            self.added += len(added)
+        if removed:
+            logger.info(f"{len(removed)} market(s) no longer open")
+            await self.client.remove_markets(removed)
+            self.removed += len(removed)
+            for t in removed:
+                self.wheel.cancel(t)
+
+        # close_time can move (early close, delays) — rescheduling is O(1)
+        for t, m in live.items():
+            if m.close_time is None:
+                self.wheel.cancel(t)    # nothing to schedule — removed once it drops out of a poll
+                continue
+            self.wheel.schedule(t, m.close_time.timestamp() + self.close_grace,
+                                lambda t=t: self._expire(t))
+
+    async def _expire(self, ticker: str):
+        self._retired.add(ticker)
+        self.expired += 1
+        logger.info(f"{ticker} closed — tearing down")
+        await self.client.remove_markets([ticker])
+
+    def stats(self) -> dict:
+        return {
+            "polls": self.polls,
+            "poll_errors": self.poll_errors,
+            "added": self.added,
+            "removed": self.removed,
+            "expired": self.expired,
+            "scheduled": len(self.wheel),
+        }
@@ -0,0 +1,125 @@
+# kalshi_bot/core/event_bus.py
+import asyncio
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from kalshi_bot.util.logger import get_logger
+
+logger = get_logger('event_bus')
+
+
+class Subscriber:
+    """
+    One strategy's mailbox: at most one pending entry per ticker. A new update for a
+    ticker that is still waiting replaces it (conflation), so a slow consumer only ever
+    sees the latest book and its backlog is bounded by the number of tickers.
+    """
+
+    def __init__(self, name: str, callback: Callable[[Any], Any],
+                 tickers: Optional[Iterable[str]] = None, event_tickers: Optional[Iterable[str]] = None):
+        self.name = name
+        self.callback = callback
+        self.tickers = set(tickers) if tickers else None
+        self.event_tickers = set(event_tickers) if event_tickers else None
+
+        self.mailbox: Dict[str, Tuple[Any, int]] = {}   # ticker → (book, enqueue ns)
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+        # Stats
+        self.published = 0
+        self.delivered = 0
+        self.conflated = 0
+        self.errors = 0
+        self.latency_total_ns = 0
+        self.latency_max_ns = 0
+
+    def wants(self, ticker: str, event_ticker: Optional[str]) -> bool:
+        if self.tickers is None and self.event_tickers is None:
+            return True
+        return (self.tickers is not None and ticker in self.tickers) or \
+               (self.event_tickers is not None and event_ticker in self.event_tickers)
+
+    def offer(self, ticker: str, book, now_ns: int):
+        self.published += 1
+        if ticker in self.mailbox:
+            self.conflated += 1
+            # Keep the original enqueue time — latency is how long the ticker waited
+            self.mailbox[ticker] = (book, self.mailbox[ticker][1])
+        else:
+            self.mailbox[ticker] = (book, now_ns)
+        self._wake.set()
+
+    async def run(self):
+        while True:
+            await self._wake.wait()
+            self._wake.clear()
+            await self.deliver()
+
+    async def deliver(self):
+        """Hand every pending update to the callback, oldest ticker first."""
+        while self.mailbox:
+            ticker = next(iter(self.mailbox))
+            book, enqueued = self.mailbox.pop(ticker)
+            lat = time.monotonic_ns() - enqueued
+            self.latency_total_ns += lat
+            self.latency_max_ns = max(self.latency_max_ns, lat)
+            try:
+                result = self.callback(book)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"[{self.name}] callback failed on {ticker}: {e!r}")
+            self.delivered += 1
+
+    def stats(self) -> dict:
+        return {
+            "published": self.published,
+            "delivered": self.delivered,
+            "conflated": self.conflated,
+            "pending": len(self.mailbox),
+            "errors": self.errors,
+            "dispatch_latency_avg_us": self.latency_total_ns / self.delivered / 1e3 if self.delivered else 0.0,
+            "dispatch_latency_max_us": self.latency_max_ns / 1e3,
+        }
+
+
+class EventBus:
+    """Per-ticker book-update fan-out to strategies, each behind its own conflating mailbox."""
+
+    def __init__(self):
+        self.subscribers: List[Subscriber] = []
+        self._started = False
+
+    def subscribe(self, callback: Callable[[Any], Any], tickers: Optional[Iterable[str]] = None,
+                  event_tickers: Optional[Iterable[str]] = None, name: Optional[str] = None) -> Subscriber:
+        """Deliver updates for `tickers` and/or `event_tickers` (everything if neither is given)."""
+        sub = Subscriber(name or getattr(callback, "__qualname__", "subscriber"), callback, tickers, event_tickers)
+        self.subscribers.append(sub)
+        if self._started:
+            sub._task = asyncio.create_task(sub.run())
+        return sub
+
+    def start(self):
+        """Call once the event loop is running."""
+        self._started = True
+        for sub in self.subscribers:
+            if sub._task is None:
+                sub._task = asyncio.create_task(sub.run())
+
+    def publish(self, ticker: str, event_ticker: Optional[str], book):
+        """Hot path: O(subscribers), never blocks, never awaits."""
+        now = time.monotonic_ns()
+        for sub in self.subscribers:
+            if sub.wants(ticker, event_ticker):
+                sub.offer(ticker, book, now)
+
+    async def drain(self):
+        """Deliver everything pending now, in the caller's task — replay steps strategies in lockstep."""
+        for sub in self.subscribers:
+            if sub.mailbox:
+                await sub.deliver()
+
+    def stats(self) -> Dict[str, dict]:
+        return {sub.name: sub.stats() for sub in self.subscribers}
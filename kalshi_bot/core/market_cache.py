@@ -0,0 +1,273 @@
+# kalshi_bot/core/market_cache.py
+import asyncio
+import json
+import os
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+import aiohttp
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from kalshi_bot.core.data.market import MARKET_ARROW_SCHEMA, Market, markets_to_arrow
+from kalshi_bot.util.logger import get_logger
+from kalshi_bot.util.util import NBA_TICKER, parse_market
+
+logger = get_logger('market_cache')
+
+MARKETS_URL = "https://api.elections.kalshi.com/trade-api/v2/markets"
+PAGE_LIMIT = 1000           # API maximum
+
+CACHE_SCHEMA = pa.schema([
+    ("ticker", pa.string()),
+    ("event_ticker", pa.string()),
+    ("series", pa.string()),
+    ("fetched_at", pa.float64()),   # epoch seconds
+    ("expires_at", pa.float64()),
+    ("raw", pa.string()),           # API JSON, re-parsed on load
+])
+
+
+class CacheEntry(NamedTuple):
+    market: Market
+    series: str
+    fetched_at: float
+    expires_at: float
+    raw: str
+
+
+class MarketCache:
+    """
+    Market catalog for a set of series, kept in memory and on disk.
+
+    `refresh()` pages through every series concurrently (cursor pagination, one pooled
+    aiohttp session) and persists the catalog to parquet. An entry expires at
+    `fetched_at + ttl` or at its market's close_time, whichever comes first, and a
+    series is only re-fetched once its last fetch is older than `ttl` — so a restart
+    inside the TTL is served from disk without touching the API.
+    """
+
+    def __init__(self, series: Iterable[str] = (NBA_TICKER,), path: str = "market_cache/markets.parquet",
+                 ttl: float = 600.0, status: str = "open", concurrency: int = 8):
+        self.series = list(series)
+        self.path = path
+        self.ttl = ttl
+        self.status = status
+        self.concurrency = concurrency
+
+        self.by_ticker: Dict[str, CacheEntry] = {}
+        self.by_event: Dict[str, set[str]] = {}
+        self.by_series: Dict[str, set[str]] = {}
+        self._series_fetched: Dict[str, float] = {}
+        self.tables: Dict[str, pa.Table] = {}       # series → columnar catalog (MARKET_ARROW_SCHEMA)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._refresh_lock: Optional[asyncio.Lock] = None
+
+        # Stats
+        self.api_pages = 0
+        self.refreshes = 0
+
+    def __len__(self) -> int:
+        return len(self.by_ticker)
+
+    # ————————————————————————
+    # Lookups (memory only)
+    # ————————————————————————
+    def get(self, ticker: str) -> Optional[Market]:
+        entry = self.by_ticker.get(ticker)
+        if entry is None or entry.expires_at <= time.time():
+            return None
+        return entry.market
+
+    def by_event_ticker(self, event_ticker: str) -> List[Market]:
+        return self._live(self.by_event.get(event_ticker, ()))
+
+    def by_series_ticker(self, series: str) -> List[Market]:
+        return self._live(self.by_series.get(series, ()))
+
+    def open_markets(self) -> List[Market]:
+        return self._live(self.by_ticker)
+
+    def to_arrow(self, series: Optional[Iterable[str]] = None) -> pa.Table:
+        """Unexpired markets as one Arrow table, for vectorized filtering (close_time, prices, volume…)."""
+        tables = [self.tables[s] for s in (series or self.tables) if s in self.tables]
+        if not tables:
+            return MARKET_ARROW_SCHEMA.empty_table()
+        table = pa.concat_tables(tables)
+        live = pc.is_in(table.column("ticker"), value_set=pa.array([t for t in self.by_ticker]))
+        return table.filter(live)
+
+    def _live(self, tickers) -> List[Market]:
+        now = time.time()
+        entries = (self.by_ticker[t] for t in tickers)
+        return [e.market for e in entries if e.expires_at > now]
+
+    # ————————————————————————
+    # Index maintenance
+    # ————————————————————————
+    def _put(self, entry: CacheEntry):
+        m = entry.market
+        self._drop(m.ticker)
+        self.by_ticker[m.ticker] = entry
+        self.by_event.setdefault(m.event_ticker, set()).add(m.ticker)
+        self.by_series.setdefault(entry.series, set()).add(m.ticker)
+
+    def _drop(self, ticker: str):
+        old = self.by_ticker.pop(ticker, None)
+        if old is None:
+            return
+        for index, key in ((self.by_event, old.market.event_ticker), (self.by_series, old.series)):
+            tickers = index.get(key)
+            if tickers is not None:
+                tickers.discard(ticker)
+                if not tickers:
+                    del index[key]
+
+    def _expires_at(self, market: Market, now: float) -> float:
+        # Some markets have no close_time — they live for the TTL
+        close = market.close_time
+        return now + self.ttl if close is None else min(now + self.ttl, close.timestamp())
+
+    def _extend_series(self, series: str, now: float):
+        for ticker in list(self.by_series.get(series, ())):
+            entry = self.by_ticker[ticker]
+            self.by_ticker[ticker] = entry._replace(expires_at=self._expires_at(entry.market, now))
+
+    def _replace_series(self, series: str, entries: List[CacheEntry], fetched_at: float, raws: List[dict]):
+        for ticker in list(self.by_series.get(series, ())):
+            self._drop(ticker)
+        for entry in entries:
+            self._put(entry)
+        self._series_fetched[series] = fetched_at
+        self.tables[series] = markets_to_arrow(raws)
+
+    # ————————————————————————
+    # Disk
+    # ————————————————————————
+    def load(self) -> int:
+        """Read the on-disk catalog, dropping expired entries. Returns live entries loaded."""
+        if not os.path.exists(self.path):
+            return 0
+        try:
+            rows = pq.read_table(self.path, schema=CACHE_SCHEMA).to_pylist()
+        except Exception as e:
+            logger.warning(f"Unreadable market cache {self.path}: {e!r} — ignoring it")
+            return 0
+
+        now = time.time()
+        raws: Dict[str, List[dict]] = {}
+        for r in rows:
+            if r["expires_at"] <= now:
+                continue
+            raw = json.loads(r["raw"])
+            raws.setdefault(r["series"], []).append(raw)
+            self._put(CacheEntry(parse_market(raw), r["series"], r["fetched_at"], r["expires_at"], r["raw"]))
+            # A series is as fresh as its oldest surviving entry
+            prev = self._series_fetched.get(r["series"])
+            self._series_fetched[r["series"]] = r["fetched_at"] if prev is None else min(prev, r["fetched_at"])
+        for series, rs in raws.items():
+            self.tables[series] = markets_to_arrow(rs)
+        logger.info(f"Loaded {len(self.by_ticker)} market(s) from {self.path}")
+        return len(self.by_ticker)
+
+    def _save(self):
+        entries = list(self.by_ticker.values())
+        table = pa.Table.from_pydict({
+            "ticker": [e.market.ticker for e in entries],
+            "event_ticker": [e.market.event_ticker for e in entries],
+            "series": [e.series for e in entries],
+            "fetched_at": [e.fetched_at for e in entries],
+            "expires_at": [e.expires_at for e in entries],
+            "raw": [e.raw for e in entries],
+        }, schema=CACHE_SCHEMA)
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.tmp"     # shard workers share the file
+        pq.write_table(table, tmp, compression="zstd")
+        os.replace(tmp, self.path)      # readers never see a half-written file
+
+    # ————————————————————————
+    # API
+    # ————————————————————————
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.concurrency)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=30))
+        return self._session
+
+    async def _fetch_series(self, series: str) -> List[dict]:
+        session = self._get_session()
+        raws, cursor = [], None
+        while True:
+            params = {"series_ticker": series, "status": self.status, "limit": PAGE_LIMIT}
+            if cursor:
+                params["cursor"] = cursor
+            async with session.get(MARKETS_URL, params=params) as resp:
+                resp.raise_for_status()
+                page = await resp.json()
+            self.api_pages += 1
+            raws.extend(page.get("markets") or [])
+            cursor = page.get("cursor")
+            if not cursor:
+                return raws
+
+    async def refresh(self, series: Optional[Iterable[str]] = None, only_stale: bool = False):
+        """Re-fetch `series` (default: all) concurrently and persist the catalog."""
+        if self._refresh_lock is None:
+            self._refresh_lock = asyncio.Lock()
+        series = list(series) if series is not None else self.series
+        async with self._refresh_lock:
+            if only_stale:
+                # Another caller may have refreshed while we waited for the lock
+                stale = set(self.stale_series())
+                series = [s for s in series if s in stale]
+                if not series:
+                    return
+            results = await asyncio.gather(*(self._fetch_series(s) for s in series), return_exceptions=True)
+            now = time.time()
+            for s, raws in zip(series, results):
+                if isinstance(raws, Exception):
+                    # The series is stale, so its entries have lapsed — extend them, or discovery
+                    # would see every market gone. The series stays stale and is retried next poll.
+                    logger.error(f"Market fetch failed for {s}: {raws!r} — keeping its previous entries")
+                    self._extend_series(s, now)
+                    continue
+                entries, kept = [], []
+                for raw in raws:
+                    try:
+                        market = parse_market(raw)
+                        expires = self._expires_at(market, now)
+                    except Exception as e:
+                        logger.warning(f"Skipping unparseable market {raw.get('ticker')!r} in {s}: {e!r}")
+                        continue
+                    entries.append(CacheEntry(market, s, now, expires, json.dumps(raw)))
+                    kept.append(raw)
+                self._replace_series(s, entries, now, kept)
+            self.refreshes += 1
+            await asyncio.to_thread(self._save)
+        logger.info(f"Market cache refreshed: {len(self.by_ticker)} market(s) across {len(series)} series")
+
+    def stale_series(self) -> List[str]:
+        now = time.time()
+        return [s for s in self.series if now - self._series_fetched.get(s, float("-inf")) >= self.ttl]
+
+    async def fetch_open(self) -> List[Market]:
+        """Open markets, re-fetching only the series whose TTL ran out. Fits MarketDiscovery's `fetch`."""
+        stale = self.stale_series()
+        if stale:
+            await self.refresh(stale, only_stale=True)
+        return self.open_markets()
+
+    async def warm(self) -> List[Market]:
+        """Disk first, API only for what is missing or stale; closes the HTTP session after."""
+        if not self.by_ticker:
+            await asyncio.to_thread(self.load)
+        try:
+            return await self.fetch_open()
+        finally:
+            await self.close()
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
@@ -0,0 +1,184 @@
+# kalshi_bot/core/parquet_writer.py
+import os
+import re
+import time
+from datetime import date
+from typing import Dict, List, Optional
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from kalshi_bot.util.logger import get_logger
+
+logger = get_logger('parquet_writer')
+
+# Finalized part files (open parts end in .tmp and never match)
+PART_RE = re.compile(r"^(?P<day>\d{4}-\d{2}-\d{2})-(?P<part>\d{4,})\.parquet$")
+
+
+class RollingParquetWriter:
+    """
+    Append-only parquet output: one open ParquetWriter per day, rows accumulated into
+    row groups of `row_group_rows` / `row_group_bytes` (or whatever arrived within
+    `flush_interval` seconds, so quiet streams still reach disk), and numbered part files
+    (`YYYY-MM-DD-0000.parquet`, `-0001`, …) rolled when a file passes `max_file_bytes`
+    (uncompressed) or `max_file_age` seconds after its first row arrived. Every batch costs the
+    same no matter how much of the day is already on disk.
+
+    With `sort_by`, each row group is sorted on that column (stably — ties keep arrival
+    order) and the files declare it, so min/max statistics give readers tight,
+    non-overlapping ranges to skip on.
+
+    A part is written as `.tmp` and renamed on close, so readers globbing `*.parquet`
+    only ever see complete files. The open part has no footer until then: a crash loses
+    every row of it — up to `max_file_age` seconds' worth — and readers see none of
+    them before it closes. `max_file_age` bounds both.
+    """
+
+    def __init__(self, base_path: str, schema: pa.Schema, row_group_rows: int = 50_000,
+                 row_group_bytes: int = 32 << 20, max_file_bytes: int = 256 << 20,
+                 max_file_age: float = 3600.0, flush_interval: float = 60.0, sort_by: Optional[str] = None,
+                 **write_options):
+        self.base_path = base_path
+        self.schema = schema
+        self.row_group_rows = row_group_rows
+        self.row_group_bytes = row_group_bytes
+        self.max_file_bytes = max_file_bytes
+        self.max_file_age = max_file_age
+        self.flush_interval = flush_interval
+        self.sort_by = sort_by
+        # zstd-3 unless told otherwise (a different codec brings its own level, if any)
+        defaults = {} if "compression" in write_options else {"compression": "zstd", "compression_level": 3}
+        self.write_options = {**defaults, **write_options}
+        if sort_by is not None:
+            self.write_options.setdefault(
+                "sorting_columns", pq.SortingColumn.from_ordering(schema, [(sort_by, "ascending")]))
+        os.makedirs(base_path, exist_ok=True)
+
+        self._writer: Optional[pq.ParquetWriter] = None
+        self._day: Optional[date] = None
+        self._path: Optional[str] = None
+        self._part_started: Optional[float] = None     # first row of the current part arrived
+        self._file_bytes = 0
+        self._pending: List[pa.Table] = []
+        self._pending_day: Optional[date] = None
+        self._pending_rows = 0
+        self._pending_bytes = 0
+        self._pending_since = 0.0
+        self._next_part: Dict[date, int] = {}
+
+        # Stats
+        self.rows_written = 0
+        self.row_groups = 0
+        self.row_groups_sorted = 0      # arrived out of order and had to be sorted
+        self.files_closed = 0
+
+    # ————————————————————————
+    # Files
+    # ————————————————————————
+    def _part_number(self, day: date) -> int:
+        """Continue after any parts already on disk for `day` (restarts never overwrite)."""
+        n = self._next_part.get(day)
+        if n is None:
+            n = 0
+            prefix = day.isoformat()
+            for name in os.listdir(self.base_path):
+                m = PART_RE.match(name)
+                if m and m.group("day") == prefix:
+                    n = max(n, int(m.group("part")) + 1)
+        self._next_part[day] = n + 1
+        return n
+
+    def _open(self, day: date):
+        part = self._part_number(day)
+        self._path = os.path.join(self.base_path, f"{day.isoformat()}-{part:04d}.parquet")
+        self._writer = pq.ParquetWriter(f"{self._path}.tmp", self.schema, **self.write_options)
+        self._day = day
+        self._file_bytes = 0
+
+    def _close_file(self):
+        if self._writer is None:
+            return
+        self._writer.close()
+        os.replace(f"{self._path}.tmp", self._path)
+        self.files_closed += 1
+        self._writer = None
+        self._day = None
+        self._part_started = None
+
+    def _part_expired(self) -> bool:
+        return self._part_started is not None and time.monotonic() - self._part_started >= self.max_file_age
+
+    # ————————————————————————
+    # Writing
+    # ————————————————————————
+    def write(self, table: pa.Table, day: date):
+        """Append `table` (all rows belong to `day`)."""
+        if table.num_rows == 0:
+            return
+        if self._pending and day != self._pending_day:
+            self.flush()
+        if self._day is not None and day != self._day:
+            self._close_file()      # midnight: yesterday's part is done
+
+        if not self._pending:
+            self._pending_since = time.monotonic()
+        if self._part_started is None:
+            self._part_started = time.monotonic()
+        self._pending.append(table)
+        self._pending_rows += table.num_rows
+        self._pending_bytes += table.nbytes
+        self._pending_day = day
+        if self._pending_rows >= self.row_group_rows or self._pending_bytes >= self.row_group_bytes \
+                or time.monotonic() - self._pending_since >= self.flush_interval or self._part_expired():
+            self.flush()
+
+    def flush(self):
+        """Write buffered rows as one row group; roll the part file if it is too big or too old."""
+        if not self._pending:
+            return
+        if self._writer is None:
+            self._open(self._pending_day)
+
+        table = pa.concat_tables(self._pending) if len(self._pending) > 1 else self._pending[0]
+        if self.sort_by is not None and table.num_rows > 1:
+            # Arrival order is almost always already sorted — only pay for the take() when it isn't
+            key = table.column(self.sort_by)
+            if not pc.all(pc.greater_equal(key[1:], key[:-1])).as_py():
+                table = table.take(pc.sort_indices(table, [(self.sort_by, "ascending")]))
+                self.row_groups_sorted += 1
+        self._writer.write_table(table, row_group_size=table.num_rows)
+        self.rows_written += table.num_rows
+        self.row_groups += 1
+        self._file_bytes += self._pending_bytes
+        self._pending, self._pending_rows, self._pending_bytes = [], 0, 0
+
+        if self._file_bytes >= self.max_file_bytes or self._part_expired():
+            self._close_file()
+
+    def flush_if_due(self):
+        """Flush rows that have waited `flush_interval` and close a part past `max_file_age` — for callers with idle periods."""
+        if self._pending and (time.monotonic() - self._pending_since >= self.flush_interval or self._part_expired()):
+            self.flush()
+        elif self._writer is not None and self._part_expired():
+            self._close_file()
+
+    def close(self):
+        """Flush and finalize the open part. Safe to call more than once."""
+        self.flush()
+        self._close_file()
+
+    @property
+    def idle(self) -> bool:
+        """No open part and nothing buffered — every row written so far is in a finalized file."""
+        return self._writer is None and not self._pending
+
+    def stats(self) -> dict:
+        return {
+            "rows_written": self.rows_written,
+            "row_groups": self.row_groups,
+            "row_groups_sorted": self.row_groups_sorted,
+            "files_closed": self.files_closed,
+            "pending_rows": self._pending_rows,
+        }
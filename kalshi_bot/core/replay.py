@@ -0,0 +1,327 @@
+# kalshi_bot/core/replay.py
+"""
+Deterministic replay: recorded frames go through the client's own `_handle_message`
+(decoder, seq tracking, books, recorder, event bus) on a SimClock, so strategies
+see exactly the updates and timestamps they saw live — as fast as the CPU allows,
+or paced at a multiple of real time.
+
+    python -m kalshi_bot.core.replay --date 2025-12-04
+    python -m kalshi_bot.core.replay --date 2025-12-04 --start 14:30 --checkpoints kalshi_checkpoints
+    python -m kalshi_bot.core.replay --source capture --path captures --speed 10 --scalper
+"""
+import asyncio
+import json
+import os
+import time
+from datetime import date, datetime, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+from kalshi_bot.core.capture import iter_frames
+from kalshi_bot.core.checkpoint import Checkpoint, load_checkpoints
+from kalshi_bot.core.client import KalshiClient
+from kalshi_bot.core.delta_recorder import SIDES
+from kalshi_bot.core.parquet_writer import PART_RE
+from kalshi_bot.strategy.scalper import ArbitrageScalper
+from kalshi_bot.util.clock import SimClock
+from kalshi_bot.util.logger import get_logger
+
+try:
+    import orjson
+except ImportError:     # optional — stdlib json is only slower
+    orjson = None
+
+logger = get_logger('replay')
+
+_dumps = orjson.dumps if orjson is not None else (lambda obj: json.dumps(obj).encode())
+
+_COLUMNS = ["ts", "ticker", "seq", "msg_type", "price_cents", "delta", "side", "top_bids", "top_asks"]
+
+# Report progress every this many frames
+PROGRESS_EVERY = 1_000_000
+
+
+# ————————————————————————
+# Sources: (recv wall-clock ns, raw frame) in arrival order
+# ————————————————————————
+def _store_tickers(base_path: str, day: date) -> List[str]:
+    directory = os.path.join(base_path, f"date={day.isoformat()}")
+    return [name.split("=", 1)[1] for name in os.listdir(directory) if name.startswith("ticker=")]
+
+
+def _part_files(directory: str) -> List[str]:
+    """Finalized part files under a day's directory — a running recorder's open .tmp parts have no footer yet."""
+    return sorted(os.path.join(root, name) for root, _, names in os.walk(directory)
+                  for name in names if PART_RE.match(name))
+
+
+def _snapshot_frame(sid: int, cp: Checkpoint) -> bytes:
+    return _dumps({"type": "orderbook_snapshot", "sid": sid, "seq": cp.seq, "msg": cp.snapshot()})
+
+
+def parquet_frames(base_path: str, day: date, tickers: Optional[List[str]] = None, start_ns: Optional[int] = None,
+                   checkpoint_path: Optional[str] = None) -> Iterator[Tuple[int, bytes]]:
+    """
+    One day of the recorder's parquet store, re-encoded as WebSocket frames in
+    (ts, seq) order — ts is only milliseconds, and spill drains and WAL recovery put
+    older rows in later part files, so file order alone is not recorded order. Deltas
+    are exact; snapshots are rebuilt from the recorded top-N ladder, so levels beyond
+    it are missing — use a capture for bit-exact books. Each snapshot opens a new sid
+    for its ticker, as a resubscribe did live.
+
+    With `start_ns` and `checkpoint_path`, each ticker starts from its latest
+    checkpoint at or before `start_ns` (an exact full-ladder snapshot) and only the
+    rows recorded after it are read; tickers without one replay from the day's start.
+    Frames before `start_ns` are still yielded — they bring the books up to it.
+    """
+    directory = os.path.join(base_path, f"date={day.isoformat()}")
+    dataset = ds.dataset(_part_files(directory), format="parquet", partition_base_dir=directory,
+                         partitioning=ds.partitioning(pa.schema([("ticker", pa.string())]), flavor="hive"))
+    filter_ = pc.field("ticker").isin(tickers) if tickers else None
+    checkpoints: Dict[str, Checkpoint] = {}
+    if start_ns is not None and checkpoint_path:
+        checkpoints = load_checkpoints(checkpoint_path, start_ns // 1_000_000, tickers or _store_tickers(base_path, day))
+        logger.info(f"Seeking: {len(checkpoints)} ticker(s) start from a checkpoint")
+    if checkpoints:
+        # Rows recorded before a ticker's checkpoint are already in it
+        seek = ~pc.field("ticker").isin(list(checkpoints))
+        for ticker, cp in checkpoints.items():
+            seek = seek | ((pc.field("ticker") == ticker) & (pc.field("ts") >= pa.scalar(cp.ts_ms, pa.timestamp('ms'))))
+        filter_ = seek if filter_ is None else filter_ & seek
+    table = dataset.to_table(columns=_COLUMNS, filter=filter_)
+    table = table.sort_by([("ts", "ascending"), ("seq", "ascending")])
+    logger.info(f"Replaying {table.num_rows:,} recorded rows from {base_path} for {day}")
+
+    sids, next_sid = {}, 0
+    # Checkpoint snapshots go out in time order, ahead of their tickers' first rows
+    pending = sorted(checkpoints.values(), key=lambda cp: cp.ts_ms, reverse=True)
+    # Ticker → [checkpoint seq, seen the checkpoint's own row] until its first row after the checkpoint
+    resume: Dict[str, list] = {}
+    for batch in table.to_batches(max_chunksize=65_536):
+        cols = [batch.column(name) for name in _COLUMNS]
+        ts_ms = cols[0].cast(pa.int64()).to_numpy()
+        tickers_, seqs, types, prices, deltas, sides, bids, asks = (c.to_pylist() for c in cols[1:])
+        for i in range(batch.num_rows):
+            ticker, seq = tickers_[i], seqs[i]
+            ts_ns = int(ts_ms[i]) * 1_000_000
+            while pending and pending[-1].ts_ms * 1_000_000 <= ts_ns:
+                cp = pending.pop()
+                next_sid += 1
+                sids[cp.ticker] = next_sid
+                resume[cp.ticker] = [cp.seq, False]
+                yield cp.ts_ms * 1_000_000, _snapshot_frame(next_sid, cp)
+            state = resume.get(ticker) if resume else None
+            if state is not None:
+                # Rows stamped in the checkpoint's millisecond: skip up to and including its own
+                if not state[1] and seq <= state[0]:
+                    state[1] = seq == state[0]
+                    continue
+                del resume[ticker]
+            if types[i] == "orderbook_snapshot":
+                next_sid += 1
+                sids[ticker] = sid = next_sid
+                yes = [[round(lvl["price"] * 100), lvl["size"]] for lvl in bids[i] or () if lvl]
+                no = [[100 - round(lvl["price"] * 100), lvl["size"]] for lvl in asks[i] or () if lvl]
+                yield ts_ns, _dumps({"type": "orderbook_snapshot", "sid": sid, "seq": seq,
+                                     "msg": {"market_ticker": ticker, "yes": yes, "no": no}})
+                continue
+            sid = sids.get(ticker)
+            if sid is None or prices[i] is None or sides[i] not in SIDES:
+                continue    # no book to apply it to yet, or an unusable row
+            yield ts_ns, (f'{{"type":"orderbook_delta","sid":{sid},"seq":{seq},"msg":{{"market_ticker":"{ticker}",'
+                          f'"price":{prices[i]},"delta":{deltas[i]},"side":"{sides[i]}"}}}}').encode()
+    # Checkpointed tickers with nothing recorded after their checkpoint
+    for cp in reversed(pending):
+        next_sid += 1
+        yield cp.ts_ms * 1_000_000, _snapshot_frame(next_sid, cp)
+
+
+def capture_frames(directory: str, name: Optional[str] = None, start_ns: Optional[int] = None,
+                   end_ns: Optional[int] = None) -> Iterator[tuple]:
+    """
+    Raw frames from a FrameCapture directory — bit-exact, connection boundaries included.
+    A sharded capture comes out tagged with each frame's connection (see ReplayEngine).
+    """
+    return iter_frames(directory, name, start_ns, end_ns)
+
+
+# ————————————————————————
+# Engine
+# ————————————————————————
+class _Connection:
+    """One recorded connection's subscriptions — sids and seqs only mean something within it."""
+
+    __slots__ = ("sid_to_ticker", "ticker_to_sid", "expected", "tickers", "held")
+
+    def __init__(self):
+        self.sid_to_ticker: Dict[int, str] = {}
+        self.ticker_to_sid: Dict[str, int] = {}
+        self.expected: Dict[int, int] = {}
+        self.tickers: set[str] = set()      # every market it has held: its reconnect blanks only these
+        self.held = 0                       # len(ticker_to_sid) when `tickers` was last updated
+
+
+class ReplayEngine:
+    """
+    Feeds frames to a KalshiClient with no socket. The SimClock advances to each
+    frame's receive time before it is handled, and the event bus is drained inline
+    after it, so every strategy callback runs in the same order on every replay.
+
+    `speed=0` replays flat out; `speed=s` paces frames at s × real time.
+    Markets are registered as their first snapshot arrives.
+
+    Frames are (ts, frame) pairs, or (ts, frame, connection) from a sharded capture:
+    each connection then keeps its own sids and seq expectations, swapped into the
+    client as its frames come up, and its CONNECT marker blanks only the books it
+    held — as the shards' separate clients did live.
+    """
+
+    def __init__(self, frames: Iterable[Tuple[int, bytes]], speed: float = 0.0, book_backend: str = "array",
+                 record_path: Optional[str] = None, client: Optional[KalshiClient] = None):
+        self.frames = frames
+        self.speed = speed
+        self.clock = SimClock()
+        self.client = client or KalshiClient(api_key="", pk="", markets=[], name="replay",
+                                             book_backend=book_backend, record_path=record_path,
+                                             clock=self.clock)
+        self.client.replaying = True
+        # Trace clocks are simulated — a persist latency against them would be noise
+        if getattr(self.client.recorder, "tracer", None) is not None:
+            self.client.recorder.tracer = None
+
+        self._connections: Dict[str, _Connection] = {}
+
+        self.events = 0
+        self.connects = 0
+        self.first_ns: Optional[int] = None
+        self.last_ns: Optional[int] = None
+        self.wall_seconds = 0.0
+
+    async def run(self) -> dict:
+        client, clock, bus = self.client, self.clock, self.client.bus
+        handle = client._handle_message
+        await client.recorder.start()
+        started = time.perf_counter()
+        conn: Optional[_Connection] = None
+        try:
+            for item in self.frames:
+                ts, frame = item[0], item[1]
+                if len(item) > 2:
+                    conn = self._use_connection(item[2])
+                if self.first_ns is None:
+                    self.first_ns = ts
+                    clock.advance(ts)
+                if self.speed > 0:
+                    delay = started + (ts - self.first_ns) / 1e9 / self.speed - time.perf_counter()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                timers = clock.pending_timers()
+                clock.advance(ts)
+                if clock.pending_timers() != timers:
+                    await asyncio.sleep(0)      # let strategy timers that just came due run
+                if not frame:
+                    # Capture's connection marker: the live session state was reset here
+                    client._reset_session_state(conn.tickers if conn is not None else None)
+                    if conn is not None:
+                        conn.held = 0
+                    self.connects += 1
+                    continue
+                await handle(frame, ts, ts)
+                if conn is not None and len(client.ticker_to_sid) != conn.held:
+                    # A snapshot bound a market to this connection (or a gap unbound one)
+                    conn.tickers.update(client.ticker_to_sid)
+                    conn.held = len(client.ticker_to_sid)
+                await bus.drain()
+                self.events += 1
+                if self.events % PROGRESS_EVERY == 0:
+                    logger.info(f"{self.events:,} events, {self.events / (time.perf_counter() - started):,.0f}/s")
+                self.last_ns = ts
+        finally:
+            self.wall_seconds = time.perf_counter() - started
+            await client.recorder.close()
+        return self.stats()
+
+    def _use_connection(self, name: str) -> _Connection:
+        conn = self._connections.get(name)
+        if conn is None:
+            conn = self._connections[name] = _Connection()
+        client = self.client
+        if client.ticker_to_sid is not conn.ticker_to_sid:
+            client.sid_to_ticker = conn.sid_to_ticker
+            client.ticker_to_sid = conn.ticker_to_sid
+            client.seq_tracker.expected = conn.expected
+        return conn
+
+    def stats(self) -> dict:
+        sim_seconds = ((self.last_ns or 0) - (self.first_ns or 0)) / 1e9
+        return {
+            "events": self.events,
+            "connects": self.connects,
+            "connections": len(self._connections) or 1,
+            "wall_seconds": self.wall_seconds,
+            "events_per_second": self.events / self.wall_seconds if self.wall_seconds else 0.0,
+            "sim_seconds": sim_seconds,
+            "speedup": sim_seconds / self.wall_seconds if self.wall_seconds else 0.0,
+            "books": len(self.client.order_book_cache),
+            "seq": self.client.seq_tracker.stats(),
+            "bus": self.client.bus.stats(),
+        }
+
+
+class PaperOrders:
+    """Stands in for the socket a strategy sends orders on: counts and keeps them."""
+
+    def __init__(self):
+        self.sent: List[dict] = []
+
+    async def send(self, message: str):
+        self.sent.append(json.loads(message))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Replay recorded order book frames through the client")
+    parser.add_argument("--source", choices=("parquet", "capture"), default="parquet")
+    parser.add_argument("--path", type=str, default=None,
+                        help="parquet store (default kalshi_deltas) or capture directory (default captures)")
+    parser.add_argument("--date", type=date.fromisoformat, default=None, help="parquet: day to replay (YYYY-MM-DD)")
+    parser.add_argument("--tickers", nargs="+", default=None, help="parquet: only these markets")
+    parser.add_argument("--start", type=str, default=None,
+                        help="parquet: seek to this UTC time of --date (HH:MM[:SS]) using --checkpoints")
+    parser.add_argument("--checkpoints", type=str, default=None, help="parquet: checkpoint directory to seek with")
+    parser.add_argument("--name", type=str, default=None, help="capture: only this connection's files (default: every shard's)")
+    parser.add_argument("--speed", type=float, default=0.0, help="0 = as fast as possible, else × real time")
+    parser.add_argument("--book-backend", choices=("heap", "array"), default="array")
+    parser.add_argument("--record-to", type=str, default=None, help="re-record the replayed books here")
+    parser.add_argument("--scalper", action="store_true", help="also run ArbitrageScalper on paper")
+    args = parser.parse_args()
+
+    if args.source == "parquet":
+        if args.date is None:
+            parser.error("--date is required with --source parquet")
+        start_ns = None
+        if args.start:
+            at = datetime.combine(args.date, datetime.strptime(args.start, "%H:%M:%S" if args.start.count(":") == 2
+                                                               else "%H:%M").time(), tzinfo=timezone.utc)
+            start_ns = int(at.timestamp()) * 1_000_000_000
+        frames = parquet_frames(args.path or "kalshi_deltas", args.date, args.tickers, start_ns=start_ns,
+                                checkpoint_path=args.checkpoints)
+    else:
+        frames = capture_frames(args.path or "captures", args.name)
+
+    engine = ReplayEngine(frames, speed=args.speed, book_backend=args.book_backend, record_path=args.record_to)
+    orders = PaperOrders()
+    if args.scalper:
+        scalper = ArbitrageScalper(clock=engine.clock)
+        engine.client.bus.subscribe(lambda book: scalper.on_orderbook_update(orders, book), name="scalper")
+
+    stats = asyncio.run(engine.run())
+    print(f"⏩ {stats['events']:,} events in {stats['wall_seconds']:.2f}s — "
+          f"{stats['events_per_second']:,.0f} events/s, {stats['sim_seconds']:,.0f}s of market time "
+          f"({stats['speedup']:,.0f}x real time), {stats['books']} books")
+    if args.scalper:
+        print(f"📝 {len(orders.sent)} paper orders")
@@ -0,0 +1,230 @@
+# kalshi_bot/core/ring_buffer.py
+"""
+Single-producer / multi-consumer ring of fixed-width book events in shared memory.
+
+The ingest process publishes normalized events (snapshot start, absolute level, delta)
+on the YES axis; strategy processes attach by name, keep their own cursor and read
+numpy views straight out of the shared segment — no pickling, no locks, no copies.
+
+Layout: a 64-byte header (magic, capacity, record size, write cursor, resync requests)
+followed by `capacity` records of BOOK_EVENT_DTYPE. The producer fills a slot, stamps it with its
+absolute index + 1 and only then advances the write cursor, so a reader never sees
+a slot before it is complete. A reader that falls more than `capacity` records behind
+has been lapped: the skipped records are counted as overruns.
+
+Full books only reach the ring on subscribe and resync, so a reader that attaches
+mid-session — or loses records to an overrun — bumps the header's resync counter and
+the producer republishes every book as a snapshot (`RingWriter.republish`).
+"""
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from kalshi_bot.core.checkpoint import ladder_cents
+from kalshi_bot.core.data.features import N_LEVELS
+
+# Event kinds
+EV_SNAPSHOT = 1     # clear the book; LEVEL events with the same seq follow
+EV_LEVEL = 2        # absolute size at a price
+EV_DELTA = 3        # signed size change at a price
+
+# Sides on the YES axis
+SIDE_BID, SIDE_ASK = 0, 1
+
+TICKER_BYTES = 48
+
+BOOK_EVENT_DTYPE = np.dtype([
+    ("stamp", "<u8"),           # absolute write index + 1 (0 = never written)
+    ("recv_ns", "<i8"),
+    ("seq", "<i8"),
+    ("qty", "<i8"),             # EV_LEVEL: size, EV_DELTA: signed change
+    ("bid_volume", "<i8"),
+    ("ask_volume", "<i8"),
+    ("kind", "u1"),
+    ("side", "u1"),
+    ("price_cents", "<i2"),     # YES price
+    ("best_bid", "<i2"),        # cents, after the event is applied
+    ("best_ask", "<i2"),
+    ("ticker", f"S{TICKER_BYTES}"),
+], align=True)
+
+_MAGIC = 0x4B424F4F4B524E47   # "KBOOKRNG"
+_HEADER = np.dtype([("magic", "<u8"), ("capacity", "<u8"), ("itemsize", "<u8"), ("write", "<u8"),
+                    ("resync", "<u8")])     # bumped by readers that need every book republished
+_HEADER_BYTES = 64
+
+
+class _Ring:
+    def __init__(self, shm: shared_memory.SharedMemory):
+        self.shm = shm
+        self.header = np.ndarray((1,), dtype=_HEADER, buffer=shm.buf)[0:1]
+        capacity = int(self.header["capacity"][0])
+        self.capacity = capacity
+        self.records = np.ndarray((capacity,), dtype=BOOK_EVENT_DTYPE, buffer=shm.buf, offset=_HEADER_BYTES)
+
+    @property
+    def write_cursor(self) -> int:
+        return int(self.header["write"][0])
+
+    def close(self):
+        # Drop numpy views first — SharedMemory refuses to close while they are exported
+        self.header = self.records = None
+        self.shm.close()
+
+
+class BookEventPublisher:
+    """Snapshot/delta messages → BOOK_EVENT_DTYPE events; subclasses store them via `publish`."""
+
+    def publish(self, kind: int, ticker: str, seq: int, side: int, price_cents: int, qty: int,
+                best_bid: int, best_ask: int, bid_volume: int, ask_volume: int, recv_ns: int = 0):
+        raise NotImplementedError
+
+    def publish_snapshot(self, ticker: str, seq: int, snapshot: dict, book):
+        """Snapshot → one EV_SNAPSHOT plus one EV_LEVEL per resting level (YES axis)."""
+        bb, ba = _best_cents(book)
+        bv, av = book.bid_volume(), book.ask_volume()
+        self.publish(EV_SNAPSHOT, ticker, seq, 0, 0, 0, bb, ba, bv, av)
+        for price_cents, size in snapshot.get("yes", []):
+            if size > 0:
+                self.publish(EV_LEVEL, ticker, seq, SIDE_BID, price_cents, size, bb, ba, bv, av)
+        for price_cents, size in snapshot.get("no", []):
+            if size > 0:
+                self.publish(EV_LEVEL, ticker, seq, SIDE_ASK, N_LEVELS - price_cents, size, bb, ba, bv, av)
+
+    def publish_delta(self, ticker: str, seq: int, update: dict, book):
+        bb, ba = _best_cents(book)
+        if update["side"] == "yes":
+            side, c = SIDE_BID, update["price"]
+        else:
+            side, c = SIDE_ASK, N_LEVELS - update["price"]
+        self.publish(EV_DELTA, ticker, seq, side, c, update["delta"], bb, ba,
+                     book.bid_volume(), book.ask_volume())
+
+
+class RingWriter(_Ring, BookEventPublisher):
+    """Producer side. Exactly one per ring."""
+
+    def __init__(self, name: str, capacity: int = 1 << 20):
+        size = _HEADER_BYTES + capacity * BOOK_EVENT_DTYPE.itemsize
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        header = np.ndarray((1,), dtype=_HEADER, buffer=shm.buf)
+        header[0] = (_MAGIC, capacity, BOOK_EVENT_DTYPE.itemsize, 0, 0)
+        del header
+        super().__init__(shm)
+        self._cursor = 0
+        self._ticker_bytes: Dict[str, bytes] = {}
+        self._resyncs_served = 0
+        self.republished = 0
+
+    def publish(self, kind: int, ticker: str, seq: int, side: int, price_cents: int, qty: int,
+                best_bid: int, best_ask: int, bid_volume: int, ask_volume: int, recv_ns: int = 0):
+        tb = self._ticker_bytes.get(ticker)
+        if tb is None:
+            tb = self._ticker_bytes[ticker] = ticker.encode("ascii")[:TICKER_BYTES]
+
+        cursor = self._cursor
+        slot = self.records[cursor % self.capacity:cursor % self.capacity + 1]
+        slot["stamp"] = 0       # invalidate before overwriting
+        slot[0] = (0, recv_ns or time.time_ns(), seq, qty, bid_volume, ask_volume,
+                   kind, side, price_cents, best_bid, best_ask, tb)
+        slot["stamp"] = cursor + 1
+        self._cursor = cursor + 1
+        self.header["write"] = cursor + 1      # publish
+
+    def resync_requested(self) -> bool:
+        """A reader attached or was lapped since the last `republish`."""
+        return int(self.header["resync"][0]) != self._resyncs_served
+
+    def republish(self, books: Dict[str, object]):
+        """Every book in `books` (ticker → book) as a full snapshot at its current seq."""
+        self._resyncs_served = int(self.header["resync"][0])
+        for ticker, book in books.items():
+            bids, asks = ladder_cents(book)
+            self.publish_snapshot(ticker, book.seq, {"yes": bids, "no": [[N_LEVELS - c, s] for c, s in asks]}, book)
+        self.republished += 1
+
+    def unlink(self):
+        self.close()
+        self.shm.unlink()
+
+
+class RingReader(_Ring):
+    """Consumer side. Each reader keeps its own cursor; any number may attach."""
+
+    def __init__(self, name: str, from_start: bool = False):
+        shm = shared_memory.SharedMemory(name=name, create=False)
+        # Readers must not unlink the segment when they exit (Python < 3.13 tracks attaches too)
+        try:
+            resource_tracker.unregister(shm._name, "shared_memory")
+        except Exception:
+            pass
+        super().__init__(shm)
+        if int(self.header["magic"][0]) != _MAGIC:
+            raise ValueError(f"{name} is not a book event ring")
+        self.cursor = 0 if from_start else self.write_cursor
+        self.overruns = 0
+        self._batch_start = self.cursor
+        # Whatever we start from, the books before it are not in our view of the ring
+        self.request_resync()
+
+    def request_resync(self):
+        """Ask the producer to republish every book. Not atomic across readers — callers retry."""
+        self.header["resync"] = int(self.header["resync"][0]) + 1
+
+    def poll(self, max_records: int = 4096) -> List[np.ndarray]:
+        """
+        Zero-copy views of the records published since the last poll (two views when the
+        range wraps). Views are only valid until the producer laps them — call `release()`
+        after processing to learn whether that happened.
+        """
+        write = self.write_cursor
+        behind = write - self.cursor
+        if behind > self.capacity:
+            self.overruns += behind - self.capacity
+            self.cursor = write - self.capacity
+        end = min(write, self.cursor + max_records)
+        self._batch_start = self.cursor
+        if end == self.cursor:
+            return []
+
+        start_i, end_i = self.cursor % self.capacity, end % self.capacity
+        self.cursor = end
+        if start_i < end_i:
+            return [self.records[start_i:end_i]]
+        views = [self.records[start_i:]]
+        if end_i:
+            views.append(self.records[:end_i])
+        return views
+
+    def release(self) -> int:
+        """Count records from the last poll that were overwritten while we read them."""
+        lapped = self.write_cursor - self.capacity - self._batch_start
+        if lapped > 0:
+            torn = min(lapped, self.cursor - self._batch_start)
+            self.overruns += torn
+            return torn
+        return 0
+
+    def lag(self) -> int:
+        return self.write_cursor - self.cursor
+
+    def stats(self) -> dict:
+        return {"cursor": self.cursor, "lag": self.lag(), "overruns": self.overruns}
+
+
+def _best_cents(book) -> tuple:
+    # Both book backends expose dollars; ArrayOrderBook also has exact cents
+    if hasattr(book, "best_bid_cents"):
+        return book.best_bid_cents(), book.best_ask_cents()
+    return round(book.best_bid() * 100), round(book.best_ask() * 100)
+
+
+def event_to_update(record) -> Optional[dict]:
+    """EV_LEVEL / EV_DELTA record → Kalshi-style update for OrderBook.apply_delta."""
+    side = int(record["side"])
+    c = int(record["price_cents"])
+    if side == SIDE_BID:
+        return {"price": c, "delta": int(record["qty"]), "side": "yes"}
+    return {"price": N_LEVELS - c, "delta": int(record["qty"]), "side": "no"}
@@ -0,0 +1,86 @@
+# kalshi_bot/core/seq_tracker.py
+import time
+from typing import Dict, Optional
+
+# check() results
+SEQ_OK = "ok"
+SEQ_GAP = "gap"
+SEQ_DUPLICATE = "duplicate"
+
+
+class SeqTracker:
+    """
+    Expected-`seq` bookkeeping per subscription `sid`, plus the quarantine state of
+    markets whose book can no longer be trusted.
+
+    Kalshi numbers messages per subscription, so a gap only tells us *some* frame on
+    that sid was lost. The client subscribes one market per sid, which makes a gap
+    attributable to exactly one market.
+    """
+
+    def __init__(self):
+        self.expected: Dict[int, int] = {}          # sid → next seq we expect
+        self.quarantined: Dict[str, float] = {}     # ticker → monotonic quarantine start
+
+        # Counters
+        self.gaps: int = 0
+        self.duplicates: int = 0
+        self.recoveries: int = 0
+        self.recovery_latency_total: float = 0.0
+        self.recovery_latency_max: float = 0.0
+        self.quarantined_seconds: float = 0.0       # closed quarantine intervals only
+
+    def check(self, sid: int, seq: int) -> str:
+        """Classify `seq` for `sid` and advance the expectation."""
+        expected = self.expected.get(sid)
+        if expected is None or seq == expected:
+            self.expected[sid] = seq + 1
+            return SEQ_OK
+        if seq < expected:
+            self.duplicates += 1
+            return SEQ_DUPLICATE
+        self.gaps += 1
+        self.expected[sid] = seq + 1
+        return SEQ_GAP
+
+    def forget(self, sid: int):
+        """Subscription is gone — stop tracking it."""
+        self.expected.pop(sid, None)
+
+    # ————————————————————————
+    # Quarantine
+    # ————————————————————————
+    def quarantine(self, ticker: str):
+        self.quarantined.setdefault(ticker, time.monotonic())
+
+    def is_quarantined(self, ticker: str) -> bool:
+        return ticker in self.quarantined
+
+    def release(self, ticker: str) -> Optional[float]:
+        """Market is consistent again (fresh snapshot). Returns recovery latency in seconds."""
+        started = self.quarantined.pop(ticker, None)
+        if started is None:
+            return None
+        latency = time.monotonic() - started
+        self.recoveries += 1
+        self.recovery_latency_total += latency
+        self.recovery_latency_max = max(self.recovery_latency_max, latency)
+        self.quarantined_seconds += latency
+        return latency
+
+    def discard(self, ticker: str):
+        """Market is gone — drop its quarantine without counting a recovery."""
+        self.quarantined.pop(ticker, None)
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        open_seconds = sum(now - t for t in self.quarantined.values())
+        return {
+            "gaps": self.gaps,
+            "duplicates": self.duplicates,
+            "recoveries": self.recoveries,
+            "recovery_latency_avg_s": self.recovery_latency_total / self.recoveries if self.recoveries else 0.0,
+            "recovery_latency_max_s": self.recovery_latency_max,
+            "quarantined_now": len(self.quarantined),
+            "quarantined_seconds": self.quarantined_seconds + open_seconds,
+        }
@@ -0,0 +1,235 @@
+# kalshi_bot/core/sharding.py
+import asyncio
+import bisect
+import hashlib
+import multiprocessing as mp
+import queue
+import signal
+import time
+from typing import Dict, List, Optional
+
+from kalshi_bot.core.client import DRAIN_TIMEOUT, KalshiClient
+from kalshi_bot.core.data.market import Market
+from kalshi_bot.core.market_cache import MarketCache
+from kalshi_bot.monitor.loop_lag import LoopLagMonitor
+from kalshi_bot.util.logger import get_logger
+
+logger = get_logger('sharding')
+
+HEALTH_INTERVAL = 10  # seconds between shard health reports
+
+
+class HashRing:
+    """
+    Consistent hash ring with virtual nodes. Keys (event tickers) keep their shard when
+    the shard count changes, except the ~1/N that have to move.
+    """
+
+    def __init__(self, n_shards: int, vnodes: int = 64):
+        self.n_shards = n_shards
+        points = []
+        for shard in range(n_shards):
+            for v in range(vnodes):
+                points.append((self._hash(f"shard-{shard}-{v}"), shard))
+        points.sort()
+        self._hashes = [h for h, _ in points]
+        self._shards = [s for _, s in points]
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        # Stable across processes and restarts (unlike hash())
+        return int.from_bytes(hashlib.md5(key.encode("utf-8")).digest()[:8], "big")
+
+    def shard_for(self, key: str) -> int:
+        i = bisect.bisect(self._hashes, self._hash(key)) % len(self._hashes)
+        return self._shards[i]
+
+
+def partition_markets(markets: List[Market], n_shards: int) -> List[List[Market]]:
+    """Split markets into shards by event_ticker, so both sides of a game share a connection."""
+    ring = HashRing(n_shards)
+    shards: List[List[Market]] = [[] for _ in range(n_shards)]
+    for m in markets:
+        shards[ring.shard_for(m.event_ticker)].append(m)
+    return shards
+
+
+class ShardFilter:
+    """Market discovery filter for one shard (a class, not a lambda, so it pickles into workers)."""
+
+    def __init__(self, shard_id: int, n_shards: int):
+        self.shard_id = shard_id
+        self.ring = HashRing(n_shards)
+
+    def __call__(self, market: Market) -> bool:
+        return self.ring.shard_for(market.event_ticker) == self.shard_id
+
+
+def _run_shard_process(shard_id: int, api_key: str, pk: str, markets: List[Market],
+                       client_kwargs: dict, health_queue, cache_spec: Optional[dict] = None):
+    """Worker process entry point: one client, one event loop, health pushed to the parent."""
+    market_cache = None
+    if cache_spec is not None:
+        # Same series and catalog file as the parent's cache — loaded from disk, so no API hit inside its TTL
+        market_cache = MarketCache(**cache_spec)
+        market_cache.load()
+    client = KalshiClient(api_key=api_key, pk=pk, markets=markets, name=f"shard-{shard_id}",
+                          market_cache=market_cache, **client_kwargs)
+
+    async def report_health():
+        while True:
+            await asyncio.sleep(HEALTH_INTERVAL)
+            try:
+                health_queue.put_nowait((shard_id, client.health()))
+            except queue.Full:
+                pass
+
+    async def main():
+        # terminate() from the coordinator → cancel → finally below finalizes files
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+        # Each worker has its own loop to watch; the lag rides along in the shard's health
+        client.loop_lag = LoopLagMonitor()
+        client.loop_lag.start()
+        asyncio.create_task(report_health())
+        try:
+            await client.start()
+        finally:
+            await client.close()
+            if market_cache is not None:
+                await market_cache.close()
+
+    asyncio.run(main())
+
+
+class ShardCoordinator:
+    """
+    Runs N shard clients — as tasks in this loop, or as N worker processes — each with its
+    own WebSocket, books and recorders, and aggregates their health.
+    """
+
+    def __init__(self, api_key: str, pk: str, n_shards: int, markets: Optional[List[Market]] = None,
+                 processes: bool = False, **client_kwargs):
+        if markets is None:
+            from kalshi_bot.util.util import get_nba_sport_markets
+            markets = get_nba_sport_markets()
+        self.api_key = api_key
+        self.pk = pk
+        self.n_shards = n_shards
+        self.processes = processes
+        self.client_kwargs = client_kwargs
+        self.shard_markets = partition_markets(markets, n_shards)
+
+        self.clients: List[KalshiClient] = []
+        self._procs: List[mp.Process] = []
+        self._shard_health: Dict[int, dict] = {}
+        self._health_ts: Dict[int, float] = {}
+        self._dead: set[str] = set()
+        # In-loop shards share one loop — its monitor is reported once, fleet-wide
+        self.loop_lag: Optional[LoopLagMonitor] = None
+
+        for shard_id, ms in enumerate(self.shard_markets):
+            logger.info(f"shard-{shard_id}: {len(ms)} market(s)")
+
+    async def start(self):
+        if self.processes:
+            await self._run_processes()
+        else:
+            await self._run_in_loop()
+
+    def _shard_kwargs(self, shard_id: int) -> dict:
+        kwargs = dict(self.client_kwargs)
+        # Rings are single-producer → one per shard
+        if kwargs.get("ring_name"):
+            kwargs["ring_name"] = f"{kwargs['ring_name']}-{shard_id}"
+        # Each shard discovers on its own and keeps only its slice of the live set
+        if kwargs.get("discovery_interval"):
+            kwargs["market_filter"] = ShardFilter(shard_id, self.n_shards)
+        # The cache's HTTP session can't cross a process boundary — workers build their own (see _cache_spec)
+        if self.processes:
+            kwargs.pop("market_cache", None)
+        return kwargs
+
+    def _cache_spec(self) -> Optional[dict]:
+        cache = self.client_kwargs.get("market_cache")
+        if cache is None:
+            return None
+        return {"series": cache.series, "path": cache.path, "ttl": cache.ttl, "status": cache.status,
+                "concurrency": cache.concurrency}
+
+    def _runs_shard(self, shard_id: int) -> bool:
+        # An empty shard may still receive markets later through discovery
+        return bool(self.shard_markets[shard_id]) or bool(self.client_kwargs.get("discovery_interval"))
+
+    async def _run_in_loop(self):
+        self.clients = [
+            KalshiClient(api_key=self.api_key, pk=self.pk, markets=ms, name=f"shard-{i}", **self._shard_kwargs(i))
+            for i, ms in enumerate(self.shard_markets) if self._runs_shard(i)
+        ]
+        await asyncio.gather(*(c.start() for c in self.clients))
+
+    async def _run_processes(self):
+        ctx = mp.get_context("spawn")
+        health_queue = ctx.Queue(maxsize=1000)
+        for shard_id, ms in enumerate(self.shard_markets):
+            if not self._runs_shard(shard_id):
+                continue
+            p = ctx.Process(
+                target=_run_shard_process,
+                args=(shard_id, self.api_key, self.pk, ms, self._shard_kwargs(shard_id), health_queue,
+                      self._cache_spec()),
+                name=f"kalshi-shard-{shard_id}",
+                daemon=True,
+            )
+            p.start()
+            self._procs.append(p)
+
+        while True:
+            # Drain without blocking the loop
+            while True:
+                try:
+                    shard_id, health = health_queue.get_nowait()
+                except queue.Empty:
+                    break
+                self._shard_health[shard_id] = health
+                self._health_ts[shard_id] = time.monotonic()
+
+            for p in self._procs:
+                if not p.is_alive() and p.name not in self._dead:
+                    self._dead.add(p.name)
+                    logger.error(f"{p.name} exited with code {p.exitcode}")
+            await asyncio.sleep(1.0)
+
+    async def close(self):
+        """In-loop shards: flush and finalize every client. Worker processes close their own."""
+        await asyncio.gather(*(c.close() for c in self.clients))
+        for p in self._procs:
+            p.terminate()
+        # Workers drain on SIGTERM within their own budget; give them that long to exit
+        deadline = time.monotonic() + self.client_kwargs.get("drain_timeout", DRAIN_TIMEOUT) + 1.0
+        for p in self._procs:
+            await asyncio.to_thread(p.join, max(0.0, deadline - time.monotonic()))
+
+    def health(self) -> dict:
+        """Per-shard health plus fleet-wide totals."""
+        if self.processes:
+            now = time.monotonic()
+            shards = {
+                h["name"]: dict(h, report_age_s=now - self._health_ts[i], alive=self._procs_alive(i))
+                for i, h in self._shard_health.items()
+            }
+        else:
+            shards = {c.name: c.health() for c in self.clients}
+
+        totals = {"markets": 0, "awaiting_snapshot": 0, "disconnects": 0, "gaps": 0, "quarantined_now": 0}
+        for h in shards.values():
+            totals["markets"] += h["markets"]
+            totals["awaiting_snapshot"] += h["awaiting_snapshot"]
+            totals["disconnects"] += h["connection"]["disconnects"]
+            totals["gaps"] += h["seq"]["gaps"]
+            totals["quarantined_now"] += h["seq"]["quarantined_now"]
+        loop_lag = self.loop_lag.stats() if self.loop_lag is not None else None
+        return {"shards": shards, "totals": totals, "loop_lag": loop_lag}
+
+    def _procs_alive(self, shard_id: int) -> bool:
+        name = f"kalshi-shard-{shard_id}"
+        return any(p.name == name and p.is_alive() for p in self._procs)
@@ -0,0 +1,105 @@
+# kalshi_bot/core/supervisor.py
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable, Optional
+
+import websockets
+
+from kalshi_bot.util.logger import get_logger
+
+logger = get_logger('supervisor')
+
+
+class Backoff:
+    """Exponential backoff with full jitter: sleep U(0, min(cap, base * factor**attempt))."""
+
+    def __init__(self, base: float = 0.5, cap: float = 30.0, factor: float = 2.0):
+        self.base = base
+        self.cap = cap
+        self.factor = factor
+        self.attempt = 0
+
+    def next(self) -> float:
+        delay = random.uniform(0, min(self.cap, self.base * self.factor ** self.attempt))
+        self.attempt += 1
+        return delay
+
+    def reset(self):
+        self.attempt = 0
+
+
+class ConnectionSupervisor:
+    """
+    Keeps a WebSocket session alive. `session()` connects, subscribes and reads until the
+    socket drops; the supervisor then sleeps with jittered backoff and calls it again.
+
+    Time-to-recover runs from the moment a session ends until the session reports
+    `mark_recovered()` (every book resynced), and is exported through `stats()`.
+    """
+
+    def __init__(self, session: Callable[[], Awaitable[None]], backoff: Optional[Backoff] = None, name: str = "ws"):
+        self.session = session
+        self.backoff = backoff or Backoff()
+        self.name = name
+        self._stopped = False
+
+        # Counters
+        self.connects: int = 0
+        self.disconnects: int = 0
+        self.recoveries: int = 0
+        self.last_recovery_s: Optional[float] = None
+        self.max_recovery_s: float = 0.0
+        self.total_downtime_s: float = 0.0
+        self._down_since: Optional[float] = None
+
+    async def run(self):
+        while not self._stopped:
+            self.connects += 1
+            try:
+                await self.session()
+                logger.warning(f"[{self.name}] connection closed")
+            except asyncio.CancelledError:
+                raise
+            except websockets.exceptions.InvalidStatusCode as e:
+                logger.error(f"[{self.name}] connection failed: {e.status_code} - {e.response_headers}")
+                logger.error("Fix: Regenerate API key/private key at kalshi.com/account/api and ensure PEM is clean.")
+            except Exception as e:
+                logger.error(f"[{self.name}] WS error: {e!r}")
+
+            if self._stopped:
+                break
+            self.disconnects += 1
+            if self._down_since is None:
+                self._down_since = time.monotonic()
+            delay = self.backoff.next()
+            logger.info(f"[{self.name}] reconnecting in {delay:.2f}s (attempt {self.backoff.attempt})")
+            await asyncio.sleep(delay)
+
+    def mark_recovered(self):
+        """Called by the session once it is subscribed and every book has a fresh snapshot."""
+        self.backoff.reset()
+        if self._down_since is None:
+            return  # initial connect, nothing to recover from
+        elapsed = time.monotonic() - self._down_since
+        self._down_since = None
+        self.recoveries += 1
+        self.last_recovery_s = elapsed
+        self.max_recovery_s = max(self.max_recovery_s, elapsed)
+        self.total_downtime_s += elapsed
+        logger.info(f"[{self.name}] recovered in {elapsed:.3f}s")
+
+    def stop(self):
+        self._stopped = True
+
+    def stats(self) -> dict:
+        down = time.monotonic() - self._down_since if self._down_since is not None else 0.0
+        return {
+            "connects": self.connects,
+            "disconnects": self.disconnects,
+            "recoveries": self.recoveries,
+            "recovering": self._down_since is not None,
+            "last_recovery_s": self.last_recovery_s,
+            "max_recovery_s": self.max_recovery_s,
+            "downtime_s": self.total_downtime_s + down,
+        }
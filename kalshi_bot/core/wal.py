@@ -0,0 +1,127 @@
+# kalshi_bot/core/wal.py
+import mmap
+import os
+import struct
+from typing import Iterator, Tuple
+
+from kalshi_bot.util.logger import get_logger
+
+logger = get_logger('wal')
+
+_MAGIC = b"KWAL0001"
+# magic, depth, record size, capacity, head, tail — head/tail are the only fields rewritten
+_HEADER = struct.Struct("<8sIIQQQ")
+_HEAD_OFFSET = 24
+_TAIL_OFFSET = 32
+_HEADER_BYTES = 4096            # records start on their own page
+_U64 = struct.Struct("<Q")
+TICKER_BYTES = 64
+
+
+class WriteAheadLog:
+    """
+    Crash-safe ring of recorder rows in a memory-mapped file: fixed-size records, a
+    head (next sequence to write) and a tail (oldest sequence not yet in a finalized
+    parquet file) in the header. Appending is a `pack_into` on the mapping — no syscall
+    per record; the page cache carries the data through a process crash or container
+    restart, and `sync()` (msync) covers a host crash at the points it is called.
+
+    The ring never blocks: if the writer falls a whole `capacity` behind, the oldest
+    records are overwritten and counted in `overwritten`.
+
+    `row_format` is the struct format of one row's values (see
+    `ColumnBatch.RAW_FORMAT`); each record also stores its sequence and ticker, and
+    replay only yields slots whose stored sequence matches, so stale or torn slots are
+    skipped rather than misread.
+    """
+
+    def __init__(self, path: str, depth: int, row_format: str, capacity: int = 262_144):
+        self.path = path
+        self.depth = depth
+        self._record = struct.Struct(f"<Q{TICKER_BYTES}s{row_format.lstrip('<')}")
+        self.record_size = self._record.size
+        self.overwritten = 0
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        fresh = not os.path.exists(path) or os.path.getsize(path) < _HEADER_BYTES
+        if not fresh:
+            with open(path, "rb") as f:
+                magic, d, size, cap, head, tail = _HEADER.unpack(f.read(_HEADER.size))
+            if magic != _MAGIC or d != depth or size != self.record_size:
+                # A different layout can't be replayed into this schema — keep it aside, start over
+                logger.warning(f"WAL {path} has an incompatible layout; moved to {path}.old")
+                os.replace(path, f"{path}.old")
+                fresh = True
+            else:
+                capacity = cap      # the ring keeps the size it was created with
+
+        self.capacity = capacity
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        size = _HEADER_BYTES + capacity * self.record_size
+        if os.fstat(self._fd).st_size != size:
+            os.ftruncate(self._fd, size)
+        self._mm = mmap.mmap(self._fd, size)
+        if fresh:
+            _HEADER.pack_into(self._mm, 0, _MAGIC, depth, self.record_size, capacity, 0, 0)
+            self.head = self.tail = 0
+        else:
+            self.head, self.tail = head, tail
+
+    # ————————————————————————
+    # Hot path
+    # ————————————————————————
+    def append(self, ticker: str, values) -> int:
+        """Log one row; returns its sequence number."""
+        seq = self.head
+        self._record.pack_into(self._mm, _HEADER_BYTES + (seq % self.capacity) * self.record_size,
+                               seq, ticker.encode(), *values)
+        self.head = seq + 1
+        _U64.pack_into(self._mm, _HEAD_OFFSET, self.head)
+        if self.head - self.tail > self.capacity:
+            self.tail = self.head - self.capacity
+            self.overwritten += 1
+            _U64.pack_into(self._mm, _TAIL_OFFSET, self.tail)
+        return seq
+
+    # ————————————————————————
+    # Writer side
+    # ————————————————————————
+    def release(self, upto: int):
+        """Everything before sequence `upto` is durable elsewhere."""
+        if upto > self.tail:
+            self.tail = min(upto, self.head)
+            _U64.pack_into(self._mm, _TAIL_OFFSET, self.tail)
+
+    def pending(self) -> int:
+        return self.head - self.tail
+
+    def records(self) -> Iterator[Tuple[str, tuple]]:
+        """(ticker, row values) for every record between tail and head, oldest first."""
+        skipped = 0
+        for seq in range(max(self.tail, self.head - self.capacity), self.head):
+            rec = self._record.unpack_from(self._mm, _HEADER_BYTES + (seq % self.capacity) * self.record_size)
+            if rec[0] != seq:
+                skipped += 1
+                continue
+            yield rec[1].rstrip(b"\0").decode(), rec[2:]
+        if skipped:
+            logger.warning(f"WAL {self.path}: skipped {skipped} torn or stale records")
+
+    def sync(self):
+        """msync — make the ring durable against a host crash, not just a process crash."""
+        self._mm.flush()
+
+    def close(self):
+        if self._mm.closed:
+            return
+        self.sync()
+        self._mm.close()
+        os.close(self._fd)
+
+    def stats(self) -> dict:
+        return {
+            "head": self.head,
+            "pending": self.pending(),
+            "capacity": self.capacity,
+            "overwritten": self.overwritten,
+        }
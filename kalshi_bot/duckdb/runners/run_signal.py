@@ -1,8 +1,10 @@
 import argparse
 import duckdb
 import os
+from kalshi_bot.core.parquet_writer import PART_RE
 from kalshi_bot.util.logger import get_logger
-from datetime import date
+from datetime import date, timedelta
+from typing import List, Optional
 
 from pathlib import Path
 
@@ -20,52 +22,130 @@ def load_json(path: str) -> dict:
 
 ROOT_PATH = "~/signals_db/"
 def main():
-    parser = argparse.ArgumentParser(description="Example script using argparse")
+    parser = argparse.ArgumentParser(description="Run one signal over the recorder's new parquet files")
 
     parser.add_argument(
         "--config_path",          # argument name
         type=str,          # type of the argument
     )
+    parser.add_argument("--date", type=date.fromisoformat, default=None,
+                        help="only this UTC day (default: every day with parts past its watermark)")
 
     args = parser.parse_args()
     json_data = load_json(args.config_path)
     json_data['signal_query'] = os.path.join(SQL_DIR, json_data['signal_query'])
 
-    params = json_data['params']
+    params = list(json_data['params'].values())
     signal_query = json_data['signal_query']
-
-    run_date = date.today().isoformat()
-    pq_file = f"{run_date}.parquet"
-    logger.info(f"Running signals for: {run_date} ")
-    # TODO: FIx path
-    params['parquet_path'] = f"{params['parquet_path']}/*/{pq_file}"
-    params = list(params.values())
     signal_db = json_data['signal_db']
-
-    logger.info(f'Running signal: {signal_query} with params: {params}')
-    run_signal(signal_query=signal_query, params=params, signal_db_file=signal_db)
-
-
-def run_signal(signal_query, params, signal_db_file) -> None:
-
+    days = [args.date] if args.date else None
+
+    logger.info(f"Running signal: {signal_query} for {args.date or 'every pending day'} with params: {params}")
+    run_signal(signal_query=signal_query, params=params, signal_db_file=signal_db,
+               parquet_path=json_data['parquet_path'], days=days)
+
+
+def store_days(parquet_path: str) -> List[date]:
+    """The recorder's `date=` partitions — UTC days."""
+    root = Path(parquet_path).expanduser()
+    if not root.is_dir():
+        return []
+    return sorted(date.fromisoformat(d.name.split("=", 1)[1]) for d in root.iterdir()
+                  if d.is_dir() and d.name.startswith("date="))
+
+
+def new_parts(parquet_path: str, run_date: date, watermarks: dict) -> dict:
+    """
+    ticker → [(part, path), …] for the day's finalized part files past the ticker's
+    watermark. Hive layout from the recorder: date=<day>/ticker=<ticker>/<day>-0000.parquet, …
+    """
+    day_dir = Path(parquet_path).expanduser() / f"date={run_date.isoformat()}"
+    if not day_dir.is_dir():
+        return {}
+    found = {}
+    for ticker_dir in day_dir.iterdir():
+        if not ticker_dir.name.startswith("ticker="):
+            continue
+        ticker = ticker_dir.name.split("=", 1)[1]
+        last = watermarks.get((run_date, ticker), -1)
+        parts = []
+        for name in os.listdir(ticker_dir):
+            m = PART_RE.match(name)
+            if m and int(m.group("part")) > last:
+                parts.append((int(m.group("part")), str(ticker_dir / name)))
+        if parts:
+            found[(run_date, ticker)] = sorted(parts)
+    return found
+
+
+def run_signal(signal_query, params, signal_db_file, parquet_path, days: Optional[List[date]] = None) -> None:
+    """
+    Incremental: each (day, ticker)'s watermark is the last part file this signal read,
+    so a run reads only the part files finalized since — its cost follows the new data,
+    not the day. Rows are upserted on the signal table's key, so a run that is retried
+    after a failure rewrites the same rows instead of duplicating them.
+
+    Without `days`, every UTC day from the day before the latest watermarked one is
+    scanned: a day's last part is only finalized after midnight, and a runner that was
+    down catches up on every day it missed.
+    """
     db_path = Path(signal_db_file).expanduser().resolve()
     db_path.parent.mkdir(parents=True, exist_ok=True)
-    conn = duckdb.connect(db_path)
+    conn = duckdb.connect(str(db_path))
     sql_path = Path(signal_query).expanduser()
+    signal = sql_path.stem
 
-
-    # Create the table first
-    sql_path_create = f"{str(sql_path).split('.')[0]}_create.sql"
-    sql_path_create = Path(sql_path_create)
+    # Create the tables first
+    sql_path_create = Path(f"{str(sql_path).split('.')[0]}_create.sql")
     logger.info(f"Creating table: {sql_path_create}")
-    sql_path_create = sql_path_create.read_text()
-    conn.execute(sql_path_create)
+    conn.execute(sql_path_create.read_text())
+    conn.execute((SQL_DIR / "watermarks_create.sql").read_text())
+
+    watermarks = {(day, ticker): part for day, ticker, part in conn.execute(
+        "SELECT day, ticker, part FROM signal_watermarks WHERE signal = ?", [signal]).fetchall()}
+    if days is None:
+        latest_day = max((day for day, _ in watermarks), default=None)
+        days = [d for d in store_days(parquet_path) if latest_day is None or d >= latest_day - timedelta(days=1)]
+    parts = {}
+    for day in days:
+        parts.update(new_parts(parquet_path, day, watermarks))
+    files = [path for ticker_parts in parts.values() for _, path in ticker_parts]
+    if not files:
+        logger.info(f"No new part files for {signal} on {', '.join(map(str, days)) or 'any day'}")
+        conn.close()
+        return
+    logger.info(f"Reading {len(files)} new part file(s) for {len(parts)} ticker-day(s)")
 
     sql = sql_path.read_text()
-    logger.info("executing query")
-    conn.execute(sql, params)
+    conn.execute("BEGIN TRANSACTION")
+    try:
+        # The signal query reads `new_rows`: every column of the new files, plus date/ticker from the path
+        conn.execute("CREATE OR REPLACE TEMP TABLE new_rows AS "
+                     "SELECT * FROM read_parquet(?, hive_partitioning = true, union_by_name = true)", [files])
+        logger.info("executing query")
+        conn.execute(sql, params)
+
+        # Latest row by (ts, seq) — many rows share a millisecond
+        latest = {(day, ticker): (ts, seq) for day, ticker, ts, seq in conn.execute(
+            "SELECT DISTINCT ON (date, ticker) date, ticker, ts, seq FROM new_rows "
+            "ORDER BY date, ticker, ts DESC, seq DESC").fetchall()}
+        conn.executemany(
+            "INSERT INTO signal_watermarks VALUES (?, ?, ?, ?, ?, ?, now()::TIMESTAMP) "
+            "ON CONFLICT DO UPDATE SET part = excluded.part, "
+            # A late part (spill, WAL recovery) can hold older rows — the latest row never moves back
+            "seq = CASE WHEN excluded.ts >= ts OR ts IS NULL THEN excluded.seq ELSE seq END, "
+            "ts = greatest(excluded.ts, ts), updated_at = excluded.updated_at",
+            [[signal, day, ticker, ticker_parts[-1][0], *latest.get((day, ticker), (None, None))]
+             for (day, ticker), ticker_parts in parts.items()])
+        conn.execute("DROP TABLE new_rows")
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
     logger.info('Succesfull execution!')
 
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
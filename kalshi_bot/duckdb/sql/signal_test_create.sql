@@ -1,6 +1,9 @@
 CREATE TABLE IF NOT EXISTS imbalance (
     ticker VARCHAR,
     ts TIMESTAMP,
+    seq BIGINT,
     imbalance DOUBLE,
-    signal INTEGER
-)
\ No newline at end of file
+    signal INTEGER,
+    -- seq restarts with every subscription, so it is only unique together with ts
+    PRIMARY KEY (ticker, ts, seq)
+)
@@ -0,0 +1,10 @@
+CREATE TABLE IF NOT EXISTS signal_watermarks (
+    signal VARCHAR,
+    day DATE,
+    ticker VARCHAR,
+    part INTEGER,           -- highest part file read; the recorder finalizes parts in order
+    ts TIMESTAMP,           -- latest row read
+    seq BIGINT,
+    updated_at TIMESTAMP,
+    PRIMARY KEY (signal, day, ticker)
+)
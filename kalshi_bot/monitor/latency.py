@@ -0,0 +1,147 @@
+# kalshi_bot/monitor/latency.py
+import threading
+import time
+from datetime import datetime
+from typing import Dict, NamedTuple, Optional, Tuple
+
+# Pipeline stages every book message is timed through
+EXCHANGE_TO_RECEIVE = "exchange_to_receive"     # wall clock: exchange ts → socket read
+RECEIVE_TO_APPLY = "receive_to_apply"           # monotonic: socket read → book updated
+APPLY_TO_PERSIST = "apply_to_persist"           # monotonic: book updated → parquet write done
+RECEIVE_TO_PERSIST = "receive_to_persist"       # monotonic: end to end
+STAGES = (EXCHANGE_TO_RECEIVE, RECEIVE_TO_APPLY, APPLY_TO_PERSIST, RECEIVE_TO_PERSIST)
+
+ALL_TICKERS = "*"
+
+# Exact below 2**5 ns, then 2**4 sub-buckets per power of two → every bucket is within ~6% of its values
+_SUB_BITS = 5
+_SUB = 1 << _SUB_BITS
+_HALF = _SUB >> 1
+_N_BUCKETS = _SUB + 64 * _HALF
+
+
+class Trace(NamedTuple):
+    """Timestamps (ns) for one message. `exchange_ns`/`recv_wall_ns` are wall clock, the rest monotonic."""
+    exchange_ns: Optional[int]
+    recv_wall_ns: int
+    recv_ns: int
+    apply_ns: int
+
+    @property
+    def exchange_to_receive_us(self) -> Optional[int]:
+        if self.exchange_ns is None:
+            return None
+        return (self.recv_wall_ns - self.exchange_ns) // 1000
+
+    @property
+    def receive_to_apply_us(self) -> int:
+        return (self.apply_ns - self.recv_ns) // 1000
+
+
+class LatencyHistogram:
+    """
+    HDR-style log-linear histogram over non-negative integer nanoseconds: exact below
+    32 ns, then 16 buckets per power of two. Fixed memory, O(1) record.
+    """
+
+    def __init__(self):
+        self.counts = [0] * _N_BUCKETS
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    @staticmethod
+    def _index(v: int) -> int:
+        if v < _SUB:
+            return v
+        shift = v.bit_length() - _SUB_BITS
+        return _SUB + (shift - 1) * _HALF + ((v >> shift) - _HALF)
+
+    @staticmethod
+    def _upper(index: int) -> int:
+        if index < _SUB:
+            return index
+        shift, offset = divmod(index - _SUB, _HALF)
+        shift += 1
+        return ((offset + _HALF + 1) << shift) - 1
+
+    def record(self, value_ns: int):
+        if value_ns < 0:
+            value_ns = 0    # clock skew on wall-clock stages
+        self.counts[self._index(value_ns)] += 1
+        self.count += 1
+        self.total += value_ns
+        if value_ns > self.max:
+            self.max = value_ns
+
+    def percentile(self, p: float) -> int:
+        if not self.count:
+            return 0
+        target = max(1, int(self.count * p / 100.0 + 0.5))
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= target:
+                return min(self._upper(i), self.max)
+        return self.max
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_us": self.total / self.count / 1e3 if self.count else 0.0,
+            "p50_us": self.percentile(50) / 1e3,
+            "p99_us": self.percentile(99) / 1e3,
+            "p999_us": self.percentile(99.9) / 1e3,
+            "max_us": self.max / 1e3,
+        }
+
+
+def parse_exchange_ts(ts) -> Optional[int]:
+    """Exchange timestamp → wall-clock ns. Accepts ISO-8601 strings, epoch ms or epoch ns."""
+    if ts is None or ts == 0:
+        return None
+    if isinstance(ts, str):
+        try:
+            return int(datetime.fromisoformat(ts.replace("Z", "+00:00")).timestamp() * 1e9)
+        except ValueError:
+            return None
+    ts = int(ts)
+    return ts * 1_000_000 if ts < 10 ** 14 else ts
+
+
+class LatencyTracer:
+    """Per-stage, per-ticker latency histograms, plus an all-tickers rollup under "*"."""
+
+    def __init__(self):
+        self.hists: Dict[Tuple[str, str], LatencyHistogram] = {}
+        # Persist-stage records arrive from recorder writer threads
+        self._lock = threading.Lock()
+
+    def _hist(self, ticker: str, stage: str) -> LatencyHistogram:
+        h = self.hists.get((ticker, stage))
+        if h is None:
+            h = self.hists[(ticker, stage)] = LatencyHistogram()
+        return h
+
+    def _record(self, ticker: str, stage: str, value_ns: int):
+        self._hist(ticker, stage).record(value_ns)
+        self._hist(ALL_TICKERS, stage).record(value_ns)
+
+    def on_applied(self, ticker: str, trace: Trace):
+        """Event-loop side: receive and apply stages."""
+        if trace.exchange_ns is not None:
+            self._record(ticker, EXCHANGE_TO_RECEIVE, trace.recv_wall_ns - trace.exchange_ns)
+        self._record(ticker, RECEIVE_TO_APPLY, trace.apply_ns - trace.recv_ns)
+
+    def on_persisted(self, ticker: str, apply_ns, recv_ns):
+        """Writer-thread side: called once per written batch with its traced rows' apply/receive clocks."""
+        now = time.monotonic_ns()
+        with self._lock:
+            for applied, received in zip(apply_ns.tolist(), recv_ns.tolist()):
+                self._record(ticker, APPLY_TO_PERSIST, now - applied)
+                self._record(ticker, RECEIVE_TO_PERSIST, now - received)
+
+    def summary(self, ticker: str = ALL_TICKERS) -> Dict[str, dict]:
+        with self._lock:
+            return {stage: self.hists[(ticker, stage)].summary()
+                    for stage in STAGES if (ticker, stage) in self.hists}
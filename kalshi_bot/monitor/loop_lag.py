@@ -0,0 +1,86 @@
+# kalshi_bot/monitor/loop_lag.py
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from typing import Optional
+
+from kalshi_bot.monitor.latency import LatencyHistogram
+from kalshi_bot.util.logger import get_logger
+
+logger = get_logger('loop_lag')
+
+
+class LoopLagMonitor:
+    """
+    Measures event-loop scheduling delay and catches the code that causes it.
+
+    A sampler task sleeps `interval` seconds and records how late it wakes up. A watchdog
+    thread watches the sampler's heartbeat; when the loop has been stuck longer than
+    `stall_threshold` it grabs the loop thread's current stack, so blocking calls
+    (sync HTTP, PEM parsing, file I/O) show up with the line that made them.
+    """
+
+    def __init__(self, interval: float = 0.05, stall_threshold: float = 0.1):
+        self.interval = interval
+        self.stall_threshold = stall_threshold
+        self.lag = LatencyHistogram()
+
+        self.stalls = 0
+        self.worst_stall_s = 0.0
+        self.last_stall_stack: Optional[str] = None
+
+        self._beat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._reported_beat: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def start(self):
+        """Call from inside the running loop."""
+        self._loop_thread_id = threading.get_ident()
+        self._beat = time.monotonic()
+        self._task = asyncio.create_task(self._sample())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-lag-watchdog", daemon=True)
+        self._watchdog.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+
+    async def _sample(self):
+        while True:
+            start = time.monotonic()
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self.lag.record(int((now - start - self.interval) * 1e9))
+            self._beat = now
+
+    def _watch(self):
+        while not self._stop.wait(self.stall_threshold / 2):
+            beat = self._beat
+            stuck = time.monotonic() - beat - self.interval
+            if stuck < self.stall_threshold:
+                continue
+            if self._reported_beat == beat:
+                # Same stall still going — just track how bad it gets
+                self.worst_stall_s = max(self.worst_stall_s, stuck)
+                continue
+
+            self._reported_beat = beat
+            self.stalls += 1
+            self.worst_stall_s = max(self.worst_stall_s, stuck)
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame is not None else "<no frame>"
+            self.last_stall_stack = stack
+            logger.warning(f"Event loop blocked for {stuck * 1e3:.0f}ms+ in:\n{stack}")
+
+    def stats(self) -> dict:
+        return {
+            "lag": self.lag.summary(),
+            "stalls": self.stalls,
+            "worst_stall_ms": self.worst_stall_s * 1e3,
+        }
@@ -0,0 +1,272 @@
+# kalshi_bot/strategy/backtest.py
+"""
+Backtests and parameter sweeps. A recorded day is replayed once into a `.npy` of
+BOOK_EVENT_DTYPE events (the ring buffer's record format); every grid point then runs
+in a process pool whose workers memory-map that file — the day is parsed once and
+shared through the page cache, never reloaded per run. Each run drives a strategy
+against a PaperExchange and the results land in one Arrow table, ranked with DuckDB.
+
+    python -m kalshi_bot.strategy.backtest build --date 2025-12-04 --out day.npy
+    python -m kalshi_bot.strategy.backtest run --events day.npy --strategy sweep \\
+        --grid '{"trigger_bid": [0.94, 0.955, 0.97], "dip": [0.02, 0.029, 0.04]}'
+"""
+import asyncio
+import contextlib
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pyarrow as pa
+
+from kalshi_bot.core.data.array_order_book import ArrayOrderBook
+from kalshi_bot.core.data.features import N_LEVELS
+from kalshi_bot.core.replay import ReplayEngine
+from kalshi_bot.core.ring_buffer import BOOK_EVENT_DTYPE, EV_DELTA, EV_LEVEL, EV_SNAPSHOT, SIDE_BID, BookEventPublisher
+from kalshi_bot.strategy.paper import PaperExchange
+from kalshi_bot.strategy.scalper import ArbitrageScalper
+from kalshi_bot.strategy.sweep import Sweep
+from kalshi_bot.util.clock import Clock, SimClock
+from kalshi_bot.util.logger import get_logger
+
+logger = get_logger('backtest')
+
+# Events converted to Python lists at a time — bounds per-worker memory, the rest stays mapped
+CHUNK = 65_536
+
+
+# ————————————————————————
+# Building the event file
+# ————————————————————————
+class EventLog(BookEventPublisher):
+    """Collects book events in memory in place of a RingWriter (same `publish` calls)."""
+
+    def __init__(self, clock: Clock):
+        self.clock = clock
+        self._rows: List[tuple] = []
+        self._chunks: List[np.ndarray] = []
+        self._ticker_bytes: Dict[str, bytes] = {}
+        self.count = 0
+
+    def publish(self, kind: int, ticker: str, seq: int, side: int, price_cents: int, qty: int,
+                best_bid: int, best_ask: int, bid_volume: int, ask_volume: int, recv_ns: int = 0):
+        tb = self._ticker_bytes.get(ticker)
+        if tb is None:
+            tb = self._ticker_bytes[ticker] = ticker.encode("ascii")
+        self.count += 1
+        self._rows.append((self.count, recv_ns or self.clock.time_ns(), seq, qty, bid_volume, ask_volume,
+                           kind, side, price_cents, best_bid, best_ask, tb))
+        if len(self._rows) >= CHUNK:
+            self._chunks.append(np.array(self._rows, dtype=BOOK_EVENT_DTYPE))
+            self._rows = []
+
+    def to_array(self) -> np.ndarray:
+        if self._rows:
+            self._chunks.append(np.array(self._rows, dtype=BOOK_EVENT_DTYPE))
+            self._rows = []
+        return np.concatenate(self._chunks) if self._chunks else np.empty(0, dtype=BOOK_EVENT_DTYPE)
+
+
+def build_event_file(frames: Iterable[Tuple[int, bytes]], path: str) -> int:
+    """Replay frames through the client once and save every book event to `path` (.npy)."""
+    async def replay():
+        engine = ReplayEngine(frames)
+        engine.client.bus.subscribers.clear()       # books only — no strategies while building
+        log = engine.client.ring = EventLog(engine.clock)
+        stats = await engine.run()
+        logger.info(f"Replayed {stats['events']:,} frames at {stats['events_per_second']:,.0f}/s")
+        return log
+
+    events = asyncio.run(replay()).to_array()
+    np.save(path, events)
+    logger.info(f"Wrote {len(events):,} book events ({events.nbytes / 1e6:.1f} MB) to {path}")
+    return len(events)
+
+
+# ————————————————————————
+# Strategies under test: (params, exchange, clock) → book callback
+# ————————————————————————
+def _sweep(params: dict, exchange: PaperExchange, clock: Clock) -> Callable:
+    return Sweep(ws=exchange, **params).on_orderbook_update
+
+
+def _scalper(params: dict, exchange: PaperExchange, clock: Clock) -> Callable:
+    scalper = ArbitrageScalper(clock=clock, **params)
+    exchange.fill_listeners.append(lambda fill: scalper.on_fill(exchange, fill))
+    return lambda book: scalper.on_orderbook_update(exchange, book)
+
+
+STRATEGIES = {
+    "sweep": _sweep,
+    "scalper": _scalper,
+}
+
+
+def param_grid(grid: Dict[str, list]) -> List[dict]:
+    """{"a": [1, 2], "b": [3]} → [{"a": 1, "b": 3}, {"a": 2, "b": 3}]"""
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[n] for n in names))]
+
+
+# ————————————————————————
+# One run
+# ————————————————————————
+async def backtest(events: np.ndarray, strategy: str, params: dict, latency: float = 0.05,
+                   taker_fee: float = 0.07, maker_fee: float = 0.0) -> dict:
+    """
+    Rebuild the books from `events` and drive one strategy against a PaperExchange.
+    Strategies see a book after each delta and after the last level of a snapshot,
+    with the SimClock at the event's receive time.
+    """
+    clock = SimClock()
+    exchange = PaperExchange(clock, latency=latency, taker_fee=taker_fee, maker_fee=maker_fee)
+    books = exchange.books
+    callback = STRATEGIES[strategy](params, exchange, clock)
+    names: Dict[bytes, str] = {}
+    started = time.perf_counter()
+
+    n = len(events)
+    for start in range(0, n, CHUNK):
+        # One extra record: whether a snapshot level is the last of its snapshot
+        chunk = events[start:start + CHUNK + 1]
+        kind, ticker_b, seq = chunk["kind"], chunk["ticker"], chunk["seq"]
+        more_levels = (kind[1:] == EV_LEVEL) & (kind[:-1] != EV_DELTA) \
+            & (ticker_b[1:] == ticker_b[:-1]) & (seq[1:] == seq[:-1])
+        end = min(CHUNK, n - start)
+        deliver = np.ones(end, dtype=bool)
+        deliver[:len(more_levels)] = ~more_levels[:end]
+
+        kinds, sides, prices, qtys = (chunk[c][:end].tolist() for c in ("kind", "side", "price_cents", "qty"))
+        seqs, recv = seq[:end].tolist(), chunk["recv_ns"][:end].tolist()
+        tickers, deliver = ticker_b[:end].tolist(), deliver.tolist()
+        for i in range(end):
+            ticker = names.get(tickers[i])
+            if ticker is None:
+                ticker = names[tickers[i]] = tickers[i].decode("ascii")
+            book = books.get(ticker)
+            if book is None:
+                book = books[ticker] = ArrayOrderBook(ticker)
+            if kinds[i] == EV_SNAPSHOT:
+                book.apply_snapshot({}, seqs[i])
+            elif sides[i] == SIDE_BID:
+                book.apply_delta({"price": prices[i], "delta": qtys[i], "side": "yes"}, seqs[i])
+            else:
+                book.apply_delta({"price": N_LEVELS - prices[i], "delta": qtys[i], "side": "no"}, seqs[i])
+            if not deliver[i]:
+                continue
+            timers = clock.pending_timers()
+            clock.advance(recv[i])
+            if clock.pending_timers() != timers:
+                await asyncio.sleep(0)      # strategy timers that just came due
+            await exchange.on_book(book)
+            await callback(book)
+
+    return {"strategy": strategy, **params, **exchange.stats(), "events": n,
+            "seconds": time.perf_counter() - started}
+
+
+# ————————————————————————
+# Process pool: each worker maps the event file once
+# ————————————————————————
+_events: Optional[np.ndarray] = None
+
+
+def _init_worker(path: str):
+    global _events
+    _events = np.load(path, mmap_mode="r")
+
+
+def _run_job(job: tuple) -> dict:
+    strategy, params, kwargs = job
+    # Strategies print every signal — keep a sweep's workers quiet
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        return asyncio.run(backtest(_events, strategy, params, **kwargs))
+
+
+def run_grid(events_path: str, strategy: str, grid: Dict[str, list], workers: Optional[int] = None,
+             **kwargs) -> pa.Table:
+    """Every grid point on `workers` processes (1 = in this process); one row per run."""
+    jobs = [(strategy, params, kwargs) for params in param_grid(grid)]
+    logger.info(f"{len(jobs)} {strategy} runs on {workers or os.cpu_count()} workers")
+    if workers == 1:
+        _init_worker(events_path)
+        rows = [_run_job(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(events_path,)) as pool:
+            rows = list(pool.map(_run_job, jobs))
+    return pa.Table.from_pylist(rows)
+
+
+def rank(results: pa.Table, by: str = "pnl", limit: int = 10, db_path: Optional[str] = None) -> pa.Table:
+    """Top runs by `by`; with `db_path`, also keep the whole sweep as the `backtest` table there."""
+    import duckdb
+
+    con = duckdb.connect(db_path or ":memory:")
+    con.register("results", results)
+    if db_path:
+        con.execute("CREATE OR REPLACE TABLE backtest AS SELECT * FROM results")
+    top = con.execute(f'SELECT * FROM results ORDER BY "{by}" DESC LIMIT {int(limit)}').fetch_arrow_table()
+    con.close()
+    return top
+
+
+def main():
+    import argparse
+    from datetime import date
+
+    import pyarrow.parquet as pq
+
+    from kalshi_bot.core.replay import capture_frames, parquet_frames
+
+    parser = argparse.ArgumentParser(description="Strategy backtests and parameter sweeps")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="replay a recorded day into a book event file")
+    build.add_argument("--source", choices=("parquet", "capture"), default="parquet")
+    build.add_argument("--path", type=str, default=None, help="parquet store or capture directory")
+    build.add_argument("--date", type=date.fromisoformat, default=None, help="parquet: day to replay")
+    build.add_argument("--tickers", nargs="+", default=None, help="parquet: only these markets")
+    build.add_argument("--out", type=str, required=True, help="event file to write (.npy)")
+
+    sweep = commands.add_parser("run", help="run a parameter grid over an event file")
+    sweep.add_argument("--events", type=str, required=True, help="event file from `build`")
+    sweep.add_argument("--strategy", choices=sorted(STRATEGIES), default="sweep")
+    sweep.add_argument("--grid", type=str, default="{}",
+                       help='JSON object of parameter → list of values, or a path to one')
+    sweep.add_argument("--workers", type=int, default=None, help="processes (default: one per CPU)")
+    sweep.add_argument("--latency", type=float, default=0.05, help="order latency in seconds")
+    sweep.add_argument("--taker-fee", type=float, default=0.07)
+    sweep.add_argument("--maker-fee", type=float, default=0.0)
+    sweep.add_argument("--out", type=str, default=None, help="write all results to this parquet file")
+    sweep.add_argument("--db", type=str, default=None, help="also store them as table `backtest` in this DuckDB")
+    sweep.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        if args.source == "parquet":
+            if args.date is None:
+                parser.error("--date is required with --source parquet")
+            frames = parquet_frames(args.path or "kalshi_deltas", args.date, args.tickers)
+        else:
+            frames = capture_frames(args.path or "captures")
+        build_event_file(frames, args.out)
+        return
+
+    grid = args.grid
+    if os.path.exists(grid):
+        with open(grid) as f:
+            grid = f.read()
+    started = time.perf_counter()
+    results = run_grid(args.events, args.strategy, json.loads(grid), workers=args.workers,
+                       latency=args.latency, taker_fee=args.taker_fee, maker_fee=args.maker_fee)
+    print(f"🧪 {results.num_rows} runs in {time.perf_counter() - started:.1f}s")
+    if args.out:
+        pq.write_table(results, args.out)
+    print(rank(results, limit=args.top, db_path=args.db).to_pandas().to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
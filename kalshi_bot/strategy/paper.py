@@ -0,0 +1,173 @@
+# kalshi_bot/strategy/paper.py
+import json
+import math
+from typing import Callable, Dict, List, Optional
+
+from kalshi_bot.core.data.features import N_LEVELS
+from kalshi_bot.util.clock import Clock
+
+
+class _Order:
+    __slots__ = ("ticker", "side", "limit", "remaining", "active_ns", "resting")
+
+    def __init__(self, ticker: str, side: int, limit: Optional[int], size: int, active_ns: int):
+        self.ticker = ticker
+        self.side = side            # +1 buy YES, -1 sell YES
+        self.limit = limit          # YES cents; None = market
+        self.remaining = size
+        self.active_ns = active_ns
+        self.resting = False        # past its marketable (taker) pass
+
+
+class PaperExchange:
+    """
+    Simulated exchange for backtests. Strategies `send()` it the same JSON they would
+    send the socket (create_order / cancel_all); it fills them against the replayed
+    books (`books`, ArrayOrderBook by ticker) and keeps cash, positions and fees.
+
+    Fill model — books only, there are no trade prints:
+      * an order reaches the book `latency` seconds after it is sent;
+      * its marketable part takes liquidity level by level at the book's prices, up to
+        its limit, paying the taker fee; what is left of a market order is cancelled;
+      * the rest sits at its limit and fills, as maker, when the opposite touch reaches
+        it — at most the size shown there per book update.
+    Our fills don't move the book, so repeated takes of an unchanged level are optimistic.
+    Fees follow Kalshi's schedule: ceil(rate × contracts × P × (1 − P)) to the cent.
+    """
+
+    def __init__(self, clock: Clock, latency: float = 0.05, taker_fee: float = 0.07, maker_fee: float = 0.0):
+        self.clock = clock
+        self.latency_ns = int(latency * 1e9)
+        self.taker_fee = taker_fee
+        self.maker_fee = maker_fee
+        self.books: Dict[str, object] = {}
+        self.open_orders: Dict[str, List[_Order]] = {}
+        # Called with each fill, in the exchange's fill message shape
+        self.fill_listeners: List[Callable] = []
+
+        self.cash = 0.0
+        self.positions: Dict[str, int] = {}     # net YES contracts
+        self.fees = 0.0
+        self.fills = 0
+        self.volume = 0
+        self.orders = 0
+        self.cancels = 0
+        self.rejected = 0
+        self.max_inventory = 0
+
+    # ————————————————————————
+    # Strategy side — same interface as the socket
+    # ————————————————————————
+    async def send(self, message: str):
+        msg = json.loads(message)
+        cmd, params = msg.get("cmd"), msg.get("params", {})
+        if cmd == "create_order":
+            self._create(params)
+        elif cmd == "cancel_all":
+            ticker = params.get("ticker")
+            for t in ([ticker] if ticker else list(self.open_orders)):
+                self.cancels += len(self.open_orders.pop(t, ()))
+        else:
+            self.rejected += 1
+
+    def _create(self, params: dict):
+        ticker, size = params.get("ticker"), int(params.get("size", 0))
+        if ticker not in self.books or size <= 0 or params.get("side") not in ("buy", "sell"):
+            self.rejected += 1
+            return
+        side = 1 if params["side"] == "buy" else -1
+        limit = None
+        if params.get("type") != "market":
+            # Dollars → the nearest tick the order can trade at without crossing its limit
+            price = float(params["price"]) * 100
+            limit = math.floor(price + 1e-9) if side > 0 else math.ceil(price - 1e-9)
+            limit = min(max(limit, 0), N_LEVELS)
+        self.open_orders.setdefault(ticker, []).append(
+            _Order(ticker, side, limit, size, self.clock.time_ns() + self.latency_ns))
+        self.orders += 1
+
+    # ————————————————————————
+    # Matching — after every book update
+    # ————————————————————————
+    async def on_book(self, book):
+        orders = self.open_orders.get(book.ticker)
+        if not orders:
+            return
+        now = self.clock.time_ns()
+        for order in list(orders):
+            if order.active_ns > now:
+                continue
+            if not order.resting:
+                await self._take(order, book)
+                order.resting = True
+                if order.limit is None:
+                    order.remaining = 0     # market: unfilled remainder is cancelled
+            else:
+                await self._rest(order, book)
+            if order.remaining == 0:
+                orders.remove(order)
+        if not orders:
+            self.open_orders.pop(book.ticker, None)
+
+    async def _take(self, order: _Order, book):
+        if order.side > 0:
+            levels, c, step = book.ask_levels, book.best_ask_cents(), 1
+            crosses = lambda c: c < N_LEVELS and (order.limit is None or c <= order.limit)
+        else:
+            levels, c, step = book.bid_levels, book.best_bid_cents(), -1
+            crosses = lambda c: c > 0 and (order.limit is None or c >= order.limit)
+        while order.remaining and crosses(c):
+            if levels[c]:
+                await self._fill(order, c, min(order.remaining, levels[c]), self.taker_fee)
+            c += step
+
+    async def _rest(self, order: _Order, book):
+        if order.side > 0:
+            c = book.best_ask_cents()
+            if c < N_LEVELS and c <= order.limit:
+                await self._fill(order, order.limit, min(order.remaining, book.ask_levels[c]), self.maker_fee)
+        else:
+            c = book.best_bid_cents()
+            if c > 0 and c >= order.limit:
+                await self._fill(order, order.limit, min(order.remaining, book.bid_levels[c]), self.maker_fee)
+
+    async def _fill(self, order: _Order, cents: int, qty: int, fee_rate: float):
+        price = cents / 100.0
+        fee = math.ceil(fee_rate * qty * price * (1 - price) * 100 - 1e-9) / 100 if fee_rate else 0.0
+        order.remaining -= qty
+        self.cash -= order.side * qty * price + fee
+        self.fees += fee
+        self.fills += 1
+        self.volume += qty
+        pos = self.positions[order.ticker] = self.positions.get(order.ticker, 0) + order.side * qty
+        self.max_inventory = max(self.max_inventory, abs(pos))
+        fill = {"type": "fill", "msg": {"fill": {
+            "ticker": order.ticker, "side": "buy" if order.side > 0 else "sell", "price": cents, "size": qty}}}
+        for listener in self.fill_listeners:
+            await listener(fill)
+
+    # ————————————————————————
+    # Results
+    # ————————————————————————
+    def mark_to_market(self) -> float:
+        """Cash plus open positions at each book's mid."""
+        value = self.cash
+        for ticker, pos in self.positions.items():
+            if pos:
+                value += pos * self.books[ticker].mid()
+        return value
+
+    def stats(self) -> dict:
+        return {
+            "pnl": self.mark_to_market(),
+            "cash": self.cash,
+            "fees": self.fees,
+            "fills": self.fills,
+            "volume": self.volume,
+            "orders": self.orders,
+            "cancels": self.cancels,
+            "rejected": self.rejected,
+            "max_inventory": self.max_inventory,
+            "open_inventory": sum(abs(p) for p in self.positions.values()),
+            "open_orders": sum(len(o) for o in self.open_orders.values()),
+        }
@@ -0,0 +1,91 @@
+# kalshi_bot/strategy/runner.py
+"""
+Strategy process: mirrors books from the ingest process's shared-memory ring and drives
+strategies off them, so strategy CPU never competes with the feed handler's GIL.
+
+    python -m kalshi_bot.strategy.runner --ring kalshi_books
+"""
+import argparse
+import asyncio
+import time
+from typing import Dict, List
+
+from kalshi_bot.core.data.array_order_book import ArrayOrderBook
+from kalshi_bot.core.ring_buffer import RingReader, EV_SNAPSHOT, event_to_update
+from kalshi_bot.strategy.sweep import Sweep
+from kalshi_bot.util.logger import get_logger
+
+logger = get_logger('strategy_runner')
+
+# Re-ask for a republish this often while some book still has no snapshot (requests can be lost)
+RESYNC_RETRY = 1.0
+
+
+async def run_strategies(ring_name: str, strategies: List, poll_interval: float = 0.001):
+    reader = RingReader(ring_name)      # attaching asks the producer to republish every book
+    books: Dict[str, ArrayOrderBook] = {}
+    # Tickers whose book was rebuilt from a snapshot since we attached or were last lapped
+    valid: set[str] = set()
+    waiting: set[str] = set()           # seen deltas for, but no snapshot yet
+    requested = time.monotonic()
+    logger.info(f"Attached to ring {ring_name} at cursor {reader.cursor}")
+
+    while True:
+        if waiting and time.monotonic() - requested >= RESYNC_RETRY:
+            reader.request_resync()
+            requested = time.monotonic()
+        overruns = reader.overruns
+        views = reader.poll()
+        if not views:
+            await asyncio.sleep(poll_interval)
+            continue
+
+        # Everything in one poll is applied first — strategies see each touched book once
+        touched: Dict[str, ArrayOrderBook] = {}
+        for view in views:
+            for rec in view:
+                ticker = rec["ticker"].decode("ascii")
+                seq = int(rec["seq"])
+                if rec["kind"] == EV_SNAPSHOT:
+                    book = books.get(ticker)
+                    if book is None:
+                        book = books[ticker] = ArrayOrderBook(ticker)
+                    book.apply_snapshot({}, seq)
+                    valid.add(ticker)
+                    waiting.discard(ticker)
+                elif ticker in valid:
+                    book = books[ticker]
+                    book.apply_delta(event_to_update(rec), seq)
+                else:
+                    # No snapshot yet: applying deltas to an empty book would trade on a wrong one
+                    waiting.add(ticker)
+                    continue
+                touched[ticker] = book
+
+        reader.release()
+        if reader.overruns != overruns:
+            # Events were skipped or torn — no book can be trusted until its snapshot is republished
+            logger.warning(f"Ring overrun: {reader.overruns - overruns} event(s) lost "
+                           f"(total {reader.overruns}) — books invalid until republished")
+            waiting |= valid
+            valid.clear()
+            reader.request_resync()
+            requested = time.monotonic()
+            continue
+
+        for ticker, book in touched.items():
+            if ticker not in valid:
+                continue
+            for strategy in strategies:
+                await strategy.on_orderbook_update(book)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run strategies off the ingest ring buffer")
+    parser.add_argument("--ring", type=str, default="kalshi_books", help="shared-memory ring name")
+    args = parser.parse_args()
+    asyncio.run(run_strategies(args.ring, [Sweep()]))
+
+
+if __name__ == "__main__":
+    main()
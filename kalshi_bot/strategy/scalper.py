@@ -1,21 +1,38 @@
 # strategy/arbitrage_scalper.py
 import asyncio
-import time
-from typing import Dict, Callable
-from data.order_book import OrderBook
+import json
+from typing import Dict, Callable, Sequence, Tuple
+from kalshi_bot.core.data.order_book import OrderBook
+from kalshi_bot.util.clock import SYSTEM_CLOCK, Clock
+
+# (spread above, value) steps, widest first — the first match wins
+SIZE_LADDER = ((0.08, 800), (0.05, 400))
+OFFSET_LADDER = ((0.07, 0.022), (0.04, 0.013))
 
 class ArbitrageScalper:
-    def __init__(self):
+    def __init__(self, clock: Clock = SYSTEM_CLOCK, base_size: int = 200,
+                 size_ladder: Sequence[Tuple[float, int]] = SIZE_LADDER, base_offset: float = 0.006,
+                 offset_ladder: Sequence[Tuple[float, float]] = OFFSET_LADDER, requote_interval: float = 0.22,
+                 max_inventory: int = 8000, hedge_edge: float = 1.009, hedge_after: float = 7.0,
+                 match: str = "-YES"):
+        self.clock = clock
+        self.base_size = base_size
+        self.size_ladder = size_ladder
+        self.base_offset = base_offset
+        self.offset_ladder = offset_ladder
+        self.requote_interval = requote_interval
+        self.max_inventory = max_inventory
+        self.hedge_edge = hedge_edge
+        self.hedge_after = hedge_after
+        # Only quote tickers containing this ("" quotes everything)
+        self.match = match.upper()
         self.positions: Dict[str, int] = {}  # ticker → net YES contracts
         self.last_quote: Dict[str, float] = {}
         self.active_hedges: set = set()
 
     def microprice(self, ob: OrderBook) -> float:
-        top = ob.top_n(1)
-        bid, bid_sz = (top["bids"][0] if top["bids"] else (ob.best_bid(), 0))
-        ask, ask_sz = (top["asks"][0] if top["asks"] else (ob.best_ask(), 0))
-        total = bid_sz + ask_sz
-        return (bid * ask_sz + ask * bid_sz) / total if total > 0 else ob.mid()
+        # Maintained incrementally by the book's FeatureEngine — no per-update top_n(1)
+        return ob.features.microprice()
 
     async def send_order(self, ws, msg: dict):
         await ws.send(json.dumps(msg))
@@ -57,13 +74,13 @@ class ArbitrageScalper:
         # INSTANT ARBITRAGE HEDGE (the real money printer)
         if size >= 100 and "-YES" in ticker.upper():
             no_ticker = self.get_no_ticker(ticker)
-            hedge_price = round(1.009 - price, 3)
+            hedge_price = round(self.hedge_edge - price, 3)
             print(f"INSTANT HEDGE → SELL {size} {no_ticker} @ {hedge_price:.3f}")
             await self.place_limit(ws, no_ticker, "sell", hedge_price, size)
 
-            # Emergency unwind after 7s if still exposed
+            # Emergency unwind after 7s (hedge_after) if still exposed
             async def emergency():
-                await asyncio.sleep(7)
+                await self.clock.sleep(self.hedge_after)
                 if self.positions.get(ticker, 0) != 0:
                     print(f"EMERGENCY FLATTEN {ticker}")
                     await self.place_limit(ws, ticker, "sell" if side == "buy" else "buy", 0, size)  # market order
@@ -71,11 +88,11 @@ class ArbitrageScalper:
 
     async def on_orderbook_update(self, ws, ob: OrderBook):
         ticker = ob.ticker
-        if "-YES" not in ticker.upper():
+        if self.match not in ticker.upper():
             return
 
-        now = time.time()
-        if ticker in self.last_quote and now - self.last_quote[ticker] < 0.22:
+        now = self.clock.time()
+        if ticker in self.last_quote and now - self.last_quote[ticker] < self.requote_interval:
             return
         self.last_quote[ticker] = now
 
@@ -84,17 +101,17 @@ class ArbitrageScalper:
         spread = ask - bid
         micro = self.microprice(ob)
 
-        size = 200
-        if spread > 0.08:
-            size = 800
-        elif spread > 0.05:
-            size = 400
+        size = self.base_size
+        for above, step in self.size_ladder:
+            if spread > above:
+                size = step
+                break
 
-        offset = 0.006
-        if spread > 0.07:
-            offset = 0.022
-        elif spread > 0.04:
-            offset = 0.013
+        offset = self.base_offset
+        for above, step in self.offset_ladder:
+            if spread > above:
+                offset = step
+                break
 
         target_bid = round(micro - offset, 3)
         target_ask = round(micro + offset, 3)
@@ -103,7 +120,7 @@ class ArbitrageScalper:
         target_ask = max(target_ask, ask)
 
         net = self.positions.get(ticker, 0)
-        if abs(net) + size * 2 > 8000:
+        if abs(net) + size * 2 > self.max_inventory:
             return
 
         await self.cancel_all(ws, ticker)
@@ -3,12 +3,19 @@ import json
 from kalshi_bot.core.data.order_book import OrderBook
 
 class Sweep:
-    def __init__(self):
+    def __init__(self, trigger_bid: float = 0.955, dip: float = 0.029, floor_bid: float = 0.93,
+                 buy_size: int = 800, max_position: int = 6000, ws=None):
         self.positions = {}
         self.last_ask = {}
         self.last_bid = {}
-        self.buy_size = 800
-        self.max_position = 6000
+        # Thresholds (YES dollars) — swept by strategy/backtest.py
+        self.trigger_bid = trigger_bid
+        self.dip = dip
+        self.floor_bid = floor_bid
+        self.buy_size = buy_size
+        self.max_position = max_position
+        # Where orders go; None only prints them (live orders are still disabled)
+        self.ws = ws
 
     async def on_orderbook_update(self, ob: OrderBook):
         ticker = ob.ticker
@@ -17,23 +24,20 @@ class Sweep:
 
         prev_bid = self.last_bid.get(ticker, bid)
 
-        # Only trigger when YES is near-certain (>95.5%)
-        if bid < 0.955:
+        # Only trigger when YES is near-certain (>95.5% by default)
+        if bid < self.trigger_bid:
             self.last_bid[ticker] = bid
             return
 
         # Detect panic sell: YES bid/ask crashes 3+ cents
-        if ask < prev_bid - 0.029 or bid < 0.93:
+        if ask < prev_bid - self.dip or bid < self.floor_bid:
             print(f"PANIC DIP {ticker} | YES {bid:.3f} → Ask {ask:.3f}")
-            #await ws.send(json.dumps({
-            #    "cmd": "create_order",
-            #    "params": {
-            #        "ticker": ticker,
-            #        "side": "buy",
-            #        "type": "market",
-            #        "size": self.buy_size
-            #    }
-            #}))
             print(f"MARKET BUY {self.buy_size} YES @ ~{ask:.3f}")
+            if self.ws is not None and self.positions.get(ticker, 0) + self.buy_size <= self.max_position:
+                await self.ws.send(json.dumps({
+                    "cmd": "create_order",
+                    "params": {"ticker": ticker, "side": "buy", "type": "market", "size": self.buy_size},
+                }))
+                self.positions[ticker] = self.positions.get(ticker, 0) + self.buy_size
 
         self.last_bid[ticker] = bid
\ No newline at end of file
@@ -0,0 +1,71 @@
+# kalshi_bot/util/clock.py
+import asyncio
+import heapq
+import itertools
+import time
+from typing import List, Tuple
+
+
+class Clock:
+    """
+    Where the bot reads the time. Live code uses SYSTEM_CLOCK; replay hands in a
+    SimClock so every timestamp, throttle and timer follows the recorded stream.
+    """
+
+    def time_ns(self) -> int:
+        return time.time_ns()
+
+    def monotonic_ns(self) -> int:
+        return time.monotonic_ns()
+
+    def time(self) -> float:
+        return self.time_ns() / 1e9
+
+    def monotonic(self) -> float:
+        return self.monotonic_ns() / 1e9
+
+    async def sleep(self, seconds: float):
+        await asyncio.sleep(seconds)
+
+
+SYSTEM_CLOCK = Clock()
+
+
+class SimClock(Clock):
+    """
+    Simulated time: both clocks read `now_ns`, which only moves when the replay calls
+    `advance()`. `sleep()` waits on simulated time, so a 7 s timer fires 7 s of
+    recorded stream later, however fast the replay runs.
+    """
+
+    def __init__(self, start_ns: int = 0):
+        self.now_ns = start_ns
+        self._timers: List[Tuple[int, int, asyncio.Future]] = []
+        self._counter = itertools.count()
+
+    def time_ns(self) -> int:
+        return self.now_ns
+
+    def monotonic_ns(self) -> int:
+        return self.now_ns
+
+    def advance(self, now_ns: int):
+        """Move to `now_ns` (never backwards) and wake every sleeper now due."""
+        if now_ns > self.now_ns:
+            self.now_ns = now_ns
+        timers = self._timers
+        while timers and timers[0][0] <= self.now_ns:
+            _, _, fut = heapq.heappop(timers)
+            if not fut.done():
+                fut.set_result(None)
+
+    async def sleep(self, seconds: float):
+        if seconds <= 0:
+            await asyncio.sleep(0)
+            return
+        fut = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._timers, (self.now_ns + int(seconds * 1e9), next(self._counter), fut))
+        await fut
+
+    def pending_timers(self) -> int:
+        return len(self._timers)
@@ -0,0 +1,28 @@
+# kalshi_bot/util/runtime.py
+import asyncio
+from typing import Coroutine
+
+from kalshi_bot.util.logger import get_logger
+
+logger = get_logger('runtime')
+
+# Optional faster event loop
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+LOOPS = ("asyncio", "uvloop")
+
+
+def run(main: Coroutine, loop: str = "asyncio"):
+    """asyncio.run(main) on the selected event loop implementation."""
+    if loop == "uvloop":
+        if uvloop is None:
+            logger.warning("uvloop is not installed — falling back to asyncio")
+        else:
+            logger.info("Running on uvloop")
+            if hasattr(uvloop, "run"):
+                return uvloop.run(main)
+            uvloop.install()
+    return asyncio.run(main)
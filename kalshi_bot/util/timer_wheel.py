@@ -0,0 +1,77 @@
+# kalshi_bot/util/timer_wheel.py
+import asyncio
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+
+class TimerWheel:
+    """
+    Hashed timer wheel: `slots` buckets of `tick` seconds each, keyed timers.
+
+    schedule / cancel are O(1) and every tick only looks at one bucket, so thousands
+    of market close times cost nothing between deadlines. Deadlines further out than
+    one revolution simply stay in their bucket until their tick comes round. Times
+    are wall-clock epoch seconds (market close times are wall-clock).
+    """
+
+    def __init__(self, tick: float = 1.0, slots: int = 512, clock: Callable[[], float] = time.time):
+        self.tick = tick
+        self.slots = slots
+        self.clock = clock
+        self.buckets: List[Set[Hashable]] = [set() for _ in range(slots)]
+        self.timers: Dict[Hashable, Tuple[int, Callable[[], Any]]] = {}    # key → (deadline tick, callback)
+        self._pos = self._tick_of(clock())
+        self.fired = 0
+
+    def __len__(self) -> int:
+        return len(self.timers)
+
+    def _tick_of(self, when: float) -> int:
+        return int(when // self.tick)
+
+    def schedule(self, key: Hashable, when: float, callback: Callable[[], Any]):
+        """Run `callback` at `when` (epoch seconds). Re-scheduling a key replaces its timer."""
+        self.cancel(key)
+        deadline = max(self._tick_of(when), self._pos + 1)
+        self.timers[key] = (deadline, callback)
+        self.buckets[deadline % self.slots].add(key)
+
+    def cancel(self, key: Hashable) -> bool:
+        entry = self.timers.pop(key, None)
+        if entry is None:
+            return False
+        self.buckets[entry[0] % self.slots].discard(key)
+        return True
+
+    def advance(self, now: Optional[float] = None) -> int:
+        """Fire every timer due by `now`. Returns how many fired."""
+        target = self._tick_of(self.clock() if now is None else now)
+        if target <= self._pos:
+            return 0
+        # After a long pause visit each bucket once instead of every missed tick
+        ticks = range(self._pos + 1, target + 1) if target - self._pos <= self.slots \
+            else range(target - self.slots + 1, target + 1)
+        self._pos = target
+
+        fired = 0
+        for t in ticks:
+            bucket = self.buckets[t % self.slots]
+            if not bucket:
+                continue
+            for key in list(bucket):
+                deadline, callback = self.timers[key]
+                if deadline > target:
+                    continue    # a later revolution
+                bucket.discard(key)
+                del self.timers[key]
+                fired += 1
+                result = callback()
+                if asyncio.iscoroutine(result):
+                    asyncio.ensure_future(result)
+        self.fired += fired
+        return fired
+
+    async def run(self):
+        while True:
+            self.advance()
+            await asyncio.sleep(self.tick)
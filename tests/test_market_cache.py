@@ -0,0 +1,49 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+
+from kalshi_bot.bench.bench_market_parse import synthetic_raws
+from kalshi_bot.core.market_cache import MarketCache
+
+
+def raw_market(ticker: str, close_in: float = 3600.0) -> dict:
+    raw = synthetic_raws(1)[0]
+    close = datetime.now(timezone.utc) + timedelta(seconds=close_in)
+    raw.update(ticker=ticker, close_time=close.isoformat().replace("+00:00", "Z"))
+    return raw
+
+
+def test_failed_refetch_keeps_serving_the_series(tmp_path, monkeypatch):
+    cache = MarketCache(series=["S"], path=str(tmp_path / "markets.parquet"), ttl=60.0)
+
+    async def ok(series):
+        return [raw_market("A"), raw_market("B")]
+    monkeypatch.setattr(cache, "_fetch_series", ok)
+    asyncio.run(cache.fetch_open())
+    before = sorted(m.ticker for m in cache.open_markets())
+    assert before == ["A", "B"]
+
+    async def failing(series):
+        raise ConnectionError("boom")
+    monkeypatch.setattr(cache, "_fetch_series", failing)
+    # Past the TTL: the series is stale and every entry has lapsed
+    later = time.time() + 61.0
+    monkeypatch.setattr(time, "time", lambda: later)
+    assert cache.stale_series() == ["S"]
+
+    assert sorted(m.ticker for m in asyncio.run(cache.fetch_open())) == before
+    assert sorted(m.ticker for m in cache.open_markets()) == before
+    assert cache.stale_series() == ["S"]     # retried on the next poll
+
+
+def test_market_without_close_time_does_not_fail_the_refresh(tmp_path, monkeypatch):
+    cache = MarketCache(series=["S"], path=str(tmp_path / "markets.parquet"), ttl=60.0)
+    no_close = raw_market("NOCLOSE")
+    no_close["close_time"] = None
+
+    async def fetch(series):
+        return [raw_market("A"), no_close]
+    monkeypatch.setattr(cache, "_fetch_series", fetch)
+
+    assert sorted(m.ticker for m in asyncio.run(cache.fetch_open())) == ["A", "NOCLOSE"]
+    assert cache.by_ticker["NOCLOSE"].expires_at == cache.by_ticker["NOCLOSE"].fetched_at + 60.0
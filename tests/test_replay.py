@@ -0,0 +1,47 @@
+import asyncio
+import json
+
+from kalshi_bot.core.capture import FrameCapture
+from kalshi_bot.core.checkpoint import ladder_cents
+from kalshi_bot.core.replay import ReplayEngine, capture_frames
+
+
+def snapshot(sid: int, seq: int, ticker: str, yes, no) -> str:
+    return json.dumps({"type": "orderbook_snapshot", "sid": sid, "seq": seq,
+                       "msg": {"market_ticker": ticker, "yes": yes, "no": no}})
+
+
+def delta(sid: int, seq: int, ticker: str, price: int, size: int, side: str = "yes") -> str:
+    return json.dumps({"type": "orderbook_delta", "sid": sid, "seq": seq,
+                       "msg": {"market_ticker": ticker, "price": price, "delta": size, "side": side}})
+
+
+def test_sharded_capture_keeps_connections_apart(tmp_path):
+    t0 = 1_750_000_000_000_000_000
+    a, b = FrameCapture(str(tmp_path), name="shard-0"), FrameCapture(str(tmp_path), name="shard-1")
+    a.start()
+    b.start()
+    a.mark_connect(t0)
+    b.mark_connect(t0 + 1)
+    # Both connections number their first subscription sid 1
+    a.write(t0 + 2, snapshot(1, 1, "A", [[40, 10]], [[55, 10]]))
+    b.write(t0 + 3, snapshot(1, 1, "B", [[20, 5]], [[70, 5]]))
+    a.write(t0 + 4, delta(1, 2, "A", 41, 3))
+    b.write(t0 + 5, delta(1, 2, "B", 21, 7))
+    # shard-1 reconnects: only B is blanked, and its new sid 1 starts over at seq 1
+    b.mark_connect(t0 + 6)
+    a.write(t0 + 7, delta(1, 3, "A", 42, 1))
+    b.write(t0 + 8, snapshot(1, 1, "B", [[22, 4]], [[75, 4]]))
+    a.close()
+    b.close()
+
+    async def replay():
+        engine = ReplayEngine(capture_frames(str(tmp_path)), record_path=None)
+        return engine, await engine.run()
+    engine, stats = asyncio.run(replay())
+
+    books = engine.client.order_book_cache
+    assert ladder_cents(books["A"]) == ([(42, 1), (41, 3), (40, 10)], [(45, 10)])
+    assert ladder_cents(books["B"]) == ([(22, 4)], [(25, 4)])
+    assert stats["connections"] == 2
+    assert stats["seq"]["gaps"] == 0 and stats["seq"]["duplicates"] == 0